@@ -0,0 +1,28 @@
+# coding=utf-8
+"""
+Pieces shared by the benchmarks.
+"""
+
+
+class Attribute:
+    """
+    The simplest descriptor that keeps its values in a :DescriptorStorage,
+    for comparing storages with each other
+    """
+    def __init__(self, storage):
+        self.storage = storage
+        self.storage.desc = self
+
+    def __set_name__(self, owner, name):
+        self.storage.set_name(name)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return self.storage[instance]
+
+    def __set__(self, instance, value):
+        self.storage[instance] = value
+
+    def slots_for(self, name):
+        return self.storage.slots_for(name)
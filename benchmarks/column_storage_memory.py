@@ -0,0 +1,45 @@
+# coding=utf-8
+"""
+Compares the memory each instance's float attributes take when stored with
+`InstanceStorage`, `DictStorage` and `ColumnStorage` (sharing a `RowIndex`).
+
+Run with `python benchmarks/column_storage_memory.py [instances] [attributes]`
+"""
+import sys
+import tracemalloc
+
+from descriptor_tools.storage import (ColumnStorage, DictStorage,
+                                      InstanceStorage, RowIndex)
+
+from _common import Attribute
+
+
+def bytes_per_instance(make_storage, count, attr_count):
+    names = ['attr{}'.format(i) for i in range(attr_count)]
+    namespace = {name: Attribute(make_storage()) for name in names}
+    cls = type('Sample', (), namespace)
+    instances = [cls() for _ in range(count)]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i, instance in enumerate(instances):
+        for name in names:
+            setattr(instance, name, i + 0.5)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+def main(count, attr_count):
+    rows = RowIndex()
+    print("{:,} instances with {} float attributes".format(count, attr_count))
+    for label, make in (("InstanceStorage", InstanceStorage),
+                        ("DictStorage", DictStorage),
+                        ("ColumnStorage", lambda: ColumnStorage('d', rows=rows))):
+        print("{:<16}{:>10.1f} bytes per instance".format(
+            label, bytes_per_instance(make, count, attr_count)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 16)
@@ -0,0 +1,54 @@
+# coding=utf-8
+"""
+Compares the memory taken by text bodies stored with `DictStorage` alone and
+wrapped in a `CompressedStorage`, and the time a lookup takes with and without
+its cache.
+
+Run with `python benchmarks/compressed_storage_memory.py [instances]`
+"""
+import random
+import sys
+import timeit
+import tracemalloc
+
+from descriptor_tools.storage import CompressedStorage, DictStorage
+
+from _common import Attribute
+
+
+WORDS = ('descriptor storage value instance attribute payload compressed '
+         'request response header body').split()
+
+
+def body(rng):
+    return ' '.join(rng.choice(WORDS) for _ in range(400))
+
+
+def measure(storage, count):
+    rng = random.Random(0)
+    cls = type('Sample', (), {'body': Attribute(storage)})
+    instances = [cls() for _ in range(count)]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for instance in instances:
+        instance.body = body(rng)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    lookup = timeit.timeit(lambda: instances[0].body, number=10000) / 10000
+    return after - before, lookup
+
+
+def main(count):
+    print("{:,} instances with ~3KB text bodies".format(count))
+    for label, storage in (
+            ("DictStorage", DictStorage()),
+            ("CompressedStorage", CompressedStorage(DictStorage())),
+            ("  with cache", CompressedStorage(DictStorage(), cache_size=16))):
+        memory, lookup = measure(storage, count)
+        print("{:<20}{:>14,} bytes{:>10.2f} us per lookup".format(
+            label, memory, lookup * 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,46 @@
+# coding=utf-8
+"""
+Times bulk `DescDict` operations against doing the same work one key at a
+time.
+
+Run with `python benchmarks/desc_dict_batch.py [item count]`
+"""
+import sys
+from timeit import default_timer as timer
+
+from descriptor_tools import DescDict
+
+
+class Key:
+    pass
+
+
+def timed(label, func):
+    start = timer()
+    func()
+    print("{:<24}{:>10.1f} ms".format(label, (timer() - start) * 1000))
+
+
+def one_at_a_time(d, keys):
+    for i, key in enumerate(keys):
+        d[key] = i
+
+
+def main(count):
+    keys = [Key() for _ in range(count)]
+    print("items: {:,}".format(count))
+
+    single = DescDict()
+    timed("__setitem__ loop", lambda: one_at_a_time(single, keys))
+    batch = DescDict()
+    timed("set_many()", lambda: batch.set_many(keys, range(count)))
+
+    timed("__getitem__ loop", lambda: [single[key] for key in keys])
+    timed("get_many()", lambda: batch.get_many(keys))
+
+    timed("delete_many()", lambda: single.delete_many(keys))
+    timed("clear()", batch.clear)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
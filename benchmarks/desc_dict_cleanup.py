@@ -0,0 +1,47 @@
+# coding=utf-8
+"""
+Measures the pause when a large population of keys is freed at once, with
+`DescDict`'s immediate cleanup compared to `deferred_cleanup=True`, along with
+the time the deferred mode later spends sweeping.
+
+Run with `python benchmarks/desc_dict_cleanup.py [key count] [dict count]`
+"""
+import sys
+from timeit import default_timer as timer
+
+from descriptor_tools import DescDict
+
+
+class Key:
+    pass
+
+
+def pause(count, dict_count, deferred):
+    dicts = [DescDict(deferred_cleanup=deferred) for _ in range(dict_count)]
+    keys = [Key() for _ in range(count)]
+    for d in dicts:
+        d.set_many(keys, range(count))
+
+    start = timer()
+    del keys
+    freed = timer() - start
+
+    start = timer()
+    for d in dicts:
+        d.sweep()
+    swept = timer() - start
+    return freed, swept
+
+
+def main(count, dict_count):
+    print("keys: {:,} across {} DescDicts".format(count, dict_count))
+    for deferred in (False, True):
+        freed, swept = pause(count, dict_count, deferred)
+        label = "deferred" if deferred else "immediate"
+        print("{:<10} free pause {:>8.1f} ms   later sweep {:>8.1f} ms".format(
+            label, freed * 1000, swept * 1000))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 4)
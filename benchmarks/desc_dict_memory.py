@@ -0,0 +1,52 @@
+# coding=utf-8
+"""
+Measures how much memory each item in a `DescDict` costs, compared to the
+old scheme of storing a `(value, weakref.finalize)` tuple per key.
+
+Run with `python benchmarks/desc_dict_memory.py [item count]`
+"""
+import sys
+import tracemalloc
+import weakref
+
+from descriptor_tools import DescDict
+
+
+class Key:
+    pass
+
+
+class FinalizerDict:
+    """The per-key `weakref.finalize` layout that `DescDict` used to have"""
+    def __init__(self):
+        self.storage = {}
+
+    def __setitem__(self, key, value):
+        finalizer = weakref.finalize(key, self.storage.__delitem__, id(key))
+        self.storage[id(key)] = (value, finalizer)
+
+
+def bytes_per_item(dict_type, count):
+    keys = [Key() for _ in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    d = dict_type()
+    for key in keys:
+        d[key] = 1
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+def main(count):
+    old = bytes_per_item(FinalizerDict, count)
+    new = bytes_per_item(DescDict, count)
+    print("items:                 {:>10,}".format(count))
+    print("finalizer per item:    {:>10.1f} bytes".format(old))
+    print("DescDict per item:     {:>10.1f} bytes".format(new))
+    print("saved per item:        {:>10.1f} bytes ({:.0%})".format(
+        old - new, (old - new) / old))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
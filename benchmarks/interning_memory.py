@@ -0,0 +1,44 @@
+# coding=utf-8
+"""
+Compares the memory taken by string values that are equal but created
+separately (as when read from a file) with `DictStorage` alone and wrapped in
+an `InterningStorage`, along with what `InternPool.report()` estimates.
+
+Run with `python benchmarks/interning_memory.py [instances] [distinct values]`
+"""
+import sys
+import tracemalloc
+
+from descriptor_tools.storage import DictStorage, InterningStorage
+
+from _common import Attribute
+
+
+def measure(storage, count, distinct):
+    cls = type('Sample', (), {'status': Attribute(storage)})
+    instances = [cls() for _ in range(count)]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i, instance in enumerate(instances):
+        instance.status = 'status-{}'.format(i % distinct)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, storage, instances
+
+
+def main(count, distinct):
+    print("{:,} instances, {} distinct values".format(count, distinct))
+    plain, _, _ = measure(DictStorage(), count, distinct)
+    interned, storage, instances = measure(
+        InterningStorage(DictStorage()), count, distinct)
+    print("{:<18}{:>14,} bytes".format("DictStorage", plain))
+    print("{:<18}{:>14,} bytes".format("InterningStorage", interned))
+    print("{:<18}{:>14,} bytes".format("measured savings", plain - interned))
+    print("{:<18}{:>14,} bytes".format("report() estimate",
+                                       storage.pool.report().bytes_saved))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 10)
@@ -0,0 +1,70 @@
+# coding=utf-8
+"""
+Compares `LazyProperty` with and without `single_flight=True` when many
+threads look up the same not-yet-calculated value at once: how many times the
+value gets calculated and how long the lookups take, and then how long
+lookups of the cached value take.
+
+Run with `python benchmarks/lazy_single_flight.py [threads] [instances]`
+"""
+import sys
+import threading
+import time
+import timeit
+
+from descriptor_tools.properties import LazyProperty
+from descriptor_tools.storage import DictStorage
+
+
+def make_class(**options):
+    class Thing:
+        calls = 0
+        calls_lock = threading.Lock()
+
+        def _value(self):
+            with Thing.calls_lock:
+                Thing.calls += 1
+            time.sleep(0.002)  # stands in for I/O or a GIL-releasing call
+            return sum(range(1000))
+
+        value = LazyProperty(_value, named=False, **options)
+    return Thing
+
+
+def contended(cls, thread_count, count):
+    instances = [cls() for _ in range(count)]
+    start = threading.Barrier(thread_count + 1)
+
+    def look_up():
+        start.wait()
+        for instance in instances:
+            instance.value
+
+    threads = [threading.Thread(target=look_up) for _ in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - began, instances
+
+
+def main(thread_count, count):
+    print("{} threads looking up {:,} lazy values".format(thread_count, count))
+    for label, options in (("plain", {}),
+                           ("single flight", {'single_flight': True}),
+                           ("plain, DictStorage", {'storage': DictStorage()}),
+                           ("single flight, DictStorage",
+                            {'storage': DictStorage(), 'single_flight': True})):
+        cls = make_class(**options)
+        elapsed, instances = contended(cls, thread_count, count)
+        cached = min(timeit.repeat(lambda: instances[0].value,
+                                   number=100000, repeat=5)) / 100000
+        print("{:<28}{:>7,} calculations {:>8.3f}s  {:>6.1f}ns cached".format(
+            label, cls.calls, elapsed, cached * 1e9))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 8,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 200)
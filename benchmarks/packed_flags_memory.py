@@ -0,0 +1,56 @@
+# coding=utf-8
+"""
+Compares the memory taken by many boolean attributes per instance when each
+is stored with `InstanceStorage` and when they're all packed into one int with
+`PackedStorage`, with and without `__slots__`.
+
+Run with `python benchmarks/packed_flags_memory.py [instances] [flags]`
+"""
+import sys
+import tracemalloc
+
+from descriptor_tools import with_slots
+from descriptor_tools.storage import InstanceStorage, PackedField, PackedStorage
+
+from _common import Attribute
+
+
+def bytes_per_instance(make_class, count, flag_count):
+    names = ['flag{}'.format(i) for i in range(flag_count)]
+    cls = make_class(names)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [cls() for _ in range(count)]
+    for i, instance in enumerate(instances):
+        for j, name in enumerate(names):
+            setattr(instance, name, (i + j) % 3 == 0)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+def separate(names):
+    return type('Separate', (), {name: Attribute(InstanceStorage())
+                                 for name in names})
+
+
+def packed(names, slots=False):
+    field = PackedField()
+    cls = type('Packed', (), {name: Attribute(PackedStorage(field, default=False))
+                              for name in names})
+    return with_slots(cls) if slots else cls
+
+
+def main(count, flag_count):
+    print("{:,} instances with {} flags".format(count, flag_count))
+    for label, make in (("InstanceStorage", separate),
+                        ("PackedStorage", packed),
+                        ("  with slots", lambda names: packed(names, True))):
+        print("{:<18}{:>10.1f} bytes per instance".format(
+            label, bytes_per_instance(make, count, flag_count)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 32)
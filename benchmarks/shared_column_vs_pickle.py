@@ -0,0 +1,80 @@
+# coding=utf-8
+"""
+Compares handing objects to a `multiprocessing` pool the usual way (each
+worker gets pickled copies of the objects, values and all) against keeping the
+attribute in a `SharedColumnStorage` that the workers attach to, so only the
+row numbers are sent.
+
+Run with `python benchmarks/shared_column_vs_pickle.py [instances] [workers]`
+"""
+from multiprocessing import get_context
+from operator import attrgetter
+import sys
+import time
+
+from descriptor_tools.storage import SharedColumnStorage
+
+from _common import Attribute
+
+
+class Plain:
+    def __init__(self, index, value):
+        self.index = index
+        self.value = value
+
+
+class Shared:
+    value = Attribute(SharedColumnStorage('d', row=attrgetter('index')))
+
+    def __init__(self, index):
+        self.index = index
+
+
+def sum_plain(chunk):
+    return sum(item.value for item in chunk)
+
+
+def attach(name):
+    Shared.value.storage.attach(name)
+
+
+def sum_shared(bounds):
+    start, stop = bounds
+    with Shared.value.storage.column() as column:
+        return sum(column[start:stop])
+
+
+def chunks(count, workers):
+    size = -(-count // workers)
+    return [(start, min(start + size, count)) for start in range(0, count, size)]
+
+
+def main(count, workers):
+    context = get_context('spawn')
+    bounds = chunks(count, workers)
+    print("{:,} instances, {} workers".format(count, workers))
+
+    plain = [Plain(i, i + 0.5) for i in range(count)]
+    with context.Pool(workers) as pool:
+        start = time.perf_counter()
+        total = sum(pool.map(sum_plain, [plain[a:b] for a, b in bounds]))
+        elapsed = time.perf_counter() - start
+    print("{:<22}{:>10.3f} s  (total {})".format("pickled objects", elapsed, total))
+
+    storage = Shared.value.storage
+    with storage:
+        storage.create(count)
+        shared = [Shared(i) for i in range(count)]
+        for instance in shared:
+            instance.value = instance.index + 0.5
+        with context.Pool(workers, initializer=attach,
+                          initargs=(storage.block_name,)) as pool:
+            start = time.perf_counter()
+            total = sum(pool.map(sum_shared, bounds))
+            elapsed = time.perf_counter() - start
+        print("{:<22}{:>10.3f} s  (total {})".format("SharedColumnStorage", elapsed, total))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 4)
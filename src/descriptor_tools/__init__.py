@@ -73,6 +73,7 @@ given a evalutation method.
 """
 from descriptor_tools.desc_dict import *
 from descriptor_tools.find_descriptors import *
+from descriptor_tools.slots import *
 from descriptor_tools.names import *
 from descriptor_tools.properties import *
 from descriptor_tools.set_attrs import *
@@ -33,7 +33,8 @@ on the object that's wrapped, but "magic" methods go straight to the class
 for method lookups, so the interpreter would always think that the non-
 automatic methods don't exist.
 """
-from descriptor_tools import name_of, DescDict
+from descriptor_tools import name_of, DescDict, namespace_of
+from descriptor_tools.storage import many_result
 from functools import wraps
 from operator import attrgetter
 
@@ -77,8 +78,9 @@ class DescriptorDecoratorBase:
             if is_data_desc(self.desc):
                 if hasattr(self.desc, '__get__'):
                     return _lifted_desc_results(self.desc, self, instance, owner)
-            if name_of(self, owner) in instance.__dict__:
-                return instance.__dict__[name_of(self, owner)]
+            namespace = namespace_of(instance)
+            if name_of(self, owner) in namespace:
+                return namespace[name_of(self, owner)]
             elif hasattr(self.desc, '__get__'):
                 return _lifted_desc_results(self.desc, self, instance, owner)
             else:
@@ -92,7 +94,7 @@ class DescriptorDecoratorBase:
                 raise AttributeError('__set__')
         else:  # delegate to instance dictionary
             name = name_of(self, type(instance))
-            instance.__dict__[name] = value
+            namespace_of(instance)[name] = value
 
     def __delete__(self, instance):
         if hasattr(self.desc, '__delete__'):
@@ -101,10 +103,14 @@ class DescriptorDecoratorBase:
             raise AttributeError('__delete__')
         else:
             try:
-                del instance.__dict__[name_of(self, type(instance))]
+                del namespace_of(instance)[name_of(self, type(instance))]
             except KeyError as e:
                 raise AttributeError(e)
 
+    def slots_for(self, name):
+        slots_for = getattr(self.desc, 'slots_for', None)
+        return () if slots_for is None else slots_for(name)
+
     def __getattr__(self, item):
         """
         Redirects unknown attribute lookups to the wrapped descriptor
@@ -140,6 +146,23 @@ class Binding(DescriptorDecoratorBase):
     def __call__(self, instance):
         return self.__get__(instance, type(instance))
 
+    def many(self, instances, *, as_numpy=False):
+        """
+        The bulk form of calling the unbound attribute: returns a list of the
+        attribute's value for each of *instances*. If the wrapped descriptor
+        has its own `many()`, it's used, so its storage's bulk lookup is.
+        :param as_numpy: *optional* - defaults to `False` - return a NumPy
+            array instead of a list
+        """
+        many = getattr(self.desc, 'many', None)
+        if many is not None:
+            if as_numpy:
+                return many(instances, as_numpy=True)
+            return many(instances)
+        get = self.__get__
+        values = [get(instance, type(instance)) for instance in instances]
+        return many_result(values, as_numpy=as_numpy)
+
     def __get__(self, instance, owner):
         if instance is None:
             return self
@@ -202,10 +225,15 @@ class SetOnce(_ReadOnly):
     """
     Turns the wrapped descriptor into a set-once descriptor, which only
     allows the attribute to be set one time.
+
+    Pass `allow_strong_keys=True` to use it on instances that can't be weakly
+    referenced, or `weak_keys=False` for instances that live for the whole
+    process; see :DescDict for how those are tracked.
     """
-    def __init__(self, desc):
+    def __init__(self, desc, *, allow_strong_keys=False, weak_keys=True):
         super().__init__(desc)
-        self.set_instances = DescDict()
+        self.set_instances = DescDict(allow_strong_keys=allow_strong_keys,
+                                      weak_keys=weak_keys)
 
     def __set__(self, instance, value):
         if self._already_set(instance):
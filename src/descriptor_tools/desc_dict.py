@@ -1,16 +1,54 @@
 # coding=utf-8
-from collections import MutableMapping
+from collections.abc import Mapping, MutableMapping
+import sys
+import threading
 import weakref
-from ctypes import cast, py_object
+
+from descriptor_tools.entries import (DEFAULT, MIN_SWEEP_THRESHOLD, Entry,
+                                      StrongEntry, weak_entry, strong_entry,
+                                      remover)
 
 __author__ = 'Jake'
-__all__ = ['DescDict']
+__all__ = ['DescDict', 'FrozenDescDict']
+
+
+def _unreferenced_count():
+    # the reference count `sweep()` sees for a key that is only held by its
+    # entry; measured instead of hard-coded since it varies between versions
+    entry = strong_entry(object(), None)
+    return sys.getrefcount(entry.key)
+
+
+if hasattr(sys, 'getrefcount'):
+    _UNREFERENCED = _unreferenced_count()
+else:
+    _UNREFERENCED = None
+
+_CLEANUP_THRESHOLD = 1024
 
-DEFAULT = object()
+# key id -> the number of sweeping dictionaries holding that key strongly.
+# Each of those holds a reference to the key, so `sweep()` allows for the
+# others' references as well as its own; otherwise a key held by two of them
+# would look referenced to both of them forever.
+_strong_holders = {}
+_strong_holders_lock = threading.Lock()
 
 
-def id2key(id):
-    return cast(id, py_object).value
+def _hold(key_id):
+    with _strong_holders_lock:
+        _strong_holders[key_id] = _strong_holders.get(key_id, 0) + 1
+
+
+def _let_go(entries):
+    with _strong_holders_lock:
+        for entry in entries:
+            if type(entry) is StrongEntry:
+                key_id = id(entry.key)
+                count = _strong_holders.get(key_id, 0) - 1
+                if count > 0:
+                    _strong_holders[key_id] = count
+                else:
+                    _strong_holders.pop(key_id, None)
 
 
 class DescDict(MutableMapping):
@@ -22,9 +60,43 @@ class DescDict(MutableMapping):
     key to be hashable.
 
     Despite not hashing the instance, DescDict is still very efficient because
-    it hashes the id of the instance to store it in a typical `dict`. Also, a
-    weak reference finalizer is set up to remove the item from the dictionary
-    when it is cleaned up.
+    it hashes the id of the instance to store it in a typical `dict`. Each item
+    is stored as a single weak reference to the key that also carries the
+    value, and every one of those references shares the same callback, which
+    removes the item from the dictionary when the key is cleaned up.
+
+    Keys that can't be weakly referenced (instances of `__slots__` classes
+    without `__weakref__`, tuples, etc.) raise a `TypeError` by default. If
+    the dictionary is created with `allow_strong_keys=True`, they are held by
+    a strong reference instead, which keeps their ids from being reused.
+    Those items stay until they're removed with `del` or `release()`, or
+    until `sweep()` finds that nothing but the dictionary refers to the key
+    anymore. `sweep()` runs on its own whenever the number of strongly held
+    keys added since the last sweep outgrows the number that survived it.
+    A key held by several of these dictionaries (like an instance of a
+    `__slots__` class with more than one such attribute) is swept from each of
+    them once nothing but those dictionaries refers to it. Sweeping relies on
+    reference counts, so it does nothing on Python implementations without
+    `sys.getrefcount()`.
+
+    For keys that live as long as the process does (configuration, schemas,
+    registries and the like), the weak references are pure overhead. Creating
+    the dictionary with `weak_keys=False` holds every key strongly without
+    even trying to weakly reference it, and never sweeps. The owner of the
+    dictionary is then responsible for calling `release()` (or `del`) when a
+    key is done with.
+
+    When a lot of keys are cleaned up at once, removing each of their items
+    right away can add up to a noticeable pause. Creating the dictionary with
+    `deferred_cleanup=True` makes the keys' weak references just queue
+    themselves up instead (without running any Python code), and the queued
+    items are removed all at once at the start of the next operation that
+    changes the dictionary, or by `len()`, `get_many()` or `sweep()`. Lookups
+    (`d[key]` and `key in d`) remove them too once more than
+    `cleanup_threshold` are queued, so a dictionary that's only read doesn't
+    keep the values of a whole freed batch alive. Until then, lookups check
+    that the item they find still belongs to a live key, so a new key that
+    reuses a dead key's id never sees the old value.
 
     Methods that are implemented via `MutableMapping` Mixins:
     + `keys()`
@@ -38,13 +110,43 @@ class DescDict(MutableMapping):
     + `update()`
     + `setdefault()`
     """
-    def __init__(self, mapping=None):
+    def __init__(self, mapping=None, *, allow_strong_keys=False,
+                 deferred_cleanup=False, cleanup_threshold=_CLEANUP_THRESHOLD,
+                 weak_keys=True):
         """
         Initializes an empty dictionary, copying items from the optional mapping
         argument into itself
         :param mapping: an original mapping object to copy the items from
+        :param allow_strong_keys: *optional* - defaults to `False` - whether
+            keys that can't be weakly referenced are held strongly instead of
+            raising a `TypeError`
+        :param deferred_cleanup: *optional* - defaults to `False` - whether
+            items of cleaned up keys are queued to be removed in bulk later
+            instead of being removed right away
+        :param cleanup_threshold: *optional* - defaults to 1024 - with
+            `deferred_cleanup`, the number of queued items above which lookups
+            remove them as well
+        :param weak_keys: *optional* - defaults to `True` - whether keys are
+            weakly referenced at all. If `False`, every key is held strongly
+            until it is explicitly removed
         """
         self.storage = {}
+        self.weak_keys = weak_keys
+        self.allow_strong_keys = allow_strong_keys
+        self.deferred_cleanup = deferred_cleanup
+        self.cleanup_threshold = cleanup_threshold
+        self._strong_added = 0
+        self._sweep_threshold = MIN_SWEEP_THRESHOLD
+        self._dead = []
+
+        if deferred_cleanup:
+            self._remove = self._dead.append
+        else:
+            self._remove = remover(self, 'storage')
+        if allow_strong_keys and weak_keys:
+            # strongly held keys still count as held until the dict is gone
+            finalizer = weakref.finalize(self, _let_go_of_all, self.storage)
+            finalizer.atexit = False
 
         if mapping is not None:
             for k, v in mapping.items():
@@ -58,10 +160,15 @@ class DescDict(MutableMapping):
         :param key: the key to lookup up the item by
         :return: the item associated with the key
         """
+        if self._dead and len(self._dead) > self.cleanup_threshold:
+            self._remove_dead()
         try:
-            return self.storage[id(key)][0]
+            entry = self.storage[id(key)]
         except KeyError as e:
             raise AttributeError(e)
+        if self._dead and entry() is not key:
+            raise AttributeError(KeyError(id(key)))
+        return entry.value
 
     def __setitem__(self, key, value):
         """
@@ -70,18 +177,27 @@ class DescDict(MutableMapping):
         :param key: the key to assign the value to
         :param value: the value to assign to the key
         """
-        if key in self:
-            self._update_item(id(key), value)
+        if self._dead:
+            self._remove_dead()
+        entry = self.storage.get(id(key))
+        if entry is None:
+            self.storage[id(key)] = self._new_entry(key, value)
         else:
-            self._new_item(key, value)
-
-    def _update_item(self, keyId, value):
-        _, finalizer = self.storage[keyId]
-        self.storage[keyId] = (value, finalizer)
+            entry.value = value
 
-    def _new_item(self, key, value):
-        finalizer = weakref.finalize(key, self.storage.__delitem__, id(key))
-        self.storage[id(key)] = (value, finalizer)
+    def _new_entry(self, key, value):
+        if not self.weak_keys:
+            return strong_entry(key, value)
+        try:
+            return weak_entry(key, self._remove, value)
+        except TypeError:
+            if not self.allow_strong_keys:
+                raise
+        self._strong_added += 1
+        if self._strong_added >= self._sweep_threshold:
+            self.sweep()
+        _hold(id(key))
+        return strong_entry(key, value)
 
     def __delitem__(self, key):
         """
@@ -89,11 +205,72 @@ class DescDict(MutableMapping):
         Remove `d[key]` from *d*. Raises a `KeyError` if *key* is not in the map
         :param key: the key to remove from the map (along with its associated value)
         """
+        if self._dead:
+            self._remove_dead()
         try:
-            self.storage[id(key)][1].detach()
-            del self.storage[id(key)]
+            entry = self.storage.pop(id(key))
         except KeyError as e:
             raise AttributeError(e)
+        self._released((entry,))
+
+    def release(self, key):
+        """
+        Removes *key* and its value from the dictionary if it's there. This is
+        how strongly held keys (see `allow_strong_keys`) are let go of when
+        their owner is done with them, but it works for any key.
+        :param key: the key to remove from the map (along with its associated value)
+        :return: `True` if *key* was in the map, else `False`
+        """
+        if self._dead:
+            self._remove_dead()
+        entry = self.storage.pop(id(key), None)
+        if entry is None:
+            return False
+        self._released((entry,))
+        return True
+
+    def _released(self, entries):
+        # dicts with `weak_keys=False` don't sweep, so they aren't counted
+        if self.allow_strong_keys and self.weak_keys:
+            _let_go(entries)
+
+    def sweep(self):
+        """
+        Removes the items whose keys are dead: any queued up by
+        `deferred_cleanup`, plus those whose strongly held keys aren't
+        referenced by anything other than this dictionary. Strongly held keys
+        are only checked when reference counts are available, and never when
+        the dictionary was created with `weak_keys=False`.
+        :return: the number of items removed
+        """
+        removed = self._remove_dead()
+        if _UNREFERENCED is None or not self.weak_keys:
+            return removed
+        holders = _strong_holders
+        # each other dictionary holding the key adds one reference
+        dead = [key_id for key_id, entry in self.storage.items()
+                if type(entry) is StrongEntry
+                and sys.getrefcount(entry.key)
+                <= _UNREFERENCED + holders.get(key_id, 1) - 1]
+        self._released([self.storage.pop(key_id) for key_id in dead])
+        surviving = sum(type(entry) is StrongEntry
+                        for entry in self.storage.values())
+        self._strong_added = 0
+        self._sweep_threshold = max(MIN_SWEEP_THRESHOLD, surviving)
+        return removed + len(dead)
+
+    def _remove_dead(self):
+        storage = self.storage
+        dead = self._dead
+        # more may be queued while this runs, so only drop what was handled
+        count = len(dead)
+        removed = 0
+        for entry in dead[:count]:
+            if storage.get(entry.key_id) is entry:
+                del storage[entry.key_id]
+                removed += 1
+        del dead[:count]
+        return removed
 
     def __iter__(self):
         """
@@ -101,14 +278,18 @@ class DescDict(MutableMapping):
         This is an alias for `d.keys()`.
         :return: an iterator over the keys of this dictionary.
         """
-        for keyId in self.storage:
-            yield id2key(keyId)
+        for entry in list(self.storage.values()):
+            key = entry()
+            if key is not None:
+                yield key
 
     def __len__(self):
         """
         `len(d)`
         :return: the number of items in the dictionary
         """
+        if self._dead:
+            self._remove_dead()
         return len(self.storage)
 
     def __contains__(self, key):
@@ -117,14 +298,118 @@ class DescDict(MutableMapping):
         :param key:
         :return: `True` if *d* has a key *key*, else `False`
         """
-        return id(key) in self.storage
+        if self._dead and len(self._dead) > self.cleanup_threshold:
+            self._remove_dead()
+        entry = self.storage.get(id(key))
+        if entry is None:
+            return False
+        return not self._dead or entry() is key
 
     def clear(self):
         """
         Removes all items from the dictionary
         """
-        while len(self) > 0:
-            self.popitem()
+        self._released(list(self.storage.values()))
+        self.storage.clear()
+        self._dead.clear()
+        self._strong_added = 0
+        self._sweep_threshold = MIN_SWEEP_THRESHOLD
+
+    def freeze(self):
+        """
+        Takes an immutable snapshot of the dictionary's current items. See
+        :FrozenDescDict for how it's meant to be used.
+        :return: a :FrozenDescDict with the same items as this dictionary
+        """
+        if self._dead:
+            self._remove_dead()
+        # copy first, since keys being cleaned up could change the dict while
+        # it's being iterated over
+        items = {key_id: (entry, entry.value)
+                 for key_id, entry in self.storage.copy().items()}
+        return FrozenDescDict._from_items(items, self._options())
+
+    def _options(self):
+        return {'allow_strong_keys': self.allow_strong_keys,
+                'deferred_cleanup': self.deferred_cleanup,
+                'cleanup_threshold': self.cleanup_threshold,
+                'weak_keys': self.weak_keys}
+
+    def get_many(self, keys, default=DEFAULT):
+        """
+        Looks up the values for a whole sequence of keys at once, which avoids
+        the per-call overhead of looking them up one at a time.
+        :param keys: iterable of the keys to look up
+        :param default: *optional* - value to use for keys that aren't in the
+            map. If not given, a missing key raises an `AttributeError`, just
+            like `d[key]`
+        :return: a list of the values, in the same order as *keys*
+        """
+        if self._dead:
+            self._remove_dead()
+        storage = self.storage
+        if default is DEFAULT:
+            try:
+                return [storage[id(key)].value for key in keys]
+            except KeyError as e:
+                raise AttributeError(e)
+        values = []
+        append = values.append
+        for key in keys:
+            entry = storage.get(id(key))
+            append(default if entry is None else entry.value)
+        return values
+
+    def set_many(self, keys, values):
+        """
+        Sets the values for a whole sequence of keys at once, which avoids the
+        per-call overhead of setting them one at a time.
+        :param keys: iterable of the keys to assign the values to
+        :param values: iterable of the values to assign, in the same order as
+            *keys*
+        """
+        if self._dead:
+            self._remove_dead()
+        storage = self.storage
+        get = storage.get
+        remove = self._remove
+        weak = self.weak_keys
+        new_ref = weakref.ref.__new__
+        for key, value in zip(keys, values):
+            key_id = id(key)
+            entry = get(key_id)
+            if entry is not None:
+                entry.value = value
+                continue
+            if not weak:
+                storage[key_id] = strong_entry(key, value)
+                continue
+            # weak_entry(), inlined
+            try:
+                entry = new_ref(Entry, key, remove)
+            except TypeError:
+                storage[key_id] = self._new_entry(key, value)
+                continue
+            entry.key_id = key_id
+            entry.value = value
+            storage[key_id] = entry
+
+    def delete_many(self, keys):
+        """
+        Removes a whole sequence of keys (and their values) at once. If any of
+        the keys are not in the map, an `AttributeError` is raised and nothing
+        is removed.
+        :param keys: iterable of the keys to remove from the map
+        """
+        if self._dead:
+            self._remove_dead()
+        storage = self.storage
+        key_ids = [id(key) for key in keys]
+        for key_id in key_ids:
+            if key_id not in storage:
+                raise AttributeError(KeyError(key_id))
+        self._released([storage.pop(key_id) for key_id in key_ids
+                        if key_id in storage])
 
     def __str__(self):
         """
@@ -164,7 +449,11 @@ class DescDict(MutableMapping):
         `bool(d)`
         :return: `True` if `len(d) > 0`, else `False`
         """
-        return bool(self.storage)
+        return len(self) > 0
+
+
+def _let_go_of_all(storage):
+    _let_go(list(storage.values()))
 
 
 def _take_n(iterable, n):
@@ -180,3 +469,126 @@ def _list_map_items(items, representation=False):
         return ", ".join("{k}: {v}".format(k=repr(k), v=repr(v)) for k, v in items)
     else:
         return ", ".join("{k}: {v}".format(k=str(k), v=str(v)) for k, v in items)
+
+
+class FrozenDescDict(Mapping):
+    """
+    FrozenDescDict is an immutable snapshot of a :DescDict, made with
+    `DescDict.freeze()`. It has the same read API as :DescDict (including
+    `get_many()`), but since it never changes, any number of threads can read
+    it without any locking.
+
+    To change the data, a writer makes the changes to a :DescDict (either the
+    one that was frozen, or a copy from `thaw()`), freezes it again, and
+    assigns the new snapshot over the old one wherever readers look for it.
+    Assigning an attribute is atomic, so readers see either the old version or
+    the new one, never a mix. :SnapshotStorage does exactly this for
+    descriptors.
+
+    The snapshot doesn't keep weakly referenced keys alive. If one is cleaned
+    up after the snapshot was taken, lookups and iteration skip it, but it is
+    still counted by `len()`, which is the number of items at the time of the
+    snapshot.
+    """
+    def __init__(self, mapping=None, **options):
+        """
+        Creates a snapshot with the items from *mapping*
+        :param mapping: an original mapping object to copy the items from
+        :param options: any of the keyword options of :DescDict, which are
+            used when `thaw()` creates a new :DescDict
+        """
+        source = DescDict(mapping, **options).freeze()
+        self._items = source._items
+        self._dict_options = source._dict_options
+
+    @classmethod
+    def _from_items(cls, items, options):
+        frozen = cls.__new__(cls)
+        frozen._items = items
+        frozen._dict_options = options
+        return frozen
+
+    def __getitem__(self, key):
+        """
+        `d[key]`
+        Return the item of *d* with key *key*. Raises an `AttributeError` if
+        *key* is not in the map
+        :param key: the key to lookup up the item by
+        :return: the item associated with the key
+        """
+        try:
+            entry, value = self._items[id(key)]
+        except KeyError as e:
+            raise AttributeError(e)
+        if entry() is not key:
+            raise AttributeError(KeyError(id(key)))
+        return value
+
+    def get_many(self, keys, default=DEFAULT):
+        """
+        Looks up the values for a whole sequence of keys at once.
+        :param keys: iterable of the keys to look up
+        :param default: *optional* - value to use for keys that aren't in the
+            map. If not given, a missing key raises an `AttributeError`, just
+            like `d[key]`
+        :return: a list of the values, in the same order as *keys*
+        """
+        get = self._items.get
+        values = []
+        append = values.append
+        for key in keys:
+            item = get(id(key))
+            if item is not None and item[0]() is key:
+                append(item[1])
+            elif default is DEFAULT:
+                raise AttributeError(KeyError(id(key)))
+            else:
+                append(default)
+        return values
+
+    def __iter__(self):
+        """
+        `iter(d)`
+        :return: an iterator over the keys of this snapshot that are still alive
+        """
+        for entry, _ in self._items.values():
+            key = entry()
+            if key is not None:
+                yield key
+
+    def __len__(self):
+        """
+        `len(d)`
+        :return: the number of items in the snapshot when it was taken
+        """
+        return len(self._items)
+
+    def __contains__(self, key):
+        """
+        `key in d`
+        :return: `True` if *d* has a key *key*, else `False`
+        """
+        item = self._items.get(id(key))
+        return item is not None and item[0]() is key
+
+    def thaw(self):
+        """
+        Creates a new, mutable :DescDict with the same items and options as
+        this snapshot.
+        :return: a new :DescDict
+        """
+        thawed = DescDict(**self._dict_options)
+        keys = []
+        values = []
+        for entry, value in self._items.values():
+            key = entry()
+            if key is not None:
+                keys.append(key)
+                values.append(value)
+        thawed.set_many(keys, values)
+        return thawed
+
+    __str__ = DescDict.__str__
+    __repr__ = DescDict.__repr__
+    _first_six_items = DescDict._first_six_items
+    _all_items = DescDict._all_items
@@ -0,0 +1,83 @@
+# coding=utf-8
+"""
+The `entries` module holds the building blocks shared by :DescDict and the
+storages that key their values by the `id()` of the instance: the one-object
+items that hold the instance (weakly, if they can) together with its value,
+and the callback that removes an item once its instance is cleaned up.
+"""
+import weakref
+
+__author__ = 'Jake'
+__all__ = ['Entry', 'StrongEntry', 'weak_entry', 'strong_entry', 'remover',
+           'DEFAULT', 'MIN_SWEEP_THRESHOLD']
+
+# stands in for "no value given" where `None` is a valid value
+DEFAULT = object()
+
+# the fewest additions between reference count based sweeps
+MIN_SWEEP_THRESHOLD = 1024
+
+
+class Entry(weakref.ref):
+    """
+    A weak reference to a key that also holds the key's value, so that each
+    item costs a single object. The id of the key is kept on it so the item
+    can still be found once the key is gone.
+
+    Create them with :weak_entry(), which skips the Python-level `__init__()`
+    call that would otherwise dominate the cost of adding an item.
+    """
+    __slots__ = ('key_id', 'value')
+
+
+_new_ref = weakref.ref.__new__
+
+
+def weak_entry(key, callback, value):
+    entry = _new_ref(Entry, key, callback)
+    entry.key_id = id(key)
+    entry.value = value
+    return entry
+
+
+class StrongEntry:
+    """
+    The stand-in for :Entry for keys that can't be weakly referenced. It holds
+    the key strongly, but is called the same way to get the key back. Create
+    them with :strong_entry().
+    """
+    __slots__ = ('key', 'value')
+
+    def __call__(self):
+        return self.key
+
+
+def strong_entry(key, value):
+    entry = object.__new__(StrongEntry)
+    entry.key = key
+    entry.value = value
+    return entry
+
+
+def remover(owner, table, removed=None):
+    """
+    Makes the callback for the :Entries of *owner*, which removes an entry
+    from *owner*'s dict of entries by key id once its key is cleaned up,
+    unless the entry has already been replaced. *owner* is only weakly
+    referenced, so the callback doesn't keep it alive.
+    :param owner: the object holding the entries
+    :param table: the name of *owner*'s attribute holding the dict of entries
+    :param removed: *optional* - called with *owner* and the entry after an
+        entry is removed, for any other bookkeeping
+    :return: the callback to give to :weak_entry()
+    """
+    def remove(entry, ownerref=weakref.ref(owner)):
+        owner = ownerref()
+        if owner is None:
+            return
+        entries = getattr(owner, table)
+        if entries.get(entry.key_id) is entry:
+            del entries[entry.key_id]
+            if removed is not None:
+                removed(owner, entry)
+    return remove
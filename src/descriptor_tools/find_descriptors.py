@@ -1,18 +1,47 @@
 import inspect
+from operator import is_
+import types
+import weakref
+from types import MappingProxyType
 
 __author__ = 'Jake'
-__all__ = ['get_descriptor', 'get_descriptor_from']
+__all__ = ['get_descriptor', 'get_descriptor_from', 'descriptors_of',
+           'is_descriptor', 'is_data_descriptor', 'is_non_data_descriptor',
+           'is_binding', 'is_read_only', 'is_set_once', 'is_forced_set',
+           'is_secret_set']
+
+
+# Pulled straight off of `type` so that metaclasses that override `__dict__`
+# or `__mro__` can't interfere with the lookup (`inspect.getattr_static()`
+# goes through similar trouble to avoid them)
+_class_dict = type.__dict__['__dict__'].__get__
+_class_mro = type.__dict__['__mro__'].__get__
 
 
 def get_descriptor(cls, descname):
     """
     Returns the descriptor object that is stored under *descname* instead of
     whatever the descriptor would have returned from its `__get__()` method.
+
+    This gives the same result as `inspect.getattr_static()`, but it only
+    walks the class dictionaries along the MRO (and then the metaclass's, like
+    `getattr_static()` does for classes), which makes it several times faster.
     :param cls: class to find the descriptor on
     :param descname: name of the descriptor
     :return: the descriptor stored under *descname* on *instance*
+    :raises AttributeError: if there is nothing stored under *descname*
     """
-    return inspect.getattr_static(cls, descname)
+    if not isinstance(cls, type):
+        return inspect.getattr_static(cls, descname)
+    for base in _class_mro(cls):
+        namespace = _class_dict(base)
+        if descname in namespace:
+            return namespace[descname]
+    for base in _class_mro(type(cls)):
+        namespace = _class_dict(base)
+        if descname in namespace:
+            return namespace[descname]
+    raise AttributeError(descname)
 
 
 def get_descriptor_from(instance, descname):
@@ -24,3 +53,178 @@ def get_descriptor_from(instance, descname):
     :return: the descriptor stored under *descname* on *instance*
     """
     return get_descriptor(type(instance), descname)
+
+
+def descriptors_of(cls, predicate=None):
+    """
+    Returns a read-only mapping of name -> descriptor for every descriptor
+    visible on *cls*, following the MRO the same way attribute lookup does (a
+    descriptor on a subclass hides one with the same name further up). Note
+    that this includes functions and the built-in descriptors that classes
+    get from `object`, since those are descriptors too.
+
+    The mapping is cached per class and per predicate. On every call, the
+    cache is checked against the MRO and the names and attributes (by
+    identity) in the namespace of each class in it, so adding, removing or
+    replacing attributes on any of those classes (or changing `__bases__`) is
+    noticed and the mapping is rebuilt. That check is still a pass over every
+    attribute, but a much cheaper one than collecting them again.
+    :param cls: class to collect the descriptors from
+    :param predicate: *optional* - a function that takes a descriptor and
+    returns whether it should be included, such as `is_data_descriptor()` or
+    `is_binding()`. Defaults to including every descriptor. Results are cached
+    by the predicate object, so reuse the same function rather than creating a
+    new lambda for each call
+    :return: a read-only mapping of attribute names to descriptors
+    """
+    if predicate is None:
+        predicate = is_descriptor
+    entry = _descriptor_cache.get(cls)
+    if entry is None or not entry.is_current(cls):
+        entry = _CachedDescriptors(cls)
+        try:
+            _descriptor_cache[cls] = entry
+        except TypeError:
+            pass  # cls doesn't support weak references; just don't cache
+    try:
+        return entry.filtered[predicate]
+    except KeyError:
+        descriptors = MappingProxyType(
+            {name: attr for name, attr in entry.visible.items()
+             if is_descriptor(attr) and predicate(attr)})
+        entry.filtered[predicate] = descriptors
+        return descriptors
+
+
+# class -> _CachedDescriptors
+_descriptor_cache = weakref.WeakKeyDictionary()
+
+
+class _CachedDescriptors:
+    __slots__ = ('mro', 'namespaces', 'visible', 'filtered')
+
+    def __init__(self, cls):
+        self.mro = _class_mro(cls)
+        # the values are held as well as compared, so their ids can't be
+        # reused by replacements
+        self.namespaces = [(tuple(namespace), tuple(namespace.values()))
+                           for namespace in map(_class_dict, self.mro)]
+        self.visible = _visible_attributes(cls)
+        self.filtered = {}
+
+    def is_current(self, cls):
+        mro = _class_mro(cls)
+        if mro != self.mro:
+            return False
+        for namespace, (names, values) in zip(map(_class_dict, mro),
+                                              self.namespaces):
+            if (tuple(namespace) != names
+                    or not all(map(is_, namespace.values(), values))):
+                return False
+        return True
+
+
+def _visible_attributes(cls):
+    visible = {}
+    for base in reversed(_class_mro(cls)):
+        visible.update(_class_dict(base))
+    return visible
+
+
+# ----------------------------------
+# predicates for `descriptors_of()`
+# ----------------------------------
+def is_descriptor(attr):
+    """
+    :return: `True` if *attr* implements any of the descriptor protocol
+    methods, else `False`
+    """
+    attrtype = type(attr)
+    return (hasattr(attrtype, '__get__') or hasattr(attrtype, '__set__')
+            or hasattr(attrtype, '__delete__'))
+
+
+def is_data_descriptor(attr):
+    """
+    :return: `True` if *attr* is a data descriptor (it implements `__set__()`
+    and/or `__delete__()`), else `False`
+    """
+    attrtype = type(attr)
+    return hasattr(attrtype, '__set__') or hasattr(attrtype, '__delete__')
+
+
+def is_non_data_descriptor(attr):
+    """
+    :return: `True` if *attr* is a descriptor that only implements
+    `__get__()`, else `False`
+    """
+    return hasattr(type(attr), '__get__') and not is_data_descriptor(attr)
+
+
+_method_types = (types.FunctionType, types.BuiltinFunctionType,
+                 types.WrapperDescriptorType, types.MethodDescriptorType,
+                 types.ClassMethodDescriptorType, staticmethod, classmethod)
+
+
+def is_binding(attr):
+    """
+    A binding descriptor is one that can be called with an instance to get
+    the attribute value for that instance, like `LazyProperty`,
+    `BindingProperty`, `InstanceProperty` or anything wrapped in the
+    `Binding` decorator. Methods aren't counted, even though functions are
+    technically binding descriptors too.
+    :return: `True` if *attr* is a binding descriptor, else `False`
+    """
+    from descriptor_tools.decorators import DescriptorDecoratorBase, Binding
+    if isinstance(attr, _method_types) or not is_descriptor(attr):
+        return False
+    # other decorators delegate __call__ to whatever they wrap
+    while (isinstance(attr, DescriptorDecoratorBase)
+           and not isinstance(attr, Binding)):
+        attr = attr.desc
+    return callable(attr)
+
+
+def is_read_only(attr):
+    """
+    :return: `True` if *attr* is any of the "read-only" descriptor types
+    (set-once, forced-set or secret-set), else `False`
+    """
+    return is_set_once(attr) or is_forced_set(attr) or is_secret_set(attr)
+
+
+def is_set_once(attr):
+    """
+    :return: `True` if *attr* is a set-once descriptor made with the
+    `SetOnce` decorator or mix-in, else `False`
+    """
+    from descriptor_tools import decorators, mixins
+    return _is_decorated_as(attr, decorators.SetOnce, mixins.Setters.SetOnce)
+
+
+def is_forced_set(attr):
+    """
+    :return: `True` if *attr* is a forced-set descriptor made with the
+    `ForcedSet` decorator or `Forced` mix-in, else `False`
+    """
+    from descriptor_tools import decorators, mixins
+    return _is_decorated_as(attr, decorators.ForcedSet, mixins.Setters.Forced)
+
+
+def is_secret_set(attr):
+    """
+    :return: `True` if *attr* is a secret-set descriptor made with the
+    `SecretSet` decorator or `Secret` mix-in, else `False`
+    """
+    from descriptor_tools import decorators, mixins
+    return _is_decorated_as(attr, decorators.SecretSet, mixins.Setters.Secret)
+
+
+def _is_decorated_as(attr, *kinds):
+    from descriptor_tools.decorators import DescriptorDecoratorBase
+    while True:
+        if isinstance(attr, kinds):
+            return True
+        if not isinstance(attr, DescriptorDecoratorBase):
+            return False
+        attr = attr.desc
@@ -2,7 +2,7 @@
 from descriptor_tools.instance_properties import DelegatedProperty
 
 
-__all__ = ['Lazy', 'LateInit', 'ByMap', 'Validating']
+__all__ = ['Lazy', 'AsyncLazy', 'LateInit', 'ByMap', 'Validating']
 
 
 no_value = object()
@@ -44,6 +44,73 @@ class Lazy(DelegatedProperty):
             self.initializer = None
 
 
+class AsyncLazy(DelegatedProperty):
+    """
+    :AsyncLazy is the asynchronous version of :Lazy. It takes a parameterless
+    coroutine function to calculate the value, and looking the attribute up
+    gives an awaitable for the value:
+
+        self.body = AsyncLazy(lambda: read_file(path))
+        ...
+        text = await document.body
+
+    The first lookup that's awaited starts the calculation as a task; lookups
+    awaited while it's still running wait on that same task, and all of them
+    get the value once it's done. From then on, the value is cached.
+
+    If the calculation raises an exception, every lookup waiting on it gets
+    that exception and nothing is cached, so the next lookup tries again.
+    Cancelling a lookup only cancels that lookup: the calculation keeps going
+    for the others, and its value is still cached. If the calculation's task
+    itself is cancelled, the lookups waiting on it are cancelled too, and the
+    next lookup starts again.
+
+    If the attribute is assigned to, the lazy calculation is ignored and the
+    given value is used instead, even by lookups already waiting on it.
+    """
+
+    def __init__(self, initializer):
+        """
+        Create the AsyncLazy attribute using a parameterless coroutine function
+        that will produce the value upon the first lookup.
+        :param initializer: parameterless coroutine function that, when
+            awaited, will produce the desired value for the attribute
+        """
+        self.value = no_value
+        self.initializer = initializer
+        self.task = None
+
+    def get(self):
+        return self._get()
+
+    async def _get(self):
+        import asyncio
+        if self.value is not no_value:
+            return self.value
+        task = self.task
+        # a finished one failed or was cancelled
+        if task is None or task.done():
+            task = self.task = asyncio.ensure_future(self._calculate())
+        return await asyncio.shield(task)
+
+    async def _calculate(self):
+        try:
+            # it may have been set before this got started
+            if self.value is no_value:
+                value = await self.initializer()
+                if self.value is no_value:
+                    self.value = value
+                    self.initializer = None  # release the initializer reference
+        finally:
+            self.task = None
+        return self.value
+
+    def set(self, value):
+        self.value = value
+        if self.initializer:
+            self.initializer = None
+
+
 class LateInit(DelegatedProperty):
     """
     :LateInit is a :DelegatedProperty that enforces that a value is supposed to
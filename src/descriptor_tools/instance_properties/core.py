@@ -1,7 +1,7 @@
 # coding=utf-8
 from abc import ABCMeta, abstractmethod
 
-from descriptor_tools.storage import InstanceStorage, protected
+from descriptor_tools.storage import InstanceStorage, protected, many_result
 
 __all__ = ['InstanceProperty', 'DelegatedProperty']
 
@@ -100,9 +100,24 @@ class InstanceProperty:
     def __call__(self, instance):
         return self.__get__(instance)
 
+    def many(self, instances, *, as_numpy=False):
+        """
+        The bulk form of calling the unbound attribute: returns a list of the
+        attribute's value for each of *instances*. The delegated properties
+        are looked up all at once through the storage's `get_many()`.
+        :param as_numpy: *optional* - defaults to `False` - return a NumPy
+            array instead of a list
+        """
+        values = [delegate.get()
+                  for delegate in self._delegates.get_many(instances)]
+        return many_result(values, as_numpy=as_numpy)
+
     def __set_name__(self, owner, name):
         self._delegates.set_name(name)
 
+    def slots_for(self, name):
+        return self._delegates.slots_for(name)
+
     def __get__(self, instance, owner=None):
         if instance is None:
             return self
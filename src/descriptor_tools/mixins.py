@@ -18,7 +18,8 @@ them.
 """
 
 from descriptor_tools import DescDict, NameMangler, name_of, \
-    id_name_of
+    id_name_of, namespace_of
+from descriptor_tools.storage import many_result
 
 
 __author__ = 'Jake'
@@ -42,6 +43,23 @@ class Getters:
         def __call__(self, instance):
             return self.__get__(instance)
 
+        def many(self, instances, *, as_numpy=False):
+            """
+            The bulk form of calling the unbound attribute: returns a list of
+            the attribute's value for each of *instances*. If there's a
+            `_get_many()` (which the `Storage.DescDict` mix-in provides), it is
+            used to look them all up at once.
+            :param as_numpy: *optional* - defaults to `False` - return a NumPy
+                array instead of a list
+            """
+            get_many = getattr(self, '_get_many', None)
+            if get_many is not None:
+                values = get_many(instances)
+            else:
+                get = self._get
+                values = [get(instance) for instance in instances]
+            return many_result(values, as_numpy=as_numpy)
+
         def __get__(self, instance, owner=None):
             if instance is None:
                 return self
@@ -80,20 +98,28 @@ class Storage:
     class DescDict:
         """
         `DescDict` is a mix-in that uses the descriptor_tools.DescDict as its
-        storage medium.
+        storage medium. Pass `allow_strong_keys=True` (as a named argument)
+        to allow instances that can't be weakly referenced, or
+        `weak_keys=False` to skip weak references for instances that live for
+        the whole process.
         """
-        def __init__(self, *args, **kwargs):
+        def __init__(self, *args, allow_strong_keys=False, weak_keys=True,
+                     **kwargs):
             try:
                 super().__init__(*args, **kwargs)
             except TypeError:
                 # This is expected when the mixin is not used with multiple
                 # inheritance, in which case, we just ignore it.
                 pass
-            self.storage = DescDict()
+            self.storage = DescDict(allow_strong_keys=allow_strong_keys,
+                                    weak_keys=weak_keys)
 
         def _get(self, instance):
             return self.storage[instance]
 
+        def _get_many(self, instances):
+            return self.storage.get_many(instances)
+
         def _set(self, instance, value):
             self.storage[instance] = 5
 
@@ -121,13 +147,13 @@ class Storage:
                 self._name = lambda inst: name
 
         def _get(self, instance):
-            return instance.__dict__[self._name(instance)]
+            return namespace_of(instance)[self._name(instance)]
 
         def _set(self, instance, value):
-            instance.__dict__[self._name(instance)] = value
+            namespace_of(instance)[self._name(instance)] = value
 
         def _delete(self, instance):
-            del instance.__dict__[self._name(instance)]
+            del namespace_of(instance)[self._name(instance)]
 
         def _name(self, instance):
             name = self.mangle(name_of(self, type(instance)))
@@ -135,6 +161,11 @@ class Storage:
             del self.mangle
             return name
 
+        def slots_for(self, name):
+            if 'mangle' in vars(self):
+                return (self.mangle(name),)
+            return (self._name(None),)
+
     class KeyById:
         """
         The `KeyById` mix-in stores its values back onto its corresponding
@@ -162,13 +193,16 @@ class Storage:
             return id_name_of(self)
 
         def _get(self, instance):
-            return instance.__dict__[self._name]
+            return namespace_of(instance)[self._name]
 
         def _set(self, instance, value):
-            instance.__dict__[self._name] = value
+            namespace_of(instance)[self._name] = value
 
         def _delete(self, instance):
-            del instance.__dict__[self._name]
+            del namespace_of(instance)[self._name]
+
+        def slots_for(self, name):
+            return (self._name,)
 
 
 class Setters:
@@ -1,4 +1,6 @@
 # coding=utf-8
+import weakref
+
 from descriptor_tools import get_descriptor
 
 
@@ -6,19 +8,29 @@ __author__ = 'Jake'
 __all__ = ['name_of', 'id_name_of']
 
 
+# class -> {id(attribute): name} reverse index of everything visible on the
+# class, built lazily by `name_of()`
+_name_indexes = weakref.WeakKeyDictionary()
+
+
 def name_of(descriptor, owner):
     """
     Given a descriptor and a class that the descriptor is stored on, returns
     the name of the attribute the descriptor is stored under.
     Also works if the given class is a subclass of the class that *actually*
     has the descriptor attribute
+
+    The first lookup on a class builds a reverse index of every attribute
+    visible on it (following the MRO), so later lookups on that class are just
+    a dictionary lookup plus a check that the descriptor is still stored under
+    the indexed name. If the class has been changed since the index was built
+    (attributes added, removed or moved), the index is rebuilt.
     
     :param descriptor: descriptor the name is being looked up for
     :param owner: class that "owns" the descriptor
     :return: the name the descriptor is stored under on *owner*
     """
-    name = _first(attr for attr in dir(owner)
-                  if (get_descriptor(owner, attr) is descriptor))
+    name = _indexed_name(descriptor, owner)
     if name is None:
         raise RuntimeError(
             str.format(
@@ -28,8 +40,37 @@ def name_of(descriptor, owner):
     return name
 
 
-def _first(iter):
-    return next(iter, None)
+def _indexed_name(descriptor, owner):
+    index = _name_indexes.get(owner)
+    if index is not None:
+        name = index.get(id(descriptor))
+        if name is not None and _is_stored_under(descriptor, owner, name):
+            return name
+    index = _build_name_index(owner)
+    try:
+        _name_indexes[owner] = index
+    except TypeError:
+        pass  # owner doesn't support weak references; just don't cache
+    return index.get(id(descriptor))
+
+
+def _is_stored_under(descriptor, owner, name):
+    try:
+        return get_descriptor(owner, name) is descriptor
+    except AttributeError:
+        return False
+
+
+def _build_name_index(owner):
+    visible = {}
+    for cls in reversed(owner.__mro__):
+        visible.update(cls.__dict__)
+    # when a descriptor is stored under multiple names, the alphabetically
+    # first one wins, just like when scanning `dir()`
+    index = {}
+    for name in sorted(visible):
+        index.setdefault(id(visible[name]), name)
+    return index
 
 
 def id_name_of(descriptor):
@@ -1,10 +1,15 @@
 # coding=utf-8
-from descriptor_tools import name_of
+import threading
+
+from descriptor_tools import name_of, namespace_of, SlotNamespace
+from descriptor_tools.entries import DEFAULT
+from descriptor_tools.storage import many_from, many_result
 
 from descriptor_tools.decorators import binding
 
 __author__ = 'Jake'
-__all__ = ['LazyProperty', 'BindingProperty', 'withConstants']
+__all__ = ['LazyProperty', 'AsyncLazyProperty', 'BindingProperty',
+           'withConstants']
 
 
 class LazyProperty:
@@ -45,25 +50,142 @@ class LazyProperty:
     Note: If you use a lambda as the function from which to calculate the
     lazy value, you must provide `named=False` as an argument to the
     `LazyProperty` constructor.
+
+    The value is cached in the instance's `__dict__` under the property's own
+    name, or, for instances without a `__dict__`, in a slot named after the
+    property with an underscore in front, which `with_slots()` can generate.
+    To cache it somewhere else, pass a :DescriptorStorage as `storage`. Values
+    that go missing from the storage are calculated again, so a bounded one,
+    like :LRUStorage, puts a ceiling on the memory used by the cached values:
+
+        area = LazyProperty(calculate_area, storage=LRUStorage(max_entries=1000))
+
+    By default, threads that look up a value that hasn't been cached yet at
+    the same time will each calculate it. With `single_flight=True`, only the
+    first one does; the others wait for it and get its value, or the exception
+    it raised. Nothing is cached when the calculation fails, so the next
+    lookup tries again. Threads only wait on lookups of the same attribute of
+    the same instance, and not at all once the value is cached:
+
+        area = LazyProperty(calculate_area, single_flight=True)
     """
-    def __init__(self, func, *, named=True):
+    def __init__(self, func, *, named=True, storage=None, single_flight=False):
         self.func = func
+        self.storage = storage
+        if storage is not None:
+            storage.desc = self
         if named:
             name = self.func.__name__
             self._name = lambda inst: name
+            if storage is not None and storage.base_name is None:
+                storage.set_name(name)
+        self.single_flight = single_flight
+        if single_flight:
+            self._flights = {}
+            self._flights_lock = threading.Lock()
 
     def __call__(self, instance):
         return self.__get__(instance)
 
+    def many(self, instances, *, as_numpy=False):
+        """
+        The bulk form of calling the unbound property: returns a list of the
+        property's value for each of *instances*. With a `storage`, the cached
+        values are looked up all at once through its `get_many()`, and only
+        if some are missing are they looked up one at a time, calculating the
+        missing ones.
+        :param as_numpy: *optional* - defaults to `False` - return a NumPy
+            array instead of a list, gathered by the storage if it can
+        """
+        if self.storage is not None:
+            instances = list(instances)
+            try:
+                return many_from(self.storage, instances, as_numpy=as_numpy)
+            except AttributeError:
+                get = self._get_from_storage
+        else:
+            get = self.__get__
+        values = [get(instance) for instance in instances]
+        return many_result(values, as_numpy=as_numpy)
+
     def __get__(self, instance, owner=None):
         if instance is None:
             return self
-        if self._name(instance) in instance.__dict__:
-            return instance.__dict__[self._name(instance)]
+        if self.storage is not None:
+            return self._get_from_storage(instance)
+        namespace = namespace_of(instance)
+        key = self._key(namespace, instance)
+        if key in namespace:
+            return namespace[key]
+        if self.single_flight:
+            return self._calculate_once(instance)
         value = self.func(instance)
-        instance.__dict__[self._name(instance)] = value
+        namespace[key] = value
+        return value
+
+    def _get_from_storage(self, instance):
+        try:
+            return self.storage[instance]
+        except AttributeError:
+            if self.single_flight:
+                return self._calculate_once(instance)
+            value = self.func(instance)
+            self.storage[instance] = value
+            return value
+
+    def _cached(self, instance):
+        if self.storage is not None:
+            try:
+                return self.storage[instance]
+            except AttributeError:
+                return DEFAULT
+        namespace = namespace_of(instance)
+        return namespace.get(self._key(namespace, instance), DEFAULT)
+
+    def _store(self, instance, value):
+        if self.storage is not None:
+            self.storage[instance] = value
+            return
+        namespace = namespace_of(instance)
+        namespace[self._key(namespace, instance)] = value
+
+    def _key(self, namespace, instance):
+        if type(namespace) is SlotNamespace:
+            return '_' + self._name(instance)
+        return self._name(instance)
+
+    def _calculate_once(self, instance):
+        # the instance is alive until its flight is removed, so its id can't
+        # be reused for a different one in the meantime
+        with self._flights_lock:
+            # it may have been cached since the caller looked
+            value = self._cached(instance)
+            if value is not DEFAULT:
+                return value
+            flight = self._flights.get(id(instance))
+            leading = flight is None
+            if leading:
+                flight = self._flights[id(instance)] = _Flight()
+        if not leading:
+            return flight.wait()
+        try:
+            value = self.func(instance)
+            self._store(instance, value)
+            flight.value = value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[id(instance)]
+            flight.done.set()
         return value
 
+    def slots_for(self, name):
+        if self.storage is not None:
+            return self.storage.slots_for(name)
+        return ('_' + name,)
+
     def _name(self, instance):
         if instance is None:
             return "<unknown name>"
@@ -92,6 +214,115 @@ class LazyProperty:
         return self.__str__() +" "+ id(self)
 
 
+class AsyncLazyProperty(LazyProperty):
+    """
+    :AsyncLazyProperty is the asynchronous version of :LazyProperty, for values
+    that are calculated by a coroutine function, such as ones read from a file
+    or a database. Looking the attribute up gives an awaitable for the value:
+
+        class Document:
+            @AsyncLazyProperty
+            async def body(self):
+                return await read_file(self.path)
+
+        text = await document.body
+
+    The first lookup that's awaited starts the calculation as a task; lookups
+    awaited while it's still running wait on that same task instead of
+    starting another one, and all of them get the value once it's done. From
+    then on, the value is cached. It's cached in the instance under the
+    property's name with an underscore in front (in a `__dict__` or a slot),
+    or in the given *storage*, like with :LazyProperty.
+
+    If the calculation raises an exception, every lookup waiting on it gets
+    that exception and nothing is cached, so the next lookup tries again.
+    Cancelling a lookup only cancels that lookup: the calculation keeps going
+    for the others, and its value is still cached, even if nothing is waiting
+    on it anymore. If the calculation's task itself is cancelled, the lookups
+    waiting on it are cancelled too, and the next lookup starts again.
+
+    The instances should only be used from one event loop at a time.
+    """
+    def __init__(self, func, *, named=True, storage=None):
+        super().__init__(func, named=named, storage=storage)
+        self._tasks = {}
+
+    def many(self, instances, *, as_numpy=False):
+        """
+        The bulk form of calling the unbound property: returns an awaitable
+        for a list of the property's value for each of *instances*, which are
+        all calculated concurrently
+        :param as_numpy: *optional* - defaults to `False` - give a NumPy array
+            instead of a list
+        """
+        return self._get_many(instances, as_numpy)
+
+    async def _get_many(self, instances, as_numpy):
+        import asyncio
+        values = list(await asyncio.gather(*map(self._get, instances)))
+        return many_result(values, as_numpy=as_numpy)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return self._get(instance)
+
+    async def _get(self, instance):
+        import asyncio
+        value = self._cached(instance)
+        if value is not DEFAULT:
+            return value
+        # the task holds on to the instance until it's removed, so the id
+        # can't be reused for a different one in the meantime
+        task = self._tasks.get(id(instance))
+        # a finished one failed or was cancelled (or its value was dropped by
+        # the storage) and is just waiting to be removed
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._calculate(instance))
+            self._tasks[id(instance)] = task
+            task.add_done_callback(
+                lambda task, key=id(instance): self._finished(key, task))
+        return await asyncio.shield(task)
+
+    async def _calculate(self, instance):
+        value = await self.func(instance)
+        self._store(instance, value)
+        return value
+
+    def _finished(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    def _key(self, namespace, instance):
+        # never the property's own name, or the cached value would hide it
+        return '_' + self._name(instance)
+
+    def __str__(self):
+        return "Async " + super().__str__()
+
+
+class _Flight:
+    """
+    A calculation of a single-flight :LazyProperty's value that's in progress
+    """
+    __slots__ = ('done', 'value', 'error', 'thread')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.thread = threading.get_ident()
+
+    def wait(self):
+        if self.thread == threading.get_ident():
+            raise RuntimeError("Lazy property's value was looked up while "
+                               "calculating it")
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
 class BindingProperty(property):
     """
     `BindingProperty` is exactly like `property` except that it 
@@ -100,6 +331,19 @@ class BindingProperty(property):
     def __call__(self, instance):
         return self.__get__(instance)
 
+    def many(self, instances, *, as_numpy=False):
+        """
+        The bulk form of calling the unbound property: returns a list of the
+        property's value for each of *instances*, calling the getter directly
+        :param as_numpy: *optional* - defaults to `False` - return a NumPy
+            array instead of a list
+        """
+        if self.fget is None:
+            raise AttributeError("unreadable attribute")
+        fget = self.fget
+        values = [fget(instance) for instance in instances]
+        return many_result(values, as_numpy=as_numpy)
+
 
 class Constant:
     """
@@ -1,6 +1,6 @@
 # coding=utf-8
 import functools
-from . import get_descriptor_from
+from . import get_descriptor_from, namespace_of
 
 
 __author__ = 'Jake'
@@ -38,12 +38,12 @@ def NameMangler(prefix='', postfix=''):
 def set_on(instance, attrname, value):
     """
     A cleaner, slightly shorter way of setting values directly on an instance's
-    `__dict__`.
+    `__dict__`, or in its slot named *attrname* if it doesn't have one.
     :param instance: instance to store the value on
     :param attrname: name of the attribute to store the value with
     :param value: value to store on the instance
     """
-    instance.__dict__[attrname] = value
+    namespace_of(instance)[attrname] = value
 
 
 # ---------------------------------------------------
@@ -0,0 +1,194 @@
+# coding=utf-8
+"""
+Support for using descriptors on classes with `__slots__`.
+
+Everything in the library that stores values on the instances themselves
+(:InstanceStorage, :SideTableStorage, `LazyProperty`, `set_on()`, the
+`KeyByName` and `KeyById` mix-ins, etc.) does it through `namespace_of()`,
+which gives back the instance's `__dict__` or, when it doesn't have one, a
+:SlotNamespace that reads and writes the instance's slots instead.
+
+Those descriptors report the slots they need through a `slots_for(name)`
+method, which the `with_slots()` class decorator uses to generate the
+`__slots__` of a class, so that descriptor-managed classes can drop their
+instance dictionaries entirely.
+"""
+import functools
+from types import FunctionType, MemberDescriptorType
+
+from descriptor_tools import get_descriptor
+
+__author__ = 'Jake'
+__all__ = ['namespace_of', 'SlotNamespace', 'with_slots']
+
+
+def namespace_of(instance):
+    """
+    Returns where the attributes of *instance* can be stored directly: its
+    `__dict__` if it has one, otherwise a :SlotNamespace over its slots.
+    :param instance: instance to get the namespace of
+    :return: a `dict` or a dict-like :SlotNamespace
+    """
+    try:
+        return vars(instance)
+    except TypeError:
+        return SlotNamespace(instance)
+
+
+class SlotNamespace:
+    """
+    :SlotNamespace is a dict-like view of the slots of an instance, for use
+    where the instance's `__dict__` would be used if it had one. Slots that
+    haven't been assigned to are treated as missing keys, as are names that
+    aren't slots at all, which also can't be assigned to.
+    """
+    __slots__ = ('instance',)
+
+    def __init__(self, instance):
+        self.instance = instance
+
+    def _slot(self, name):
+        try:
+            slot = get_descriptor(type(self.instance), name)
+        except AttributeError:
+            return None
+        return slot if type(slot) is MemberDescriptorType else None
+
+    def __getitem__(self, name):
+        slot = self._slot(name)
+        if slot is None:
+            raise KeyError(name)
+        try:
+            return slot.__get__(self.instance, type(self.instance))
+        except AttributeError:
+            raise KeyError(name)
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __setitem__(self, name, value):
+        slot = self._slot(name)
+        if slot is None:
+            raise AttributeError(
+                "'{}' object has no slot '{}'".format(
+                    type(self.instance).__name__, name))
+        slot.__set__(self.instance, value)
+
+    def __delitem__(self, name):
+        slot = self._slot(name)
+        if slot is None:
+            raise KeyError(name)
+        try:
+            slot.__delete__(self.instance)
+        except AttributeError:
+            raise KeyError(name)
+
+    def __contains__(self, name):
+        slot = self._slot(name)
+        if slot is None:
+            return False
+        try:
+            slot.__get__(self.instance, type(self.instance))
+        except AttributeError:
+            return False
+        return True
+
+
+def with_slots(cls=None, *, weakrefable=False):
+    """
+    Class decorator that rebuilds the class with `__slots__` holding every
+    slot needed by the descriptors defined on it (as reported by their
+    `slots_for(name)` methods), on top of any `__slots__` the class already
+    declared. If all the base classes have `__slots__` too, the instances
+    won't have a `__dict__`.
+
+        @with_slots
+        class Point:
+            x = InstanceProperty()
+            y = InstanceProperty()
+
+    gives `Point` the slots `_x` and `_y`, where :InstanceProperty's default
+    storage keeps its values.
+
+    Like any class decorator that adds `__slots__`, this creates a new class,
+    so `__set_name__()` and `__init_subclass__()` run again for it. Zero
+    argument `super()` calls in its methods are pointed at the new class.
+    :param cls: the class to add the slots to
+    :param weakrefable: *optional* - defaults to `False` - whether to add a
+        `__weakref__` slot (needed for :DictStorage and :DescDict without
+        `allow_strong_keys`) if the base classes don't already have one
+    :return: the new class
+    :raises ValueError: if a descriptor needs a slot with the name of an
+        attribute of the class, like its own name, which happens when it
+        stores values under its own name (:InstanceStorage with the
+        `identity` name mangler, for one)
+    """
+    if cls is None:
+        return functools.partial(with_slots, weakrefable=weakrefable)
+
+    namespace = dict(cls.__dict__)
+    existing = namespace.pop('__slots__', ())
+    if isinstance(existing, str):
+        existing = (existing,)
+    for slot in existing:
+        namespace.pop(slot, None)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+
+    slots = list(existing)
+    for name, attr in cls.__dict__.items():
+        if getattr(type(attr), 'slots_for', None) is None:
+            continue
+        for slot in attr.slots_for(name):
+            if slot in namespace:
+                raise ValueError(_slot_conflict(cls, name, attr, slot))
+            if slot not in slots:
+                slots.append(slot)
+    if weakrefable and not any(base.__weakrefoffset__ for base in cls.__bases__):
+        if '__weakref__' not in slots:
+            slots.append('__weakref__')
+    namespace['__slots__'] = tuple(slots)
+
+    new_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    new_cls.__qualname__ = cls.__qualname__
+    _retarget_class_cells(new_cls, cls)
+    return new_cls
+
+
+def _slot_conflict(cls, name, attr, slot):
+    if slot == name:
+        return ("The descriptor {!r} on {}.{} needs a slot with the same name "
+                "as the attribute itself, which would replace it. Give it (or "
+                "its storage) a name mangler, such as `protected`, or a "
+                "prefix, so the value is stored under a different name"
+                .format(attr, cls.__qualname__, name))
+    return ("The descriptor {!r} on {}.{} needs a slot named '{}', which is "
+            "already an attribute of the class".format(
+                attr, cls.__qualname__, name, slot))
+
+
+def _retarget_class_cells(new_cls, old_cls):
+    # zero argument super() finds the class through a `__class__` cell in the
+    # closure of each method, which still holds the old class
+    for attr in vars(new_cls).values():
+        for func in _functions_of(attr):
+            for cell in func.__closure__ or ():
+                try:
+                    if cell.cell_contents is old_cls:
+                        cell.cell_contents = new_cls
+                except ValueError:  # empty cell
+                    pass
+
+
+def _functions_of(attr):
+    if isinstance(attr, FunctionType):
+        return [attr]
+    if isinstance(attr, (classmethod, staticmethod)):
+        return _functions_of(attr.__func__)
+    if isinstance(attr, property):
+        return [f for f in (attr.fget, attr.fset, attr.fdel)
+                if isinstance(f, FunctionType)]
+    return []
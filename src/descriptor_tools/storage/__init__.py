@@ -0,0 +1,20 @@
+# coding=utf-8
+from .core import *
+from .columnar import *
+from .bounded import *
+from .scoped import *
+from .shared import *
+from .interning import *
+from .compressed import *
+from .spill import *
+from .packed import *
+from .adaptive import *
+from .migration import *
+
+from . import (core, columnar, bounded, scoped, shared, interning, compressed,
+               spill, packed, adaptive, migration)
+
+__all__ = (core.__all__ + columnar.__all__ + bounded.__all__ + scoped.__all__ +
+           shared.__all__ + interning.__all__ + compressed.__all__ +
+           spill.__all__ + packed.__all__ + adaptive.__all__ +
+           migration.__all__)
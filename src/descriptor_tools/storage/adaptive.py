@@ -0,0 +1,199 @@
+# coding=utf-8
+from collections import namedtuple
+
+from descriptor_tools.storage.core import StorageWrapper, DictStorage
+from descriptor_tools.storage.columnar import ColumnStorage
+
+__author__ = 'Jake'
+__all__ = ['AdaptiveStorage', 'AccessStats', 'Decision',
+           'numeric_column_policy']
+
+
+AccessStats = namedtuple('AccessStats', 'reads writes population types')
+AccessStats.__doc__ = """
+What :AdaptiveStorage has seen since its last decision: the number of reads and
+writes, the number of values stored, and a dict of the number of values of
+each type that were written.
+"""
+
+Decision = namedtuple('Decision', 'operation old new reason stats switched')
+Decision.__doc__ = """
+A record of :AdaptiveStorage switching backends, or trying to: how many
+operations in it happened, the class names of the old and new backends, why,
+the :AccessStats it was based on, and whether the switch happened (it doesn't
+if a value already stored can't be moved to the new backend).
+"""
+
+_COLUMN_TYPECODES = {float: 'd', int: 'q'}
+
+
+def _exact_type_of(storage):
+    # the only type a column gives back, which anything else set in it would be
+    # converted to (like an int or bool into a float column)
+    if type(storage) is not ColumnStorage:
+        return None
+    return float if storage.typecode in 'fd' else int
+
+
+def numeric_column_policy(stats, current, *, min_population=1024):
+    """
+    The default policy of :AdaptiveStorage. Moves the values from a
+    :DictStorage to a :ColumnStorage once at least *min_population* values are
+    stored and every value written since the last decision was a `float` (or
+    every one was an `int`), since the column stores them unboxed.
+    :param stats: the :AccessStats since the last decision
+    :param current: the current backend
+    :param min_population: *optional* - defaults to 1024 - the fewest values
+        worth moving to a column
+    :return: a `(new backend, reason)` pair, or `None` to keep the current one
+    """
+    if type(current) is not DictStorage or stats.population < min_population:
+        return None
+    if len(stats.types) != 1:
+        return None
+    kind, = stats.types
+    typecode = _COLUMN_TYPECODES.get(kind)
+    if typecode is None:
+        return None
+    reason = "{} values, all {}".format(stats.population, kind.__name__)
+    return ColumnStorage(typecode), reason
+
+
+class AdaptiveStorage(StorageWrapper):
+    """
+    :AdaptiveStorage is a type of :DescriptorStorage that picks its backend
+    while it's being used instead of when the class is defined. It starts off
+    with a :DictStorage and counts the reads, writes and types of values
+    written. Every *window* operations, it hands those :AccessStats to its
+    *policy*, which can pick a new backend, and all the values are moved over
+    to it. By default, that's `numeric_column_policy()`, which moves large
+    attributes holding only floats or only ints into a :ColumnStorage.
+
+    A value the current backend can't hold as it is (like a string, or an
+    `int` or `bool` in a column of floats, or an `int` too big for it) moves
+    everything back to a :DictStorage before it's stored.
+
+    Every switch is recorded in `decisions`, a list of :Decisions. Once the
+    choice has settled, `pin()` stops any further switches (apart from moving
+    back to a :DictStorage for a value the backend can't hold), and the
+    per-operation overhead drops to nothing.
+
+    A switch only happens if every value already stored can be moved;
+    otherwise, the current backend is kept, the failure is recorded in
+    `decisions`, and the window is doubled before the next decision, so
+    repeatedly trying a switch that keeps failing stays cheap.
+
+    Backends have to support `items()` and `len()`, like :DictStorage and
+    :ColumnStorage do. A custom *policy* takes the :AccessStats and the current
+    backend and returns either `None` or a pair of the new backend and the
+    reason for the change.
+    """
+    def __init__(self, desc=None, *, policy=numeric_column_policy, window=1024,
+                 pinned=False):
+        """
+        :param desc: the descriptor the storage is for
+        :param policy: *optional* - defaults to `numeric_column_policy` -
+            picks the backend
+        :param window: *optional* - defaults to 1024 - the number of
+            operations between decisions
+        :param pinned: *optional* - defaults to `False` - start off pinned to
+            the :DictStorage
+        """
+        super().__init__(DictStorage(), desc)
+        self.policy = policy
+        self.window = window
+        self.pinned = pinned
+        self.decisions = []
+        self._operations = 0
+        self._next_window = window
+        self._exact_type = None
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self._reads = 0
+        self._writes = 0
+        self._types = {}
+
+    def __getitem__(self, instance):
+        if not self.pinned:
+            self._reads += 1
+            if self._reads + self._writes >= self._next_window:
+                self._decide()
+        return self.storage[instance]
+
+    def __setitem__(self, instance, value):
+        if not self.pinned:
+            self._writes += 1
+            kind = type(value)
+            self._types[kind] = self._types.get(kind, 0) + 1
+            if self._reads + self._writes >= self._next_window:
+                self._decide()
+        exact_type = self._exact_type
+        if exact_type is not None and type(value) is not exact_type:
+            self._switch(DictStorage(), "can't hold {!r} as a {}".format(
+                value, exact_type.__name__))
+        try:
+            self.storage[instance] = value
+        except (TypeError, OverflowError) as e:
+            if type(self.storage) is DictStorage:
+                raise
+            self._switch(DictStorage(), "can't hold {!r}: {}".format(value, e))
+            self.storage[instance] = value
+
+    def stats(self):
+        """
+        :return: the :AccessStats since the last decision
+        """
+        return AccessStats(self._reads, self._writes, len(self.storage),
+                           dict(self._types))
+
+    def _decide(self):
+        stats = self.stats()
+        self._operations += stats.reads + stats.writes
+        self._reset_stats()
+        choice = self.policy(stats, self.storage)
+        if choice is not None:
+            self._switch(*choice, stats=stats)
+
+    def _switch(self, new, reason, stats=None):
+        old = self.storage
+        if stats is None:
+            stats = self.stats()
+        new.desc = old.desc
+        if old.base_name is not None:
+            new.set_name(old.base_name)
+        operation = self._operations + self._reads + self._writes
+        exact_type = _exact_type_of(new)
+        try:
+            for instance, value in old.items():
+                if exact_type is not None and type(value) is not exact_type:
+                    raise TypeError("can't hold {!r} as a {}".format(
+                        value, exact_type.__name__))
+                new[instance] = value
+        except (TypeError, OverflowError) as e:
+            # a value from before the window that the new backend can't hold
+            self.decisions.append(Decision(
+                operation, type(old).__name__, type(new).__name__,
+                "{}; {}".format(reason, e), stats, False))
+            self._next_window *= 2
+            return
+        self.storage = new
+        self._exact_type = exact_type
+        self._next_window = self.window
+        self.decisions.append(Decision(
+            operation, type(old).__name__, type(new).__name__, reason, stats,
+            True))
+
+    def pin(self):
+        """
+        Stops switching backends and counting operations
+        """
+        self.pinned = True
+
+    def unpin(self):
+        """
+        Starts counting operations again, for a new decision
+        """
+        self.pinned = False
+        self._next_window = self.window
+        self._reset_stats()
@@ -0,0 +1,241 @@
+# coding=utf-8
+from collections import OrderedDict, namedtuple
+import sys
+import time
+
+from descriptor_tools.entries import weak_entry, strong_entry, remover
+from descriptor_tools.storage.core import DescriptorStorage
+
+__author__ = 'Jake'
+__all__ = ['LRUStorage', 'CacheInfo', 'TTLStorage']
+
+
+CacheInfo = namedtuple(
+    'CacheInfo',
+    'hits misses evictions max_entries max_bytes entries bytes')
+
+
+class LRUStorage(DescriptorStorage):
+    """
+    :LRUStorage is a type of :DescriptorStorage for per-instance caches that
+    need a hard ceiling on their size. Like :DictStorage, it keeps the values on
+    the storage, but it holds at most *max_entries* values and/or values adding
+    up to at most *max_bytes* (as measured by *sizeof*), evicting the least
+    recently used values to stay under those limits.
+
+    An evicted value is simply missing, so looking it up raises the usual
+    `AttributeError`. Given to a `LazyProperty` as its `storage`, an evicted
+    value is computed again on the next lookup instead.
+
+    The number of hits, misses and evictions are counted as it's used; see
+    `cache_info()`.
+
+    Instances must support weak references unless `weak_keys` is `False`, in
+    which case the values are kept until they're evicted or deleted, even if
+    the instance would otherwise be gone.
+    """
+    def __init__(self, desc=None, *, max_entries=None, max_bytes=None,
+                 sizeof=sys.getsizeof, weak_keys=True):
+        """
+        :param desc: the descriptor the storage is for
+        :param max_entries: *optional* - the most values to hold at once
+        :param max_bytes: *optional* - the most bytes the values can add up to
+        :param sizeof: *optional* - defaults to `sys.getsizeof` - gives the
+            size of a value in bytes, for *max_bytes*. Pass something deeper
+            than the default for values that contain other objects
+        :param weak_keys: *optional* - defaults to `True` - whether to hold
+            the instances weakly
+        :raises ValueError: if neither *max_entries* nor *max_bytes* is given
+        """
+        if max_entries is None and max_bytes is None:
+            raise ValueError("LRUStorage needs max_entries or max_bytes")
+        super().__init__(desc)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self.weak_keys = weak_keys
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._remove = remover(self, '_entries', LRUStorage._forget_size)
+
+    def __getitem__(self, instance):
+        key_id = id(instance)
+        entry = self._entries.get(key_id)
+        if entry is None:
+            self.misses += 1
+            self._raiseNoAttr(instance)
+        self._entries.move_to_end(key_id)
+        self.hits += 1
+        return entry.value[0]
+
+    def __setitem__(self, instance, value):
+        size = 0 if self.max_bytes is None else self._sizeof(value)
+        key_id = id(instance)
+        old = self._entries.pop(key_id, None)
+        if old is not None:
+            self._bytes -= old.value[1]
+        if self.weak_keys:
+            entry = weak_entry(instance, self._remove, (value, size))
+        else:
+            entry = strong_entry(instance, (value, size))
+        self._entries[key_id] = entry
+        self._bytes += size
+        self._evict()
+
+    def __delitem__(self, instance):
+        entry = self._entries.pop(id(instance), None)
+        if entry is None:
+            self._raiseNoAttr(instance)
+        self._bytes -= entry.value[1]
+
+    def __contains__(self, instance):
+        return id(instance) in self._entries
+
+    def _forget_size(self, entry):
+        self._bytes -= entry.value[1]
+
+    def _evict(self):
+        entries = self._entries
+        max_entries = self.max_entries
+        max_bytes = self.max_bytes
+        while entries and (
+                (max_entries is not None and len(entries) > max_entries) or
+                (max_bytes is not None and self._bytes > max_bytes)):
+            _, entry = entries.popitem(last=False)
+            self._bytes -= entry.value[1]
+            self.evictions += 1
+
+    def cache_info(self):
+        """
+        :return: a :CacheInfo with the hit, miss and eviction counts, the
+            limits, and the number of values (and their total size in bytes,
+            if *max_bytes* is used) currently held
+        """
+        return CacheInfo(self.hits, self.misses, self.evictions,
+                         self.max_entries, self.max_bytes,
+                         len(self._entries), self._bytes)
+
+    def clear(self):
+        """
+        Removes every value and resets the counts
+        """
+        self._entries.clear()
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+
+class TTLStorage(DescriptorStorage):
+    """
+    :TTLStorage is a type of :DescriptorStorage for values that go stale. Each
+    value is stamped with an expiry time *ttl* seconds after it's set, after
+    which it's treated as missing: looking it up raises the usual
+    `AttributeError` (or, given to a `LazyProperty` as its `storage`, has it
+    calculated again).
+
+    Expired values are dropped lazily, when they're looked up, which costs a
+    single call to the clock and a comparison. Since every value lives for the
+    same *ttl*, the values are kept in order of expiry, and each set also drops
+    up to *sweep_batch* of the oldest values if they've expired, so values that
+    are never looked up again don't pile up, without any background thread.
+    `sweep()` drops every expired value at once.
+
+    Instances must support weak references unless `weak_keys` is `False`.
+    """
+    def __init__(self, desc=None, *, ttl, clock=time.monotonic, sweep_batch=4,
+                 weak_keys=True):
+        """
+        :param desc: the descriptor the storage is for
+        :param ttl: how long, in seconds (or whatever unit *clock* uses), a
+            value lasts after being set
+        :param clock: *optional* - defaults to `time.monotonic` - callable
+            that returns the current time
+        :param sweep_batch: *optional* - defaults to 4 - the most expired
+            values to drop on each set
+        :param weak_keys: *optional* - defaults to `True` - whether to hold
+            the instances weakly
+        """
+        super().__init__(desc)
+        self.ttl = ttl
+        self._clock = clock
+        self.sweep_batch = sweep_batch
+        self.weak_keys = weak_keys
+        self._entries = OrderedDict()
+
+        self._remove = remover(self, '_entries')
+
+    def __getitem__(self, instance):
+        entry = self._entries.get(id(instance))
+        if entry is None:
+            self._raiseNoAttr(instance)
+        value, expires = entry.value
+        if self._clock() >= expires:
+            del self._entries[id(instance)]
+            self._raiseNoAttr(instance)
+        return value
+
+    def __setitem__(self, instance, value):
+        now = self._clock()
+        key_id = id(instance)
+        entries = self._entries
+        entries.pop(key_id, None)
+        if self.weak_keys:
+            entry = weak_entry(instance, self._remove, (value, now + self.ttl))
+        else:
+            entry = strong_entry(instance, (value, now + self.ttl))
+        entries[key_id] = entry
+        self._sweep(now, self.sweep_batch)
+
+    def __delitem__(self, instance):
+        if instance not in self:
+            self._raiseNoAttr(instance)
+        del self._entries[id(instance)]
+
+    def __contains__(self, instance):
+        entry = self._entries.get(id(instance))
+        if entry is None:
+            return False
+        if self._clock() >= entry.value[1]:
+            del self._entries[id(instance)]
+            return False
+        return True
+
+    def get_many(self, instances):
+        now = self._clock()
+        get = self._entries.get
+        values = []
+        append = values.append
+        for instance in instances:
+            entry = get(id(instance))
+            if entry is None or now >= entry.value[1]:
+                self._raiseNoAttr(instance)
+            append(entry.value[0])
+        return values
+
+    def sweep(self):
+        """
+        Drops every expired value
+        :return: the number of values dropped
+        """
+        return self._sweep(self._clock(), len(self._entries))
+
+    def _sweep(self, now, limit):
+        entries = self._entries
+        swept = 0
+        while swept < limit and entries:
+            entry = next(iter(entries.values()))
+            if now < entry.value[1]:
+                break
+            entries.popitem(last=False)
+            swept += 1
+        return swept
+
+    def __len__(self):
+        """
+        :return: the number of values held, including any that have expired
+            but haven't been dropped yet
+        """
+        return len(self._entries)
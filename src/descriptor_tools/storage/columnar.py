@@ -0,0 +1,228 @@
+# coding=utf-8
+from array import array
+
+from descriptor_tools.entries import weak_entry, remover
+from descriptor_tools.storage.core import DescriptorStorage
+
+__author__ = 'Jake'
+__all__ = ['ColumnStorage', 'RowIndex']
+
+
+class RowIndex:
+    """
+    :RowIndex hands out dense row numbers to instances for :ColumnStorage. An
+    instance gets a row the first time a value is stored for it in any column
+    using the index, and the row goes onto a free list to be reused when the
+    instance is cleaned up (or `release()`d).
+
+    Share a single :RowIndex between the :ColumnStorages of the different
+    attributes of a class to have every column use the same row for the same
+    instance, so the columns line up for vectorized processing.
+
+    Instances must support weak references.
+    """
+    def __init__(self):
+        self._rows = {}
+        self._free = []
+        self._size = 0
+        self._columns = []
+
+        self._remove = remover(self, '_rows',
+                               lambda rows, entry: rows._free_row(entry.value))
+
+    def row_of(self, instance):
+        """
+        :return: the row assigned to *instance*, or `None` if it doesn't have
+            one
+        """
+        entry = self._rows.get(id(instance))
+        return None if entry is None else entry.value
+
+    def assign(self, instance):
+        """
+        Returns the row assigned to *instance*, assigning one first if it
+        doesn't have one yet. Freed rows are reused before new ones are added.
+        :return: the row of *instance*
+        """
+        entry = self._rows.get(id(instance))
+        if entry is not None:
+            return entry.value
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = self._size
+            self._size += 1
+        self._rows[id(instance)] = weak_entry(instance, self._remove, row)
+        return row
+
+    def release(self, instance):
+        """
+        Frees the row of *instance* (clearing its values in every column)
+        without waiting for the instance to be cleaned up.
+        """
+        entry = self._rows.pop(id(instance), None)
+        if entry is not None:
+            self._free_row(entry.value)
+
+    def _free_row(self, row):
+        for column in self._columns:
+            column._clear_row(row)
+        self._free.append(row)
+
+    @property
+    def size(self):
+        """
+        The number of rows in use or on the free list, which is how long the
+        columns need to be to hold every row
+        """
+        return self._size
+
+    def __len__(self):
+        """
+        :return: the number of instances that currently have a row
+        """
+        return len(self._rows)
+
+
+class ColumnStorage(DescriptorStorage):
+    """
+    :ColumnStorage is a type of :DescriptorStorage that stores the values of
+    its attribute in one contiguous, typed `array.array` (the column), indexed
+    by the row :RowIndex assigns each instance. Numbers are stored unboxed, so
+    a column takes a fraction of the memory of instance dictionaries or a
+    :DescDict, and the whole column can be handed to vectorized code with
+    `column()` or `to_numpy()`.
+
+    Only values that fit *typecode* can be stored (see the `array` module);
+    anything else raises the same `TypeError` or `OverflowError` that
+    `array.array` does.
+    """
+    gathers_numpy = True
+
+    def __init__(self, typecode='d', desc=None, *, rows=None):
+        """
+        :param typecode: *optional* - defaults to 'd' (float) - the
+            `array.array` type code of the column
+        :param desc: the descriptor the storage is for
+        :param rows: *optional* - a :RowIndex to share with other
+            :ColumnStorages. A new one is made if not given
+        """
+        super().__init__(desc)
+        self.typecode = typecode
+        self.rows = RowIndex() if rows is None else rows
+        self.rows._columns.append(self)
+        self._data = array(typecode)
+        self._present = bytearray()
+
+    def __getitem__(self, instance):
+        row = self.rows.row_of(instance)
+        if row is None or row >= len(self._present) or not self._present[row]:
+            self._raiseNoAttr(instance)
+        return self._data[row]
+
+    def __setitem__(self, instance, value):
+        row = self.rows.assign(instance)
+        if row >= len(self._data):
+            self._grow(row)
+        self._data[row] = value
+        self._present[row] = 1
+
+    def __delitem__(self, instance):
+        if instance not in self:
+            self._raiseNoAttr(instance)
+        self._present[self.rows.row_of(instance)] = 0
+
+    def __contains__(self, instance):
+        row = self.rows.row_of(instance)
+        return (row is not None and row < len(self._present)
+                and self._present[row] == 1)
+
+    def get_many(self, instances, *, as_numpy=False):
+        """
+        Looks up the values for a whole sequence of instances at once.
+        :param instances: iterable of the instances to get the values for
+        :param as_numpy: *optional* - defaults to `False` - return a NumPy
+            array (gathered straight from the column) instead of a list.
+            Requires NumPy to be installed
+        :return: the values, in the same order as *instances*
+        :raises AttributeError: if any of the instances don't have a value
+        """
+        row_of = self.rows.row_of
+        present = self._present
+        size = len(present)
+        rows = []
+        append = rows.append
+        for instance in instances:
+            row = row_of(instance)
+            if row is None or row >= size or not present[row]:
+                self._raiseNoAttr(instance)
+            append(row)
+        if as_numpy:
+            import numpy
+            column = numpy.frombuffer(self._data, dtype=self.typecode)
+            return column[numpy.array(rows, dtype=numpy.intp)]
+        data = self._data
+        return [data[row] for row in rows]
+
+    def items(self):
+        """
+        :return: a list of the (instance, value) pairs currently stored
+        """
+        data = self._data
+        present = self._present
+        pairs = []
+        for entry in list(self.rows._rows.values()):
+            instance = entry()
+            row = entry.value
+            if instance is not None and row < len(present) and present[row]:
+                pairs.append((instance, data[row]))
+        return pairs
+
+    def __len__(self):
+        return self._present.count(1)
+
+    def _clear_row(self, row):
+        if row < len(self._present):
+            self._present[row] = 0
+
+    def _grow(self, row):
+        # A new, bigger array is built rather than resizing the current one,
+        # which `array` refuses to do while `column()` views of it exist.
+        # Those views keep showing the old array from then on.
+        size = max(row + 1, 2 * len(self._data), 8)
+        data = array(self.typecode, self._data)
+        data.frombytes(bytes((size - len(data)) * data.itemsize))
+        present = bytearray(self._present)
+        present.extend(bytes(size - len(present)))
+        self._data = data
+        self._present = present
+
+    def column(self):
+        """
+        Returns a writable `memoryview` of the column, one item per row of the
+        :RowIndex. Rows without a value hold leftovers or 0; use `mask()` to
+        tell them apart. The view stops reflecting the column once it has to
+        grow to fit new rows.
+        """
+        self._fit_rows()
+        return memoryview(self._data)[:self.rows.size]
+
+    def mask(self):
+        """
+        Returns a `memoryview` of bytes, one per row, that are 1 where the row
+        has a value in this column and 0 where it doesn't.
+        """
+        self._fit_rows()
+        return memoryview(self._present)[:self.rows.size]
+
+    def to_numpy(self):
+        """
+        Returns the column as a NumPy array that shares memory with it (with
+        the same caveats as `column()`). Requires NumPy to be installed.
+        """
+        import numpy
+        return numpy.frombuffer(self.column(), dtype=self.typecode)
+
+    def _fit_rows(self):
+        if len(self._data) < self.rows.size:
+            self._grow(self.rows.size - 1)
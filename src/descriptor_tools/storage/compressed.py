@@ -0,0 +1,117 @@
+# coding=utf-8
+from collections import OrderedDict
+import zlib
+
+from descriptor_tools.storage.core import StorageWrapper
+
+__author__ = 'Jake'
+__all__ = ['CompressedStorage']
+
+
+class _Compressed:
+    """
+    What :CompressedStorage stores in place of a value it compressed
+    """
+    __slots__ = ('data', 'kind')
+
+    def __init__(self, data, kind):
+        self.data = data
+        self.kind = kind
+
+
+def _codec(name, level):
+    if name == 'zlib':
+        level = -1 if level is None else level
+        return (lambda data: zlib.compress(data, level)), zlib.decompress
+    if name == 'lzma':
+        import lzma
+        return (lambda data: lzma.compress(data, preset=level)), lzma.decompress
+    raise ValueError("Unknown codec '{}'; use 'zlib' or 'lzma'".format(name))
+
+
+class CompressedStorage(StorageWrapper):
+    """
+    :CompressedStorage wraps another :DescriptorStorage (such as :DictStorage or
+    :InstanceStorage), compressing `bytes` and `str` values of at least
+    *threshold* bytes before storing them, and decompressing them again when
+    they're looked up. That trades time on each lookup for memory, which pays
+    off for large values that are rarely read after they're set, like
+    serialized payloads and text bodies. Other values, including mutable ones
+    like `bytearray` (since changes to the copy that would be returned would be
+    lost), and values that don't get any smaller, are stored as they are.
+
+    To keep values that are being read often fast, give it a *cache_size* to
+    keep that many of the most recently decompressed values around.
+
+    Otherwise, it acts just like the storage it wraps.
+    """
+    def __init__(self, storage, desc=None, *, threshold=1024, codec='zlib',
+                 level=None, cache_size=0):
+        """
+        :param storage: the :DescriptorStorage to store the values in
+        :param desc: the descriptor the storage is for
+        :param threshold: *optional* - defaults to 1024 - the size, in bytes,
+            values need to be to be compressed
+        :param codec: *optional* - defaults to 'zlib' - 'zlib' or 'lzma'
+        :param level: *optional* - the compression level (the preset, for
+            lzma). Defaults to the codec's default
+        :param cache_size: *optional* - defaults to 0 - the number of
+            decompressed values to keep
+        """
+        super().__init__(storage, desc)
+        self.threshold = threshold
+        self._compress, self._decompress = _codec(codec, level)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def __getitem__(self, instance):
+        return self._restore(self.storage[instance])
+
+    def __setitem__(self, instance, value):
+        self.storage[instance] = self._shrink(value)
+
+    def get_many(self, instances):
+        return [self._restore(value)
+                for value in self.storage.get_many(instances)]
+
+    def _shrink(self, value):
+        kind = type(value)
+        if kind is str:
+            data = value.encode('utf-8', 'surrogatepass')
+        elif kind is bytes:
+            data = value
+        else:
+            return value
+        if len(data) < self.threshold:
+            return value
+        compressed = self._compress(data)
+        if len(compressed) >= len(data):
+            return value
+        return _Compressed(compressed, kind)
+
+    def _restore(self, value):
+        if type(value) is not _Compressed:
+            return value
+        cache = self._cache
+        # keyed by id, but the entry holds the _Compressed object, so the id
+        # can't be reused while it's cached
+        entry = cache.get(id(value))
+        if entry is not None:
+            cache.move_to_end(id(value))
+            return entry[1]
+        data = self._decompress(value.data)
+        if value.kind is str:
+            restored = data.decode('utf-8', 'surrogatepass')
+        else:
+            restored = data
+        if self.cache_size > 0:
+            cache[id(value)] = (value, restored)
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return restored
+
+    def clear_cache(self):
+        """
+        Drops every cached decompressed value
+        """
+        self._cache.clear()
@@ -0,0 +1,509 @@
+from abc import ABC, abstractmethod
+import threading
+
+from descriptor_tools import (name_of, DescDict, id_name_of, namespace_of,
+                              SlotNamespace)
+
+
+__author__ = 'Jake'
+__all__ = ['DescriptorStorage', 'InstanceStorage', 'DictStorage',
+           'SlotStorage', 'SnapshotStorage', 'SideTableStorage',
+           'SIDE_TABLE_NAME', 'StorageWrapper', 'identity', 'protected',
+           'hex_desc_id', 'many_from', 'many_result']
+# TODO: document
+
+
+class DescriptorStorage(ABC):
+    """
+    :DescriptorStorage is an abstract base class of a set of classes that are
+    meant to store data for descriptors. Their primary usage is like using a
+    dictionary with the instance as the key, but they also have a few extra
+    pieces that make using them in descriptors a little easier. For one, they
+    can provide proper `AttributeError`s instead of `KeyError`s so descriptors
+    may not need to. Secondly, the storage also stores the attribute name for
+    the descriptor.
+
+    To accomplish these, though, there are certain rules that have to be followed.
+    The first two are easy, and are likely what you were doing to begin with:
+
+    1. An instance of a :DescriptorStorage can only be used on a single
+        descriptor
+    2. The descriptor instance the :DescriptorStorage is used on must only be
+        used on a single class
+
+    The third rule is much less obvious, but can be pretty easy:
+
+    3. In order for the :DescriptorStorage instance to get the name of the
+        attribute the descriptor is stored on, one of three things must happen:
+
+        + `set_name()` must be called by the descriptor before any of the other
+            methods. A great time to use this is in the descriptor's
+            `__set_name__()` method, but that's not available in versions before
+            3.6.
+        + The instance of the descriptor must be passed into the constructor.
+            This should work if the :DescriptorStorage is being hard-coded into
+            the descriptor, but it's impossible if the :DescriptorStorage is
+            being injected into the descriptor's constructor, like for
+            `descriptor_tools.instance_properties.InstanceProperty`s. Thus, the
+            third option.
+        + The instance of the descriptor must be assigned to the `desc` attribute
+            of the :DescriptorStorage before any methods are called.
+
+    Those options are in order of preference. If the descriptor you're writing
+    will only be used in versions 3.6+, then you'd only need to use `set_name()`
+    from a `__set_name__()` method. If it will be used in a variety of versions
+    (minimum version for this library is 3.3), then I would still include that
+    (it's the most effecient way) as well as one of the ways of setting the
+    `desc` attribute.
+    """
+    # whether `get_many()` takes `as_numpy=True` to gather the values into a
+    # NumPy array itself
+    gathers_numpy = False
+
+    def __init__(self, desc=None):
+        self.desc = desc
+        self.base_name = None
+
+    def name(self, instance):
+        if self.base_name is None:
+            self.set_name(name_of(self.desc, type(instance)))
+        return self.base_name
+
+    def set_name(self, name):
+        self.base_name = name
+
+    @abstractmethod
+    def __getitem__(self, instance):
+        ...
+
+    @abstractmethod
+    def __setitem__(self, instance, value):
+        ...
+
+    @abstractmethod
+    def __delitem__(self, instance):
+        ...
+
+    @abstractmethod
+    def __contains__(self, instance):
+        ...
+
+    def get_many(self, instances):
+        """
+        Looks up the values for a whole sequence of instances at once. This
+        is the path that binding descriptors' `many()` methods use, so
+        subclasses should override it with something faster than the default
+        one-at-a-time lookup when they can.
+        :param instances: iterable of the instances to get the values for
+        :return: a list of the values, in the same order as *instances*
+        :raises AttributeError: if any of the instances don't have a value
+        """
+        return [self[instance] for instance in instances]
+
+    def slots_for(self, name):
+        """
+        Returns the names of the slots that instances need for this storage
+        to work with them when they don't have a `__dict__`, given the name of
+        the descriptor's attribute. Used by `with_slots()`; descriptors that
+        use a :DescriptorStorage should have their own `slots_for()` that
+        delegates to this one.
+        :param name: name of the attribute the descriptor is stored under
+        :return: a tuple of slot names, empty if none are needed
+        """
+        return ()
+
+    def _raiseNoAttr(self, instance):
+        msg = str.format("Attribute '{}' does not exist on object {}", self.base_name, instance)
+        raise AttributeError(msg)
+
+
+def many_from(storage, instances, *, as_numpy=False):
+    """
+    Looks up the values of a whole sequence of instances in *storage* at once,
+    for binding descriptors' `many()` methods.
+    :param storage: the :DescriptorStorage to look them up in
+    :param instances: iterable of the instances to get the values for
+    :param as_numpy: *optional* - defaults to `False` - return a NumPy array
+        instead of a list. Storages that can gather one straight from their
+        own memory (like :ColumnStorage) are asked to; the values from any
+        other are converted. Requires NumPy to be installed
+    :return: the values, in the same order as *instances*
+    :raises AttributeError: if any of the instances don't have a value
+    """
+    if not as_numpy:
+        return storage.get_many(instances)
+    if storage.gathers_numpy:
+        return storage.get_many(instances, as_numpy=True)
+    return many_result(storage.get_many(instances), as_numpy=True)
+
+
+def many_result(values, *, as_numpy=False):
+    """
+    Puts the list of values collected by a `many()` method in the form it was
+    asked for.
+    :param values: the list of values
+    :param as_numpy: *optional* - defaults to `False` - convert them into a
+        NumPy array. Requires NumPy to be installed
+    :return: *values*, or the NumPy array of them
+    """
+    if as_numpy:
+        import numpy
+        return numpy.asarray(values)
+    return values
+
+
+class DictStorage(DescriptorStorage):
+    """
+    :DictStorage is a type of :DescriptorStorage that stores the values in a
+    :DescDict on the storage itself, rather than on the instances.
+
+    Set `allow_strong_keys` to `True` to allow instances that can't be weakly
+    referenced (such as those of `__slots__` classes without `__weakref__`).
+    See :DescDict for how those are cleaned up; `release()` can be used to
+    remove them explicitly.
+
+    Set `weak_keys` to `False` for descriptors on classes whose instances
+    live for the whole process. That skips weak references entirely, so
+    values are stored at plain `dict` speed, but they are kept until
+    `release()` is called for the instance.
+
+    Because the :DescDict refers to the values strongly and lives as long as
+    the descriptor does, a value that refers back to its instance (a parent
+    pointer, a bound method, etc.) keeps that instance alive forever. Use
+    :SideTableStorage for values like that.
+    """
+    def __init__(self, desc=None, *, allow_strong_keys=False, weak_keys=True):
+        super().__init__(desc)
+        self.store = DescDict(allow_strong_keys=allow_strong_keys,
+                              weak_keys=weak_keys)
+
+    def __getitem__(self, instance):
+        try:
+            return self.store[instance]
+        except KeyError:
+            self._raiseNoAttr(instance)
+
+    def __setitem__(self, instance, value):
+        self.store[instance] = value
+
+    def __delitem__(self, instance):
+        try:
+            del self.store[instance]
+        except KeyError:
+            self._raiseNoAttr(instance)
+
+    def __contains__(self, instance):
+        return instance in self.store
+
+    def get_many(self, instances):
+        return self.store.get_many(instances)
+
+    def items(self):
+        """
+        :return: a list of the (instance, value) pairs currently stored
+        """
+        return list(self.store.items())
+
+    def __len__(self):
+        return len(self.store)
+
+    def release(self, instance):
+        """
+        Removes the value stored for *instance*, if there is one, without
+        raising an error if there isn't.
+        """
+        self.store.release(instance)
+
+    def freeze(self):
+        """
+        :return: an immutable :FrozenDescDict snapshot of the stored values
+        """
+        return self.store.freeze()
+
+
+class SnapshotStorage(DescriptorStorage):
+    """
+    :SnapshotStorage is a type of :DescriptorStorage for read-mostly data that
+    is shared between threads. Reads go to an immutable :FrozenDescDict
+    snapshot (available as the `snapshot` attribute), so they never lock.
+    Writes are made to a :DescDict under a lock, after which a fresh snapshot
+    is frozen and swapped in, which makes every write O(n) in the number of
+    stored values. Use `set_many()` to make several changes with a single swap.
+
+    Any keyword arguments are passed on to the underlying :DescDict.
+    """
+    def __init__(self, desc=None, **dict_options):
+        super().__init__(desc)
+        self._store = DescDict(**dict_options)
+        self._write_lock = threading.Lock()
+        self.snapshot = self._store.freeze()
+
+    def __getitem__(self, instance):
+        return self.snapshot[instance]
+
+    def __setitem__(self, instance, value):
+        with self._write_lock:
+            self._store[instance] = value
+            self.snapshot = self._store.freeze()
+
+    def set_many(self, instances, values):
+        """
+        Sets the values for many instances, swapping in a single new snapshot
+        :param instances: iterable of the instances to set the values for
+        :param values: iterable of the values, in the same order as *instances*
+        """
+        with self._write_lock:
+            self._store.set_many(instances, values)
+            self.snapshot = self._store.freeze()
+
+    def __delitem__(self, instance):
+        with self._write_lock:
+            if instance not in self._store:
+                self._raiseNoAttr(instance)
+            del self._store[instance]
+            self.snapshot = self._store.freeze()
+
+    def __contains__(self, instance):
+        return instance in self.snapshot
+
+    def get_many(self, instances):
+        return self.snapshot.get_many(instances)
+
+
+def identity(name, _): return name
+
+
+def protected(name, _): return "_"+name
+
+
+def hex_desc_id(_, desc): return id_name_of(desc)
+
+
+class InstanceStorage(DescriptorStorage):
+    # Do not use on more than one descriptor
+    # Be certain to either call set_name or, if that can't be guaranteed, set
+    #   the 'desc' attribute to the descriptor instance.
+    """
+    :InstanceStorage is a type of :DescriptorStorage that stores the value on the
+    instance itself. As a :DescriptorStorage, usage of the :InstanceStorage must
+    follow the strict guidelines provided in the :DescriptorStorage documentation.
+
+    On instances without a `__dict__`, the value is stored in the slot with
+    the (mangled) name instead, which `with_slots()` can generate. Since the
+    slot can't have the same name as the descriptor, that requires a name
+    mangler other than `identity`.
+    """
+
+    def __init__(self, name_mangler=identity, desc=None):
+        """
+
+        :param name_mangler:
+        :param desc:
+        """
+        super().__init__(desc)
+        self._name = None
+        self._mangler = name_mangler
+
+    def name(self, instance):
+        if self._name is None:
+            super().name(instance)
+        return self._name
+
+    def set_name(self, name):
+        super().set_name(name)
+        self._name = self._mangler(name, self)
+
+    def __getitem__(self, instance):
+        try:
+            return namespace_of(instance)[self.name(instance)]
+        except KeyError:
+            self._raiseNoAttr(instance)
+
+    def __setitem__(self, instance, value):
+        namespace_of(instance)[self.name(instance)] = value
+
+    def __delitem__(self, instance):
+        try:
+            del namespace_of(instance)[self.name(instance)]
+        except KeyError:
+            self._raiseNoAttr(instance)
+
+    def __contains__(self, instance):
+        return self.name(instance) in namespace_of(instance)
+
+    def slots_for(self, name):
+        return (self._mangler(name, self),)
+
+    def get_many(self, instances):
+        values = []
+        append = values.append
+        name = self._name
+        for instance in instances:
+            if name is None:
+                name = self.name(instance)
+            try:
+                append(namespace_of(instance)[name])
+            except KeyError:
+                self._raiseNoAttr(instance)
+        return values
+
+
+class SlotStorage(InstanceStorage):
+    """
+    :SlotStorage is the type of :InstanceStorage for classes whose instances
+    don't have a `__dict__`: it always stores the value in the slot with the
+    mangled name (see `with_slots()`), skipping the check for a `__dict__`.
+    """
+    def __init__(self, name_mangler=protected, desc=None):
+        """
+        :param name_mangler: *optional* - defaults to `protected` - gives the
+            name of the slot from the name of the attribute
+        :param desc: the descriptor the storage is for
+        """
+        super().__init__(name_mangler, desc)
+
+    def __getitem__(self, instance):
+        try:
+            return SlotNamespace(instance)[self.name(instance)]
+        except KeyError:
+            self._raiseNoAttr(instance)
+
+    def __setitem__(self, instance, value):
+        SlotNamespace(instance)[self.name(instance)] = value
+
+    def __delitem__(self, instance):
+        try:
+            del SlotNamespace(instance)[self.name(instance)]
+        except KeyError:
+            self._raiseNoAttr(instance)
+
+    def __contains__(self, instance):
+        return self.name(instance) in SlotNamespace(instance)
+
+    def get_many(self, instances):
+        values = []
+        append = values.append
+        name = self._name
+        for instance in instances:
+            if name is None:
+                name = self.name(instance)
+            try:
+                append(SlotNamespace(instance)[name])
+            except KeyError:
+                self._raiseNoAttr(instance)
+        return values
+
+
+SIDE_TABLE_NAME = '_descriptor_side_table'
+
+
+class SideTableStorage(DescriptorStorage):
+    """
+    :SideTableStorage is a type of :DescriptorStorage that stores values in a
+    small dictionary (the "side table") on each instance, which is kept in the
+    instance's `__dict__` under `SIDE_TABLE_NAME` and shared by every
+    :SideTableStorage used with that instance.
+
+    Since the instance owns its values, this works like an ephemeron: the value
+    lives exactly as long as the instance, and if the value refers back to the
+    instance, the cycle is still collected by the garbage collector, unlike with
+    :DictStorage. It also doesn't need to know the name of the attribute, so the
+    usual rules about setting the name can be ignored, and only adds a single
+    entry to each instance's `__dict__` no matter how many descriptors use it.
+
+    On instances without a `__dict__`, the side table is kept in the slot of
+    the same name, which `with_slots()` can generate.
+    """
+    def __getitem__(self, instance):
+        try:
+            return namespace_of(instance)[SIDE_TABLE_NAME][self]
+        except KeyError:
+            self._raiseNoAttr(instance)
+
+    def __setitem__(self, instance, value):
+        namespace = namespace_of(instance)
+        try:
+            namespace[SIDE_TABLE_NAME][self] = value
+        except KeyError:
+            namespace[SIDE_TABLE_NAME] = {self: value}
+
+    def __delitem__(self, instance):
+        try:
+            del namespace_of(instance)[SIDE_TABLE_NAME][self]
+        except KeyError:
+            self._raiseNoAttr(instance)
+
+    def __contains__(self, instance):
+        return self in namespace_of(instance).get(SIDE_TABLE_NAME, ())
+
+    def slots_for(self, name):
+        return (SIDE_TABLE_NAME,)
+
+    def get_many(self, instances):
+        values = []
+        append = values.append
+        for instance in instances:
+            try:
+                append(namespace_of(instance)[SIDE_TABLE_NAME][self])
+            except KeyError:
+                self._raiseNoAttr(instance)
+        return values
+
+
+class StorageWrapper(DescriptorStorage):
+    """
+    :StorageWrapper is a base class for storages that add something to another
+    :DescriptorStorage (the one they wrap), such as :InterningStorage. By
+    default, it does everything by delegating to the wrapped storage, which is
+    also given the `desc` and the name, so subclasses only override what they
+    change.
+    """
+    def __init__(self, storage, desc=None):
+        """
+        :param storage: the :DescriptorStorage to wrap
+        :param desc: the descriptor the storage is for
+        """
+        self.storage = storage
+        super().__init__(desc)
+
+    @property
+    def desc(self):
+        return self.storage.desc
+
+    @desc.setter
+    def desc(self, desc):
+        if desc is not None or self.storage.desc is None:
+            self.storage.desc = desc
+
+    @property
+    def base_name(self):
+        return self.storage.base_name
+
+    @base_name.setter
+    def base_name(self, name):
+        if name is not None:
+            self.storage.base_name = name
+
+    def name(self, instance):
+        return self.storage.name(instance)
+
+    def set_name(self, name):
+        self.storage.set_name(name)
+
+    def __getitem__(self, instance):
+        return self.storage[instance]
+
+    def __setitem__(self, instance, value):
+        self.storage[instance] = value
+
+    def __delitem__(self, instance):
+        del self.storage[instance]
+
+    def __contains__(self, instance):
+        return instance in self.storage
+
+    def get_many(self, instances):
+        return self.storage.get_many(instances)
+
+    def slots_for(self, name):
+        return self.storage.slots_for(name)
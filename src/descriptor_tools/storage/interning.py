@@ -0,0 +1,187 @@
+# coding=utf-8
+from collections import namedtuple
+import math
+import sys
+
+from descriptor_tools.entries import DEFAULT, MIN_SWEEP_THRESHOLD
+from descriptor_tools.storage.core import StorageWrapper
+
+__author__ = 'Jake'
+__all__ = ['InterningStorage', 'InternPool', 'InternReport']
+
+
+InternReport = namedtuple('InternReport', 'values references bytes_saved')
+
+# reference counts this high belong to immortal objects (3.12+), which the
+# interpreter already shares, so they're left out of sweeps and reports
+_IMMORTAL = 2 ** 31
+
+
+# types whose equal values are interchangeable once their type is the same
+_PLAIN_TYPES = frozenset({str, bytes, int, bool, type(None)})
+
+
+def _intern_key(value):
+    # Equal values aren't always interchangeable: 1 == 1.0 == True, and
+    # 0.0 == -0.0, so the types (and the signs of zeros) are part of the key,
+    # all the way down through tuples and frozensets. Other types can't be
+    # told apart safely (like Decimal('1.0') and Decimal('1.00')), so they
+    # raise a TypeError and aren't pooled.
+    kind = type(value)
+    if kind in _PLAIN_TYPES:
+        return kind, value
+    if kind is float:
+        return kind, value, math.copysign(1.0, value)
+    if kind is complex:
+        return (kind, value, math.copysign(1.0, value.real),
+                math.copysign(1.0, value.imag))
+    if issubclass(kind, tuple):
+        _check_items_only(kind, tuple)
+        return kind, tuple(map(_intern_key, value))
+    if issubclass(kind, frozenset):
+        _check_items_only(kind, frozenset)
+        return kind, frozenset(map(_intern_key, value))
+    raise TypeError("can't intern a {}".format(kind.__name__))
+
+
+def _check_items_only(kind, base):
+    # subclasses (like namedtuples) are fine as long as their instances
+    # can't hold anything other than their items, like a __dict__ or slots
+    if kind.__basicsize__ != base.__basicsize__:
+        raise TypeError("can't intern a {}".format(kind.__name__))
+
+
+class InternPool:
+    """
+    :InternPool keeps one copy of each distinct hashable value it's given, so
+    that equal values can share that one object (a flyweight). Values are only
+    pooled while something else is still using them: the pool periodically
+    sweeps out values that nothing outside of it refers to anymore, using the
+    interpreter's reference counts.
+
+    Values are only shared with values that are equal *and* of the same type
+    (and, for floats and complex numbers, the same signs), including the
+    items of tuples and frozensets, so interning never changes a value. That
+    can only be guaranteed for some types, so only strings, bytes, numbers
+    (`int`, `bool`, `float` and `complex`), `None`, and tuples and frozensets
+    of those (including subclasses like namedtuples that don't add attributes)
+    are pooled. Anything else, including unhashable values, is returned as it
+    is.
+
+    One pool can be shared by several :InterningStorages to share values
+    between attributes.
+    """
+    def __init__(self):
+        self._values = {}
+        self._added = 0
+        self._sweep_threshold = MIN_SWEEP_THRESHOLD
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, value):
+        """
+        :return: the pooled value equal to *value*, adding *value* to the pool
+            if there isn't one. Values that can't be pooled are returned as
+            they are
+        """
+        try:
+            key = _intern_key(value)
+            pooled = self._values.get(key, DEFAULT)
+        except TypeError:
+            return value
+        if pooled is not DEFAULT:
+            self.hits += 1
+            return pooled
+        self.misses += 1
+        self._values[key] = value
+        self._added += 1
+        if self._added > self._sweep_threshold:
+            self.sweep()
+        return value
+
+    def sweep(self):
+        """
+        Removes the values that aren't used by anything other than the pool.
+        Does nothing on interpreters without reference counts.
+        :return: the number of values removed
+        """
+        if not hasattr(sys, 'getrefcount'):
+            return 0
+        values = self._values
+        unused = [key for key in list(values)
+                  if not 0 < self._outside_refs(key) < _IMMORTAL]
+        for key in unused:
+            del values[key]
+        self._added = 0
+        self._sweep_threshold = max(MIN_SWEEP_THRESHOLD, len(values))
+        return len(unused)
+
+    def _outside_refs(self, key):
+        # looked up here so the count doesn't depend on how the caller got
+        # hold of the value
+        if issubclass(key[0], (tuple, frozenset)):
+            return sys.getrefcount(self._values[key]) - _POOLED_CONTAINER
+        return sys.getrefcount(self._values[key]) - _POOLED
+
+    def report(self):
+        """
+        Estimates what interning has saved, from the reference counts of the
+        pooled values. Every reference to a pooled value beyond the first is
+        counted as a copy that would otherwise have been made, so references
+        held by anything else (local variables and such) make the estimate
+        high.
+        :return: an :InternReport with the number of distinct values in the
+            pool, the number of references to them, and the bytes saved
+        """
+        references = 0
+        saved = 0
+        for key in list(self._values):
+            refs = self._outside_refs(key)
+            if 0 < refs < _IMMORTAL:
+                references += refs
+                saved += sys.getsizeof(self._values[key]) * (refs - 1)
+        return InternReport(len(self._values), references, saved)
+
+    def __len__(self):
+        return len(self._values)
+
+
+def _pooled_count(value):
+    # the reference count `_outside_refs()` sees for a value only held by the
+    # pool; measured instead of hard-coded since it varies between versions
+    # and the pool's key refers to values, but not to tuples and frozensets
+    pool = InternPool()
+    pool.intern(value)
+    del value
+    return pool._outside_refs(next(iter(pool._values)))
+
+
+_POOLED = _POOLED_CONTAINER = 0
+if hasattr(sys, 'getrefcount'):
+    _POOLED = _pooled_count(float('1.5'))
+    _POOLED_CONTAINER = _pooled_count((float('1.5'),))
+
+
+class InterningStorage(StorageWrapper):
+    """
+    :InterningStorage wraps another :DescriptorStorage (such as :DictStorage or
+    :InstanceStorage), passing every value that's stored through an
+    :InternPool first, so that equal values stored for different instances
+    all share one object. That saves memory when many instances hold equal
+    values that were created separately, like strings read from a file, small
+    tuples, etc. `pool.report()` estimates how much.
+
+    Otherwise, it acts just like the storage it wraps.
+    """
+    def __init__(self, storage, desc=None, *, pool=None):
+        """
+        :param storage: the :DescriptorStorage to store the values in
+        :param desc: the descriptor the storage is for
+        :param pool: *optional* - an :InternPool to share with other
+            :InterningStorages. A new one is made if not given
+        """
+        self.pool = InternPool() if pool is None else pool
+        super().__init__(storage, desc)
+
+    def __setitem__(self, instance, value):
+        self.storage[instance] = self.pool.intern(value)
@@ -0,0 +1,154 @@
+# coding=utf-8
+import threading
+import weakref
+
+from descriptor_tools.storage.core import StorageWrapper
+
+__author__ = 'Jake'
+__all__ = ['MigratingStorage']
+
+
+def _ref(instance):
+    try:
+        return weakref.ref(instance)
+    except TypeError:  # strong keys in the old storage
+        return lambda: instance
+
+
+class MigratingStorage(StorageWrapper):
+    """
+    :MigratingStorage moves the values of an attribute from one
+    :DescriptorStorage to another while the program keeps running, a batch at
+    a time, instead of all at once. Put it in place of the descriptor's old
+    storage:
+
+        desc.storage = MigratingStorage(desc.storage, InstanceStorage())
+
+    then call `step()` every so often (from an idle loop, a timer, between
+    requests, etc.) until `done`, and finally replace it with the new storage:
+
+        desc.storage = desc.storage.finish()
+
+    In the meantime, it acts like one storage holding everything in both:
+    lookups try the new storage and fall through to the old one, and values
+    that are set or deleted are set or deleted in the new one and removed from
+    the old one, so the old one only ever shrinks.
+
+    The old storage has to support `items()` (like :DictStorage and
+    :ColumnStorage do) so the instances it holds can be found. They're looked
+    up when there are no more left to move, so values that got into the old
+    storage some other way (like before this was put in its place) are moved
+    too. Only weak references to them are kept, and instances that are gone by
+    the time their batch comes around are skipped. Steps and changes are done
+    under a lock, so it can be used from multiple threads.
+    """
+    def __init__(self, old, new, desc=None, *, batch_size=256):
+        """
+        :param old: the :DescriptorStorage the values are in now
+        :param new: the :DescriptorStorage to move them to
+        :param desc: the descriptor the storage is for. Defaults to the old
+            storage's
+        :param batch_size: *optional* - defaults to 256 - the number of
+            instances handled by each `step()`
+        """
+        new.desc = old.desc
+        if old.base_name is not None:
+            new.set_name(old.base_name)
+        super().__init__(new, desc)
+        self.old = old
+        self.batch_size = batch_size
+        self.moved = 0
+        self._pending = []
+        self._lock = threading.Lock()
+
+    @property
+    def new(self):
+        return self.storage
+
+    @property
+    def done(self):
+        """
+        Whether every value has been moved to the new storage
+        """
+        return not self._pending and not self.old.items()
+
+    @property
+    def remaining(self):
+        """
+        The number of instances still to be handled by `step()`, including
+        ones that have since been cleaned up or set again
+        """
+        return len(self._pending) or len(self.old.items())
+
+    def step(self, batch_size=None):
+        """
+        Moves the values of the next batch of instances to the new storage.
+        :param batch_size: *optional* - defaults to the storage's
+            *batch_size*
+        :return: the number of values moved
+        """
+        if batch_size is None:
+            batch_size = self.batch_size
+        old, new = self.old, self.storage
+        moved = 0
+        with self._lock:
+            pending = self._pending
+            if not pending:
+                pending.extend(_ref(instance) for instance, _ in old.items())
+            batch = pending[-batch_size:]
+            del pending[-batch_size:]
+            for ref in reversed(batch):
+                instance = ref()
+                if instance is None or instance not in old:
+                    continue
+                if instance not in new:
+                    # set before deleting, so lookups always find it somewhere
+                    new[instance] = old[instance]
+                    moved += 1
+                del old[instance]
+        self.moved += moved
+        return moved
+
+    def finish(self):
+        """
+        Moves all the values that are left.
+        :return: the new storage, to put in place of this one
+        """
+        while not self.done:
+            self.step()
+        return self.storage
+
+    def __getitem__(self, instance):
+        try:
+            return self.storage[instance]
+        except AttributeError:
+            pass
+        try:
+            return self.old[instance]
+        except AttributeError:
+            # moved by a step in between
+            return self.storage[instance]
+
+    def __setitem__(self, instance, value):
+        with self._lock:
+            self.storage[instance] = value
+            if instance in self.old:
+                del self.old[instance]
+
+    def __delitem__(self, instance):
+        with self._lock:
+            found = False
+            if instance in self.storage:
+                del self.storage[instance]
+                found = True
+            if instance in self.old:
+                del self.old[instance]
+                found = True
+        if not found:
+            self._raiseNoAttr(instance)
+
+    def __contains__(self, instance):
+        return instance in self.storage or instance in self.old
+
+    def get_many(self, instances):
+        return [self[instance] for instance in instances]
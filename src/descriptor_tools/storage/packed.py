@@ -0,0 +1,142 @@
+# coding=utf-8
+from descriptor_tools import namespace_of
+from descriptor_tools.entries import DEFAULT
+from descriptor_tools.storage.core import DescriptorStorage
+
+__author__ = 'Jake'
+__all__ = ['PackedField', 'PackedStorage']
+
+
+class PackedField:
+    """
+    :PackedField is a single integer attribute on each instance that several
+    :PackedStorages share, each of them owning its own range of bits of it.
+    Create one for a class and give it to every :PackedStorage of that class's
+    flag and small-enum attributes, and each instance stores all of them in
+    one `int` instead of an instance dictionary entry apiece.
+
+    The bits are handed out in the order the storages are created. An instance
+    that's never had any of the values set has no attribute at all, which
+    reads as 0.
+    """
+    def __init__(self, name='_packed_bits'):
+        """
+        :param name: *optional* - defaults to '_packed_bits' - the name of the
+            attribute on the instances
+        """
+        self.name = name
+        self.size = 0
+
+    def allocate(self, width):
+        """
+        Reserves the next *width* bits.
+        :return: the offset of the first reserved bit
+        """
+        offset = self.size
+        self.size += width
+        return offset
+
+    def bits_of(self, instance):
+        """
+        :return: the integer holding all of the packed values of *instance*
+        """
+        return namespace_of(instance).get(self.name, 0)
+
+
+class PackedStorage(DescriptorStorage):
+    """
+    :PackedStorage is a type of :DescriptorStorage for attributes that can only
+    hold a few different values, like flags and small enums. Each value is
+    stored as its index in *values*, in a range of bits of a :PackedField
+    shared with the other :PackedStorages of the class, so getting and setting
+    are just a mask and a shift.
+
+    Without a *default*, one more code is needed to tell that the attribute
+    hasn't been set, so it reads as missing like in any other storage. With a
+    *default*, a value that hasn't been set (or has been deleted) reads as the
+    default, and a `bool` flag fits in a single bit.
+
+        flags = PackedField()
+
+        class Task:
+            done = Attribute(PackedStorage(flags, default=False))
+            priority = Attribute(PackedStorage(flags, values=tuple(Priority)))
+
+    Setting anything that's not in *values* raises a `ValueError`. Like any
+    read-modify-write, setting isn't atomic, so different threads setting
+    attributes in the same :PackedField of the same instance need a lock.
+    """
+    def __init__(self, field, values=(False, True), desc=None, *,
+                 default=DEFAULT):
+        """
+        :param field: the :PackedField to store the value in
+        :param values: *optional* - defaults to `(False, True)` - every value
+            the attribute can hold, which must be hashable
+        :param desc: the descriptor the storage is for
+        :param default: *optional* - one of *values*, for when the attribute
+            hasn't been set
+        """
+        super().__init__(desc)
+        values = list(values)
+        self.has_default = default is not DEFAULT
+        if self.has_default:
+            values.remove(default)
+            values.insert(0, default)
+        else:
+            values.insert(0, DEFAULT)
+        self._values = values
+        self._codes = {value: code for code, value in enumerate(values)}
+        self.field = field
+        self.width = max(1, (len(values) - 1).bit_length())
+        self.offset = field.allocate(self.width)
+        self._mask = ((1 << self.width) - 1) << self.offset
+
+    def _code_of(self, instance):
+        bits = namespace_of(instance).get(self.field.name, 0)
+        return (bits & self._mask) >> self.offset
+
+    def __getitem__(self, instance):
+        code = self._code_of(instance)
+        if code == 0 and not self.has_default:
+            self._raiseNoAttr(instance)
+        return self._values[code]
+
+    def __setitem__(self, instance, value):
+        try:
+            code = self._codes.get(value)
+        except TypeError:  # unhashable
+            code = None
+        if code is None or (code == 0 and not self.has_default):
+            raise ValueError("{!r} is not one of the values of attribute "
+                             "'{}'".format(value, self.base_name))
+        self._store(instance, code)
+
+    def __delitem__(self, instance):
+        if self._code_of(instance) == 0 and not self.has_default:
+            self._raiseNoAttr(instance)
+        self._store(instance, 0)
+
+    def __contains__(self, instance):
+        return self.has_default or self._code_of(instance) != 0
+
+    def _store(self, instance, code):
+        namespace = namespace_of(instance)
+        bits = namespace.get(self.field.name, 0)
+        namespace[self.field.name] = (bits & ~self._mask) | (code << self.offset)
+
+    def get_many(self, instances):
+        name = self.field.name
+        mask = self._mask
+        offset = self.offset
+        values = self._values
+        result = []
+        append = result.append
+        for instance in instances:
+            code = (namespace_of(instance).get(name, 0) & mask) >> offset
+            if code == 0 and not self.has_default:
+                self._raiseNoAttr(instance)
+            append(values[code])
+        return result
+
+    def slots_for(self, name):
+        return (self.field.name,)
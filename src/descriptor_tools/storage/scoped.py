@@ -0,0 +1,126 @@
+# coding=utf-8
+import threading
+import weakref
+
+from descriptor_tools import DescDict
+from descriptor_tools.entries import strong_entry
+from descriptor_tools.storage.core import DescriptorStorage
+
+__author__ = 'Jake'
+__all__ = ['ThreadLocalStorage', 'ContextVarStorage']
+
+
+class ThreadLocalStorage(DescriptorStorage):
+    """
+    :ThreadLocalStorage is a type of :DescriptorStorage that keeps a separate
+    set of values for each thread, so the same attribute of a shared object can
+    hold different values in different threads. Each thread has its own
+    :DescDict, so reads and writes never need a lock, and a thread's values are
+    dropped when the thread ends.
+
+    Any keyword arguments are passed on to the underlying :DescDicts.
+    """
+    def __init__(self, desc=None, **dict_options):
+        super().__init__(desc)
+        self._dict_options = dict_options
+        self._local = threading.local()
+
+    def _store(self):
+        try:
+            return self._local.store
+        except AttributeError:
+            store = self._local.store = DescDict(**self._dict_options)
+            return store
+
+    def __getitem__(self, instance):
+        try:
+            return self._store()[instance]
+        except KeyError:
+            self._raiseNoAttr(instance)
+
+    def __setitem__(self, instance, value):
+        self._store()[instance] = value
+
+    def __delitem__(self, instance):
+        try:
+            del self._store()[instance]
+        except KeyError:
+            self._raiseNoAttr(instance)
+
+    def __contains__(self, instance):
+        return instance in self._store()
+
+    def get_many(self, instances):
+        return self._store().get_many(instances)
+
+
+class ContextVarStorage(DescriptorStorage):
+    """
+    :ContextVarStorage is a type of :DescriptorStorage that keeps its values in
+    a `contextvars.ContextVar`, so they follow the execution context the way
+    context variables do: each asyncio task sees the values that were set when
+    it was created plus the ones it sets itself, which the task that created it
+    doesn't see. Reads never need a lock.
+
+    The values of the current context are an immutable mapping that is copied
+    on every set or delete, so writes are O(n) in the number of values set in
+    the context. That suits request-scoped state, where each context only sets
+    a handful of values.
+
+    The instances are only weakly referenced, unless they can't be, in which
+    case `allow_strong_keys` must be `True`, and they're then kept alive for
+    as long as the context that holds their values. The values of instances
+    that have been cleaned up are dropped the next time a value is set or
+    deleted in the same context.
+    """
+    def __init__(self, desc=None, *, allow_strong_keys=False):
+        super().__init__(desc)
+        self.allow_strong_keys = allow_strong_keys
+        from contextvars import ContextVar
+        self._var = ContextVar('ContextVarStorage', default={})
+
+    def _ref(self, instance):
+        try:
+            return weakref.ref(instance)
+        except TypeError:
+            if not self.allow_strong_keys:
+                raise
+            return strong_entry(instance, None)
+
+    def __getitem__(self, instance):
+        item = self._var.get().get(id(instance))
+        if item is None or item[0]() is not instance:
+            self._raiseNoAttr(instance)
+        return item[1]
+
+    def _live_items(self):
+        # the copy every write makes anyway, leaving out dead instances
+        return {key: item for key, item in self._var.get().items()
+                if item[0]() is not None}
+
+    def __setitem__(self, instance, value):
+        items = self._live_items()
+        items[id(instance)] = (self._ref(instance), value)
+        self._var.set(items)
+
+    def __delitem__(self, instance):
+        if instance not in self:
+            self._raiseNoAttr(instance)
+        items = self._live_items()
+        del items[id(instance)]
+        self._var.set(items)
+
+    def __contains__(self, instance):
+        item = self._var.get().get(id(instance))
+        return item is not None and item[0]() is instance
+
+    def get_many(self, instances):
+        get = self._var.get().get
+        values = []
+        append = values.append
+        for instance in instances:
+            item = get(id(instance))
+            if item is None or item[0]() is not instance:
+                self._raiseNoAttr(instance)
+            append(item[1])
+        return values
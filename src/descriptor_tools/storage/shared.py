@@ -0,0 +1,290 @@
+# coding=utf-8
+from array import array
+import sys
+import threading
+
+from descriptor_tools.storage.core import DescriptorStorage
+
+__author__ = 'Jake'
+__all__ = ['SharedColumnStorage']
+
+
+_HEADER_SIZE = 8
+# held while `register` is patched out by an untracked `_attach()`, and by
+# `_create()`, so blocks this module creates are always registered. Other code
+# creating blocks in another thread while an untracked attach is running can
+# still miss registration on Python versions before 3.13.
+_tracker_lock = threading.Lock()
+
+
+def _attach(name, untracked):
+    from multiprocessing import shared_memory
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    if not untracked:
+        return shared_memory.SharedMemory(name)
+    # Before 3.13, attaching always registers the block with the resource
+    # tracker. Unregistering afterwards isn't an option, since workers share
+    # their parent's tracker, so that would drop the owner's registration
+    # instead. So registering is skipped for the duration of the call, which
+    # the caller has to ask for, since it affects the whole process.
+    from multiprocessing import resource_tracker
+    with _tracker_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name)
+        finally:
+            resource_tracker.register = register
+
+
+def _create(name, size):
+    from multiprocessing import shared_memory
+    with _tracker_lock:
+        return shared_memory.SharedMemory(name, create=True, size=size)
+
+
+class SharedColumnStorage(DescriptorStorage):
+    """
+    :SharedColumnStorage is a type of :DescriptorStorage that stores fixed
+    width numbers in a column in a `multiprocessing.shared_memory` block, so
+    that worker processes can read (and write) the values in place instead of
+    getting pickled copies of them.
+
+    Since each process has its own copies of the instances, the instances can't
+    be told apart by identity. Instead, *row* is a function that gives the row
+    of the column that holds an instance's value, usually an index the instances
+    already have, such as `operator.attrgetter('index')`. The rows have to be
+    from 0 up to (but not including) the storage's capacity.
+
+    One process owns the block: it calls `create()` (or passes *capacity* to
+    the constructor), and the other processes `attach()` to it by its
+    `block_name`, typically in a worker pool's initializer:
+
+        def init_worker(name):
+            Particle.mass.storage.attach(name)
+
+        Particle.mass.storage.create(len(particles))
+        with Pool(initializer=init_worker,
+                  initargs=(Particle.mass.storage.block_name,)) as pool:
+            ...
+
+    (Workers started with the "fork" method inherit the owner's mapping and
+    don't need to attach.) Every process calls `close()` when it's done with
+    the block, and the owner calls `unlink()` to free it once every process has
+    closed it; `release()` does both, and using the storage as a context
+    manager calls it at the end. No locking is done, so processes that write
+    should write to different rows.
+    """
+    gathers_numpy = True
+
+    def __init__(self, typecode='d', desc=None, *, row, capacity=None):
+        """
+        :param typecode: *optional* - defaults to 'd' (float) - the
+            `array.array` type code of the column
+        :param desc: the descriptor the storage is for
+        :param row: function that returns the row of a given instance
+        :param capacity: *optional* - if given, `create()` is called with it
+        """
+        super().__init__(desc)
+        self.typecode = typecode
+        self.itemsize = array(typecode).itemsize
+        self._row = row
+        self._block = None
+        self._data = None
+        self.owner = False
+        self.capacity = 0
+        if capacity is not None:
+            self.create(capacity)
+
+    def create(self, capacity, name=None):
+        """
+        Creates a new shared memory block with room for *capacity* values,
+        owned by this process.
+        :param capacity: the number of rows
+        :param name: *optional* - name for the block. One is generated if not
+            given
+        """
+        self._check_unused()
+        size = self._data_offset(capacity) + capacity * self.itemsize
+        block = _create(name, size)
+        with block.buf[:_HEADER_SIZE].cast('q') as header:
+            header[0] = capacity
+        self._use(block, owner=True)
+
+    def attach(self, name, *, untracked=False):
+        """
+        Attaches to the block created by another process's storage.
+
+        From Python 3.13 on, the block is never registered with this process's
+        resource tracker, since it belongs to the owner. Before 3.13, attaching
+        always registers it, which is harmless for workers started by the
+        owner (they share its tracker), but a process with its own tracker
+        unlinks the block when it exits, out from under the owner. For those,
+        pass `untracked=True`, which skips registering by briefly replacing
+        `multiprocessing.resource_tracker.register` for the whole process, so
+        blocks created by other threads in the meantime may go unregistered.
+        :param name: the `block_name` of the other storage
+        :param untracked: *optional* - defaults to `False` - before Python
+            3.13, keep the block from being registered with this process's
+            resource tracker
+        """
+        self._check_unused()
+        self._use(_attach(name, untracked), owner=False)
+
+    def _data_offset(self, capacity):
+        # the block starts with the capacity, then the presence flags, padded
+        # so the values are aligned
+        end = _HEADER_SIZE + capacity
+        return -(-end // self.itemsize) * self.itemsize
+
+    def _use(self, block, owner):
+        with block.buf[:_HEADER_SIZE].cast('q') as header:
+            capacity = header[0]
+        offset = self._data_offset(capacity)
+        self._block = block
+        self.owner = owner
+        self.capacity = capacity
+        self._present = block.buf[_HEADER_SIZE:_HEADER_SIZE + capacity]
+        self._data = block.buf[offset:offset + capacity * self.itemsize].cast(
+            self.typecode)
+
+    def _check_unused(self):
+        if self._block is not None:
+            raise RuntimeError("The storage already has a shared memory block")
+
+    @property
+    def block_name(self):
+        """
+        The name of the shared memory block, which other processes pass to
+        `attach()`, or `None` if there isn't a block
+        """
+        return None if self._block is None else self._block.name
+
+    def _checked_row(self, instance):
+        if self._data is None:
+            raise RuntimeError(
+                "The storage has no open shared memory block; call create() "
+                "or attach() first")
+        row = self._row(instance)
+        if not 0 <= row < self.capacity:
+            raise IndexError(
+                "Row {} is outside of the storage's capacity of {}".format(
+                    row, self.capacity))
+        return row
+
+    def __getitem__(self, instance):
+        row = self._checked_row(instance)
+        if not self._present[row]:
+            self._raiseNoAttr(instance)
+        return self._data[row]
+
+    def __setitem__(self, instance, value):
+        row = self._checked_row(instance)
+        self._data[row] = value
+        self._present[row] = 1
+
+    def __delitem__(self, instance):
+        row = self._checked_row(instance)
+        if not self._present[row]:
+            self._raiseNoAttr(instance)
+        self._present[row] = 0
+
+    def __contains__(self, instance):
+        try:
+            row = self._checked_row(instance)
+        except IndexError:
+            return False
+        return self._present[row] == 1
+
+    def get_many(self, instances, *, as_numpy=False):
+        """
+        Looks up the values for a whole sequence of instances at once.
+        :param instances: iterable of the instances to get the values for
+        :param as_numpy: *optional* - defaults to `False` - return a NumPy
+            array (gathered straight from the column) instead of a list.
+            Requires NumPy to be installed
+        :return: the values, in the same order as *instances*
+        :raises AttributeError: if any of the instances don't have a value
+        """
+        present = self._present
+        rows = []
+        append = rows.append
+        for instance in instances:
+            row = self._checked_row(instance)
+            if not present[row]:
+                self._raiseNoAttr(instance)
+            append(row)
+        if as_numpy:
+            import numpy
+            column = numpy.frombuffer(self._data, dtype=self.typecode)
+            return column[numpy.array(rows, dtype=numpy.intp)]
+        data = self._data
+        return [data[row] for row in rows]
+
+    def column(self):
+        """
+        Returns a writable `memoryview` of the column in shared memory. Rows
+        without a value hold leftovers or 0; use `mask()` to tell them apart.
+        Any views have to be released before the storage can be closed.
+        """
+        return self._data[:]
+
+    def mask(self):
+        """
+        Returns a `memoryview` of bytes, one per row, that are 1 where the row
+        has a value and 0 where it doesn't.
+        """
+        return self._present[:]
+
+    def to_numpy(self):
+        """
+        Returns the column as a NumPy array that shares the shared memory.
+        Requires NumPy to be installed.
+        """
+        import numpy
+        return numpy.frombuffer(self._data, dtype=self.typecode)
+
+    def close(self):
+        """
+        Detaches this process from the shared memory block. Every process
+        using the block should call this when it's done with it.
+        """
+        if self._data is None:
+            return
+        self._data.release()
+        self._present.release()
+        self._data = self._present = None
+        self._block.close()
+
+    def unlink(self):
+        """
+        Frees the shared memory block once every process has closed it. Only
+        the owner may call this.
+        """
+        if self._block is None:
+            return
+        if not self.owner:
+            raise RuntimeError(
+                "Only the process that created the block may unlink it")
+        self._block.unlink()
+
+    def release(self):
+        """
+        Closes the block, unlinks it if this process owns it, and leaves the
+        storage ready for another `create()` or `attach()`
+        """
+        if self._block is None:
+            return
+        self.close()
+        if self.owner:
+            self.unlink()
+        self._block = None
+        self.owner = False
+        self.capacity = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
@@ -0,0 +1,236 @@
+# coding=utf-8
+from collections import OrderedDict, namedtuple
+from itertools import count
+import os
+import pickle
+import sys
+import threading
+import weakref
+
+from descriptor_tools.entries import weak_entry
+from descriptor_tools.storage.core import DescriptorStorage
+
+__author__ = 'Jake'
+__all__ = ['SpillStorage', 'SpillInfo']
+
+
+SpillInfo = namedtuple('SpillInfo', 'spills faults in_memory spilled bytes')
+
+
+def _close(db, temp_path):
+    db.close()
+    if temp_path is not None:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+class SpillStorage(DescriptorStorage):
+    """
+    :SpillStorage is a type of :DescriptorStorage that keeps as many values in
+    memory as fit in its budget (*max_bytes*, as measured by *sizeof*, and/or
+    *max_entries*), and spills the least recently used ones over to a SQLite
+    file on disk when it goes over. Spilled values are pickled, and faulted
+    back into memory (as the most recently used) when they're looked up. That
+    lets the values add up to more than the memory available, behind ordinary
+    attribute access.
+
+    Each instance is given a key for the file the first time a value is set
+    for it, from a counter, so keys are never reused, even though `id()`s are.
+    When an instance is cleaned up, its value is removed from memory and the
+    file the next time the storage is used. Instances must support weak
+    references. Values that can't be pickled are never spilled.
+
+    The file is scratch space, not persistence: by default, it's a temporary
+    file that's deleted when the storage is closed, and if *path* is given
+    instead, anything already in it is thrown away. Use `close()` (or the
+    storage as a context manager) to close it when it's no longer needed;
+    otherwise, that happens when the storage is garbage collected.
+
+    The storage is safe to use from multiple threads.
+    """
+    def __init__(self, desc=None, *, max_bytes=None, max_entries=None,
+                 sizeof=sys.getsizeof, path=None):
+        """
+        :param desc: the descriptor the storage is for
+        :param max_bytes: *optional* - the most bytes the values kept in
+            memory can add up to
+        :param max_entries: *optional* - the most values to keep in memory
+        :param sizeof: *optional* - defaults to `sys.getsizeof` - gives the
+            size of a value in bytes, for *max_bytes*. Pass something deeper
+            than the default for values that contain other objects
+        :param path: *optional* - the file to spill to. A temporary file is
+            used if not given
+        :raises ValueError: if neither *max_bytes* nor *max_entries* is given
+        """
+        if max_entries is None and max_bytes is None:
+            raise ValueError("SpillStorage needs max_bytes or max_entries")
+        super().__init__(desc)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._sizeof = sizeof
+        self._keys = {}
+        self._memory = OrderedDict()
+        self._bytes = 0
+        self._next_key = count()
+        self._dead = []
+        self._remove = self._dead.append
+        self._lock = threading.RLock()
+        self.spills = 0
+        self.faults = 0
+
+        import sqlite3
+        import tempfile
+        temp_path = None
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix='.sqlite')
+            os.close(fd)
+            temp_path = path
+        self.path = path
+        self._db = sqlite3.connect(path, isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute('PRAGMA synchronous = OFF')
+        self._db.execute('DROP TABLE IF EXISTS spilled')
+        self._db.execute(
+            'CREATE TABLE spilled (key INTEGER PRIMARY KEY, value BLOB)')
+        self._finalizer = weakref.finalize(self, _close, self._db, temp_path)
+
+    def _key_of(self, instance):
+        entry = self._keys.get(id(instance))
+        if entry is None or entry() is not instance:
+            return None
+        return entry.value
+
+    def __getitem__(self, instance):
+        with self._lock:
+            if self._dead:
+                self._remove_dead()
+            key = self._key_of(instance)
+            if key is None:
+                self._raiseNoAttr(instance)
+            item = self._memory.get(key)
+            if item is not None:
+                self._memory.move_to_end(key)
+                return item[0]
+            return self._fault(key)
+
+    def _fault(self, key):
+        row = self._db.execute(
+            'SELECT value FROM spilled WHERE key = ?', (key,)).fetchone()
+        value = pickle.loads(row[0])
+        self._db.execute('DELETE FROM spilled WHERE key = ?', (key,))
+        self.faults += 1
+        self._hold(key, value)
+        return value
+
+    def __setitem__(self, instance, value):
+        with self._lock:
+            if self._dead:
+                self._remove_dead()
+            key = self._key_of(instance)
+            if key is None:
+                key = next(self._next_key)
+                self._keys[id(instance)] = weak_entry(instance, self._remove,
+                                                       key)
+            else:
+                self._forget(key)
+            self._hold(key, value)
+
+    def __delitem__(self, instance):
+        with self._lock:
+            if self._dead:
+                self._remove_dead()
+            key = self._key_of(instance)
+            if key is None:
+                self._raiseNoAttr(instance)
+            del self._keys[id(instance)]
+            self._forget(key)
+
+    def __contains__(self, instance):
+        with self._lock:
+            return self._key_of(instance) is not None
+
+    def _hold(self, key, value):
+        size = 0 if self.max_bytes is None else self._sizeof(value)
+        self._memory[key] = (value, size)
+        self._bytes += size
+        self._spill()
+
+    def _forget(self, key):
+        item = self._memory.pop(key, None)
+        if item is not None:
+            self._bytes -= item[1]
+        else:
+            self._db.execute('DELETE FROM spilled WHERE key = ?', (key,))
+
+    def _over_budget(self):
+        return ((self.max_entries is not None and
+                 len(self._memory) > self.max_entries) or
+                (self.max_bytes is not None and self._bytes > self.max_bytes))
+
+    def _spill(self):
+        memory = self._memory
+        rows = []
+        # values that can't be pickled are moved to the other end, so every
+        # value is tried at most once
+        for _ in range(len(memory)):
+            if not self._over_budget():
+                break
+            key, (value, size) = memory.popitem(last=False)
+            try:
+                data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                memory[key] = (value, size)
+                continue
+            self._bytes -= size
+            rows.append((key, data))
+        if rows:
+            self._db.executemany(
+                'INSERT INTO spilled (key, value) VALUES (?, ?)', rows)
+            self.spills += len(rows)
+
+    def _remove_dead(self):
+        dead = self._dead
+        # more may be queued while this runs, so only drop what was handled
+        handled = len(dead)
+        spilled = []
+        for entry in dead[:handled]:
+            if self._keys.get(entry.key_id) is entry:
+                del self._keys[entry.key_id]
+            item = self._memory.pop(entry.value, None)
+            if item is not None:
+                self._bytes -= item[1]
+            else:
+                spilled.append((entry.value,))
+        del dead[:handled]
+        if spilled:
+            self._db.executemany('DELETE FROM spilled WHERE key = ?', spilled)
+
+    def spill_info(self):
+        """
+        :return: a :SpillInfo with the number of values spilled to disk and
+            faulted back in so far, the number of values currently in memory
+            and on disk, and the size of the ones in memory (if *max_bytes* is
+            used)
+        """
+        with self._lock:
+            if self._dead:
+                self._remove_dead()
+            in_memory = len(self._memory)
+            return SpillInfo(self.spills, self.faults, in_memory,
+                             len(self._keys) - in_memory, self._bytes)
+
+    def close(self):
+        """
+        Closes the file (deleting it, if it's a temporary file). The storage
+        can't be used after this.
+        """
+        with self._lock:
+            self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
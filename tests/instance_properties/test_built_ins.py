@@ -1,8 +1,10 @@
-from unittest import TestCase
+import asyncio
+from unittest import TestCase, IsolatedAsyncioTestCase
 
 from descriptor_tools.instance_properties import InstanceProperty
 from descriptor_tools.instance_properties.built_ins import (
     Lazy,
+    AsyncLazy,
     LateInit,
     ByMap,
     no_value, Validating)
@@ -57,6 +59,114 @@ class LazyTest(TestCase):
         self.assertIs(None, sut.initializer)
 
 
+class AsyncLazyTest(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.calls = 0
+        self.fail = False
+        self.release = asyncio.Event()
+
+    async def lazy_init(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.fail:
+            raise ValueError(self.calls)
+        return init_value
+
+    async def test_get_returns_init_value(self):
+        self.release.set()
+        sut = AsyncLazy(self.lazy_init)
+
+        result = await sut.get()
+
+        self.assertEqual(init_value, result)
+        self.assertIs(sut.initializer, None)
+
+    async def test_value_is_cached(self):
+        self.release.set()
+        sut = AsyncLazy(self.lazy_init)
+
+        await sut.get()
+        await sut.get()
+
+        self.assertEqual(self.calls, 1)
+
+    async def test_concurrent_lookups_share_one_calculation(self):
+        sut = AsyncLazy(self.lazy_init)
+        lookups = [asyncio.ensure_future(sut.get()) for _ in range(5)]
+        await asyncio.sleep(0)
+
+        self.release.set()
+        results = await asyncio.gather(*lookups)
+
+        self.assertEqual(results, [init_value] * 5)
+        self.assertEqual(self.calls, 1)
+
+    async def test_exception_reaches_every_waiter_and_is_not_cached(self):
+        self.fail = True
+        self.release.set()
+        sut = AsyncLazy(self.lazy_init)
+
+        results = await asyncio.gather(sut.get(), sut.get(),
+                                       return_exceptions=True)
+        self.fail = False
+        result = await sut.get()
+
+        self.assertEqual([type(r) for r in results], [ValueError] * 2)
+        self.assertEqual(result, init_value)
+        self.assertEqual(self.calls, 2)
+
+    async def test_cancelled_waiter_does_not_cancel_calculation(self):
+        sut = AsyncLazy(self.lazy_init)
+        cancelled = asyncio.ensure_future(sut.get())
+        other = asyncio.ensure_future(sut.get())
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        self.release.set()
+
+        self.assertEqual(await other, init_value)
+        self.assertTrue(cancelled.cancelled())
+        self.assertEqual(sut.value, init_value)
+        self.assertEqual(self.calls, 1)
+
+    async def test_cancelled_calculation_is_restarted(self):
+        sut = AsyncLazy(self.lazy_init)
+        waiter = asyncio.ensure_future(sut.get())
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)  # let the calculation start
+
+        sut.task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.release.set()
+
+        self.assertEqual(await sut.get(), init_value)
+        self.assertEqual(self.calls, 2)
+
+    async def test_set_wins_over_calculation_in_progress(self):
+        sut = AsyncLazy(self.lazy_init)
+        waiter = asyncio.ensure_future(sut.get())
+        await asyncio.sleep(0)
+
+        sut.set(1)
+        self.release.set()
+
+        self.assertEqual(await waiter, 1)
+        self.assertEqual(await sut.get(), 1)
+
+    async def test_with_InstanceProperty(self):
+        self.release.set()
+
+        class Class:
+            attr = InstanceProperty()
+
+        instance = Class()
+        instance.attr = AsyncLazy(self.lazy_init)
+
+        self.assertEqual(await instance.attr, init_value)
+
+
 class LateInitTest(TestCase):
     def test_given_uninitialized_then_value_is_no_value(self):
         sut = LateInit()
@@ -41,6 +41,15 @@ class InstancePropertyTest(TestCase):
 
         self.assertEqual(5, result)
 
+    def test_given_initialized_instances_when_calling_many_then_gets_values(self):
+        instances = [self.Class(), self.Class()]
+        instances[0].attr = MockDelegatedProperty(5)
+        instances[1].attr = MockDelegatedProperty(6)
+
+        result = self.Class.attr.many(instances)
+
+        self.assertEqual([5, 6], result)
+
     def test_given_initialized_instance_when_calling_get_then_gets_value_from_delegated_property(self):
         instance = self.Class()
         instance.attr = MockDelegatedProperty(5)
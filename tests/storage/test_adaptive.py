@@ -0,0 +1,208 @@
+# coding=utf-8
+from unittest import TestCase
+
+from descriptor_tools.storage import (AdaptiveStorage, ColumnStorage,
+                                      DictStorage, numeric_column_policy)
+from test_mocks import StorageUsingDescriptor
+
+
+def small_policy(stats, current):
+    return numeric_column_policy(stats, current, min_population=4)
+
+
+def make_class(**options):
+    options.setdefault('policy', small_policy)
+    options.setdefault('window', 8)
+
+    class Point:
+        x = StorageUsingDescriptor(AdaptiveStorage(**options))
+    return Point
+
+
+class AdaptiveStorage_Test(TestCase):
+    def test_starts_with_dict_storage(self):
+        Point = make_class()
+
+        self.assertIs(type(Point.x.storage.storage), DictStorage)
+
+    def test_promotes_floats_to_column(self):
+        Point = make_class()
+        points = [Point() for _ in range(8)]
+        for i, point in enumerate(points):
+            point.x = float(i)
+
+        point = Point()
+        point.x = 10.0
+
+        storage = Point.x.storage
+        self.assertIs(type(storage.storage), ColumnStorage)
+        self.assertEqual(storage.storage.typecode, 'd')
+        self.assertEqual([p.x for p in points], [float(i) for i in range(8)])
+        self.assertEqual(point.x, 10.0)
+
+    def test_promotes_ints_to_int_column(self):
+        Point = make_class()
+        points = [Point() for _ in range(9)]
+        for i, point in enumerate(points):
+            point.x = i
+
+        self.assertEqual(Point.x.storage.storage.typecode, 'q')
+        self.assertEqual([p.x for p in points], list(range(9)))
+
+    def test_keeps_dict_storage_for_mixed_types(self):
+        Point = make_class()
+        points = [Point() for _ in range(9)]
+        for i, point in enumerate(points):
+            point.x = float(i) if i % 2 else i
+
+        self.assertIs(type(Point.x.storage.storage), DictStorage)
+        self.assertEqual(Point.x.storage.decisions, [])
+
+    def test_keeps_dict_storage_for_small_populations(self):
+        Point = make_class()
+        point = Point()
+        for i in range(20):
+            point.x = float(i)
+            point.x
+
+        self.assertIs(type(Point.x.storage.storage), DictStorage)
+
+    def test_decisions_are_logged(self):
+        Point = make_class()
+        points = [Point() for _ in range(8)]
+        for i, point in enumerate(points):
+            point.x = float(i)
+        points[0].x
+
+        decision, = Point.x.storage.decisions
+        self.assertEqual(decision.operation, 8)
+        self.assertEqual((decision.old, decision.new),
+                         ('DictStorage', 'ColumnStorage'))
+        self.assertTrue(decision.switched)
+        self.assertEqual(decision.stats.writes, 8)
+        self.assertEqual(decision.stats.types, {float: 8})
+        self.assertIn('float', decision.reason)
+
+    def test_demotes_on_value_column_cannot_hold(self):
+        Point = make_class()
+        points = [Point() for _ in range(9)]
+        for i, point in enumerate(points):
+            point.x = float(i)
+
+        points[0].x = 'zero'
+
+        storage = Point.x.storage
+        self.assertIs(type(storage.storage), DictStorage)
+        self.assertEqual(storage.decisions[-1].new, 'DictStorage')
+        self.assertEqual(points[0].x, 'zero')
+        self.assertEqual(points[1].x, 1.0)
+
+    def test_keeps_backend_when_older_values_cannot_move(self):
+        Point = make_class()
+        odd = Point()
+        odd.x = 'odd'
+        points = [Point() for _ in range(8)]
+        # the first window also has the str, so the switch is tried after the
+        # second
+        for _ in range(2):
+            for i, point in enumerate(points):
+                point.x = float(i)
+
+        self.assertIs(type(Point.x.storage.storage), DictStorage)
+        decision, = Point.x.storage.decisions
+        self.assertFalse(decision.switched)
+        self.assertEqual(decision.new, 'ColumnStorage')
+        self.assertIn("'odd'", decision.reason)
+        self.assertEqual(odd.x, 'odd')
+
+    def test_failed_switch_backs_off(self):
+        Point = make_class()
+        odd = Point()
+        odd.x = 'odd'
+        points = [Point() for _ in range(8)]
+        for _ in range(12):
+            for i, point in enumerate(points):
+                point.x = float(i)
+
+        # tried after windows of 8, 16 and 32 operations
+        self.assertEqual([d.operation for d in Point.x.storage.decisions],
+                         [16, 32, 64])
+
+    def test_demotes_on_value_column_would_convert(self):
+        Point = make_class()
+        points = [Point() for _ in range(9)]
+        for i, point in enumerate(points):
+            point.x = float(i)
+
+        points[0].x = 7
+        points[1].x = True
+
+        storage = Point.x.storage
+        self.assertIs(type(storage.storage), DictStorage)
+        self.assertIs(type(points[0].x), int)
+        self.assertIs(points[1].x, True)
+        self.assertEqual(points[2].x, 2.0)
+
+    def test_pinned_never_switches(self):
+        Point = make_class(pinned=True)
+        points = [Point() for _ in range(20)]
+        for i, point in enumerate(points):
+            point.x = float(i)
+
+        storage = Point.x.storage
+        self.assertIs(type(storage.storage), DictStorage)
+        self.assertEqual(storage.stats().writes, 0)
+
+    def test_pin_keeps_current_backend(self):
+        Point = make_class()
+        points = [Point() for _ in range(9)]
+        for i, point in enumerate(points):
+            point.x = float(i)
+        Point.x.storage.pin()
+
+        for i, point in enumerate(points * 4):
+            point.x = -float(i)
+
+        self.assertIs(type(Point.x.storage.storage), ColumnStorage)
+
+    def test_name_and_desc_follow_the_backend(self):
+        Point = make_class()
+        points = [Point() for _ in range(9)]
+        for i, point in enumerate(points):
+            point.x = float(i)
+
+        storage = Point.x.storage
+        self.assertIs(storage.storage.desc, Point.x)
+        self.assertEqual(storage.base_name, 'x')
+
+    def test_missing_value(self):
+        Point = make_class()
+
+        with self.assertRaises(AttributeError):
+            Point().x
+
+    def test_delete(self):
+        Point = make_class()
+        points = [Point() for _ in range(9)]
+        for i, point in enumerate(points):
+            point.x = float(i)
+
+        del points[0].x
+
+        self.assertNotIn(points[0], Point.x.storage)
+        self.assertEqual(len(Point.x.storage.storage), 8)
+
+    def test_custom_policy(self):
+        def policy(stats, current):
+            if stats.reads > stats.writes:
+                return DictStorage(), 'read-heavy'
+
+        Point = make_class(policy=policy, window=4)
+        point = Point()
+        point.x = 1
+        for _ in range(3):
+            point.x
+
+        decision, = Point.x.storage.decisions
+        self.assertEqual(decision.reason, 'read-heavy')
+        self.assertEqual(point.x, 1)
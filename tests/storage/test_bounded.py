@@ -0,0 +1,242 @@
+# coding=utf-8
+import gc
+from unittest import TestCase
+
+from descriptor_tools.storage import LRUStorage, CacheInfo, TTLStorage
+from test_mocks import StorageUsingDescriptor
+
+
+class Class:
+    attr = StorageUsingDescriptor(LRUStorage(max_entries=2))
+
+
+class LRUStorage_Test(TestCase):
+    def setUp(self):
+        self.sut = Class.attr.storage
+        self.sut.clear()
+        self.instances = [Class() for _ in range(3)]
+
+    def test_needs_a_limit(self):
+        with self.assertRaises(ValueError):
+            LRUStorage()
+
+    def test_value_is_set_and_retrieved(self):
+        a = self.instances[0]
+        a.attr = 5
+
+        self.assertEqual(a.attr, 5)
+
+    def test_least_recently_set_is_evicted(self):
+        a, b, c = self.instances
+        a.attr, b.attr, c.attr = 1, 2, 3
+
+        self.assertNotIn(a, self.sut)
+        self.assertEqual((b.attr, c.attr), (2, 3))
+
+    def test_reading_counts_as_use(self):
+        a, b, c = self.instances
+        a.attr, b.attr = 1, 2
+        _ = a.attr
+        c.attr = 3
+
+        self.assertIn(a, self.sut)
+        self.assertNotIn(b, self.sut)
+
+    def test_evicted_value_raises_attribute_error(self):
+        a, b, c = self.instances
+        a.attr, b.attr, c.attr = 1, 2, 3
+
+        with self.assertRaises(AttributeError):
+            _ = a.attr
+
+    def test_resetting_value_does_not_evict(self):
+        a, b, _ = self.instances
+        a.attr, b.attr = 1, 2
+        a.attr = 3
+
+        self.assertEqual((a.attr, b.attr), (3, 2))
+        self.assertEqual(self.sut.evictions, 0)
+
+    def test_deletion(self):
+        a = self.instances[0]
+        a.attr = 1
+
+        del a.attr
+
+        with self.assertRaises(AttributeError):
+            del a.attr
+
+    def test_counters(self):
+        a, b, c = self.instances
+        a.attr, b.attr, c.attr = 1, 2, 3
+        _ = c.attr
+        try:
+            _ = a.attr
+        except AttributeError:
+            pass
+
+        self.assertEqual(self.sut.cache_info(),
+                         CacheInfo(hits=1, misses=1, evictions=1,
+                                   max_entries=2, max_bytes=None,
+                                   entries=2, bytes=0))
+
+    def test_clear_resets_everything(self):
+        a = self.instances[0]
+        a.attr = 1
+        _ = a.attr
+
+        self.sut.clear()
+
+        self.assertEqual(self.sut.cache_info(),
+                         CacheInfo(0, 0, 0, 2, None, 0, 0))
+
+    def test_dead_instances_are_removed(self):
+        a = self.instances.pop(0)
+        a.attr = 1
+        del a
+        gc.collect()
+
+        self.assertEqual(self.sut.cache_info().entries, 0)
+
+
+class LRUStorage_Byte_Budget_Test(TestCase):
+    class Class:
+        attr = StorageUsingDescriptor(LRUStorage(max_bytes=10, sizeof=len))
+
+    def setUp(self):
+        self.sut = self.Class.attr.storage
+        self.instances = [self.Class() for _ in range(3)]
+
+    def test_evicts_to_stay_under_budget(self):
+        a, b, c = self.instances
+        a.attr = 'x' * 4
+        b.attr = 'x' * 4
+        c.attr = 'x' * 4
+
+        self.assertNotIn(a, self.sut)
+        self.assertEqual(self.sut.cache_info().bytes, 8)
+
+    def test_replacing_value_updates_size(self):
+        a = self.instances[0]
+        a.attr = 'x' * 4
+        a.attr = 'x' * 2
+
+        self.assertEqual(self.sut.cache_info().bytes, 2)
+
+    def test_value_bigger_than_budget_is_not_kept(self):
+        a = self.instances[0]
+        a.attr = 'x' * 11
+
+        self.assertNotIn(a, self.sut)
+        self.assertEqual(self.sut.cache_info().bytes, 0)
+
+
+class NotWeakReferenceable:
+    __slots__ = ()
+    attr = StorageUsingDescriptor(LRUStorage(max_entries=1, weak_keys=False))
+
+
+class LRUStorage_Strong_Keys_Test(TestCase):
+    def test_works_without_weak_references(self):
+        a, b = NotWeakReferenceable(), NotWeakReferenceable()
+        a.attr = 1
+        b.attr = 2
+
+        self.assertNotIn(a, NotWeakReferenceable.attr.storage)
+        self.assertEqual(b.attr, 2)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TTLStorage_Test(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+        class Class:
+            attr = StorageUsingDescriptor(
+                TTLStorage(ttl=10, clock=self.clock, sweep_batch=2))
+        self.Class = Class
+        self.sut = Class.attr.storage
+
+    def test_value_is_available_before_expiry(self):
+        instance = self.Class()
+        instance.attr = 5
+        self.clock.now = 9
+
+        self.assertEqual(instance.attr, 5)
+        self.assertIn(instance, self.sut)
+
+    def test_expired_value_raises_attribute_error(self):
+        instance = self.Class()
+        instance.attr = 5
+        self.clock.now = 10
+
+        with self.assertRaises(AttributeError):
+            _ = instance.attr
+        self.assertEqual(len(self.sut), 0)
+
+    def test_expired_value_is_not_contained(self):
+        instance = self.Class()
+        instance.attr = 5
+        self.clock.now = 10
+
+        self.assertNotIn(instance, self.sut)
+
+    def test_setting_again_restarts_the_clock(self):
+        instance = self.Class()
+        instance.attr = 5
+        self.clock.now = 8
+        instance.attr = 6
+        self.clock.now = 12
+
+        self.assertEqual(instance.attr, 6)
+
+    def test_deleting_expired_value_fails(self):
+        instance = self.Class()
+        instance.attr = 5
+        self.clock.now = 10
+
+        with self.assertRaises(AttributeError):
+            del instance.attr
+
+    def test_setting_sweeps_a_batch_of_expired_values(self):
+        old = [self.Class() for _ in range(3)]
+        for instance in old:
+            instance.attr = 1
+        self.clock.now = 10
+        fresh = self.Class()
+
+        fresh.attr = 2
+
+        self.assertEqual(len(self.sut), 2)
+
+    def test_sweep_drops_every_expired_value(self):
+        old = [self.Class() for _ in range(3)]
+        for instance in old:
+            instance.attr = 1
+        self.clock.now = 5
+        fresh = self.Class()
+        fresh.attr = 2
+        self.clock.now = 10
+
+        result = self.sut.sweep()
+
+        self.assertEqual(result, 3)
+        self.assertEqual(len(self.sut), 1)
+        self.assertEqual(fresh.attr, 2)
+
+    def test_get_many(self):
+        a, b = self.Class(), self.Class()
+        a.attr, b.attr = 1, 2
+
+        self.assertEqual(self.sut.get_many([a, b]), [1, 2])
+
+        self.clock.now = 10
+        with self.assertRaises(AttributeError):
+            self.sut.get_many([a, b])
@@ -0,0 +1,133 @@
+# coding=utf-8
+from unittest import TestCase, skipUnless
+
+from descriptor_tools.storage import ColumnStorage, RowIndex
+from test_mocks import StorageUsingDescriptor
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+rows = RowIndex()
+
+
+class Point:
+    x = StorageUsingDescriptor(ColumnStorage('d', rows=rows))
+    y = StorageUsingDescriptor(ColumnStorage('d', rows=rows))
+    count = StorageUsingDescriptor(ColumnStorage('q'))
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class ColumnStorage_Test(TestCase):
+    def test_value_is_set_and_retrieved(self):
+        point = Point(1.5, 2.5)
+
+        self.assertEqual((point.x, point.y), (1.5, 2.5))
+
+    def test_unset_AttributeError(self):
+        point = Point(1, 2)
+
+        with self.assertRaises(AttributeError):
+            _ = point.count
+
+    def test_deletion(self):
+        point = Point(1, 2)
+
+        del point.x
+
+        with self.assertRaises(AttributeError):
+            _ = point.x
+        self.assertEqual(point.y, 2)
+
+    def test_wrong_type_TypeError(self):
+        point = Point(1, 2)
+
+        with self.assertRaises(TypeError):
+            point.count = "not a number"
+
+    def test_shared_rows_line_up(self):
+        points = [Point(i, i * 10) for i in range(20)]
+        xs = Point.x.storage.column()
+        ys = Point.y.storage.column()
+
+        for point in points:
+            row = rows.row_of(point)
+            self.assertEqual((xs[row], ys[row]), (point.x, point.y))
+
+    def test_rows_of_dead_instances_are_reused(self):
+        point = Point(1, 2)
+        row = rows.row_of(point)
+
+        del point
+        new_point = Point.__new__(Point)
+        new_point.y = 3
+
+        self.assertEqual(rows.row_of(new_point), row)
+        with self.assertRaises(AttributeError):
+            _ = new_point.x
+
+    def test_release(self):
+        point = Point(1, 2)
+
+        rows.release(point)
+
+        self.assertIsNone(rows.row_of(point))
+        self.assertNotIn(point, Point.x.storage)
+
+    def test_mask(self):
+        point = Point(1, 2)
+        del point.y
+        row = rows.row_of(point)
+
+        self.assertEqual(Point.x.storage.mask()[row], 1)
+        self.assertEqual(Point.y.storage.mask()[row], 0)
+
+    def test_growing_with_view_outstanding(self):
+        view = Point.x.storage.column()
+
+        points = [Point(i, i) for i in range(100)]
+
+        self.assertEqual(points[-1].x, 99)
+        view.release()
+
+    def test_items_and_len(self):
+        column = ColumnStorage('q')
+        points = [Point(i, i) for i in range(3)]
+        for i, point in enumerate(points):
+            column[point] = i
+        del column[points[1]]
+
+        self.assertEqual(column.items(), [(points[0], 0), (points[2], 2)])
+        self.assertEqual(len(column), 2)
+
+    def test_get_many(self):
+        points = [Point(i, i) for i in range(5)]
+
+        result = Point.x.storage.get_many(reversed(points))
+
+        self.assertEqual(result, [4.0, 3.0, 2.0, 1.0, 0.0])
+
+    def test_get_many_missing_AttributeError(self):
+        with self.assertRaises(AttributeError):
+            Point.count.storage.get_many([Point(1, 2)])
+
+    @skipUnless(numpy, "requires NumPy")
+    def test_get_many_as_numpy(self):
+        points = [Point(i, i) for i in range(5)]
+
+        result = Point.x.storage.get_many(points, as_numpy=True)
+
+        self.assertEqual(list(result), [0.0, 1.0, 2.0, 3.0, 4.0])
+
+    @skipUnless(numpy, "requires NumPy")
+    def test_to_numpy(self):
+        points = [Point(i, i) for i in range(5)]
+
+        result = Point.x.storage.to_numpy()
+
+        self.assertEqual(result[rows.row_of(points[3])], 3.0)
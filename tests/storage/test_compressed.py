@@ -0,0 +1,129 @@
+# coding=utf-8
+from unittest import TestCase
+
+from descriptor_tools.storage import (CompressedStorage, DictStorage,
+                                      InstanceStorage, protected)
+from descriptor_tools.storage.compressed import _Compressed
+from test_mocks import StorageUsingDescriptor
+
+
+TEXT = 'a rarely read text body ' * 100
+PAYLOAD = TEXT.encode()
+
+
+class InstSutClass:
+    attr = StorageUsingDescriptor(
+        CompressedStorage(InstanceStorage(protected), threshold=100))
+
+
+class CompressedStorage_Test(TestCase):
+    def setUp(self):
+        self.instance = InstSutClass()
+
+    def test_large_str_is_compressed(self):
+        self.instance.attr = TEXT
+
+        self.assertIsInstance(self.instance._attr, _Compressed)
+        self.assertLess(len(self.instance._attr.data), len(TEXT))
+        self.assertEqual(self.instance.attr, TEXT)
+
+    def test_large_bytes_are_compressed(self):
+        self.instance.attr = PAYLOAD
+
+        self.assertIsInstance(self.instance._attr, _Compressed)
+        self.assertEqual(self.instance.attr, PAYLOAD)
+
+    def test_small_values_are_stored_as_they_are(self):
+        self.instance.attr = 'short'
+
+        self.assertEqual(self.instance._attr, 'short')
+
+    def test_other_types_are_stored_as_they_are(self):
+        value = bytearray(PAYLOAD)
+        self.instance.attr = value
+
+        self.assertIs(self.instance.attr, value)
+
+    def test_incompressible_values_are_stored_as_they_are(self):
+        value = bytes(range(256))
+        self.instance.attr = value
+
+        self.assertIs(self.instance._attr, value)
+
+    def test_non_ascii_text_round_trips(self):
+        value = 'ünïcödé \ud800 ' * 50
+        self.instance.attr = value
+
+        self.assertEqual(self.instance.attr, value)
+
+    def test_missing_value(self):
+        with self.assertRaises(AttributeError):
+            _ = self.instance.attr
+
+    def test_deletion(self):
+        self.instance.attr = TEXT
+
+        del self.instance.attr
+
+        self.assertNotIn(self.instance, InstSutClass.attr.storage)
+
+    def test_get_many(self):
+        other = InstSutClass()
+        self.instance.attr = TEXT
+        other.attr = 5
+
+        result = InstSutClass.attr.storage.get_many([self.instance, other])
+
+        self.assertEqual(result, [TEXT, 5])
+
+
+class CompressedStorage_Options_Test(TestCase):
+    def test_lzma(self):
+        class Class:
+            attr = StorageUsingDescriptor(
+                CompressedStorage(DictStorage(), threshold=100, codec='lzma'))
+        instance = Class()
+        instance.attr = PAYLOAD
+
+        self.assertEqual(instance.attr, PAYLOAD)
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            CompressedStorage(DictStorage(), codec='rot13')
+
+    def test_without_cache_each_lookup_decompresses(self):
+        class Class:
+            attr = StorageUsingDescriptor(
+                CompressedStorage(DictStorage(), threshold=100))
+        instance = Class()
+        instance.attr = TEXT
+
+        self.assertIsNot(instance.attr, instance.attr)
+
+    def test_cache_keeps_recent_values(self):
+        class Class:
+            attr = StorageUsingDescriptor(
+                CompressedStorage(DictStorage(), threshold=100, cache_size=1))
+        first, second = Class(), Class()
+        first.attr = TEXT
+        second.attr = TEXT + '!'
+
+        cached = first.attr
+        self.assertIs(first.attr, cached)
+
+        _ = second.attr
+
+        self.assertIsNot(first.attr, cached)
+        self.assertEqual(len(Class.attr.storage._cache), 1)
+
+    def test_cache_does_not_return_replaced_values(self):
+        class Class:
+            attr = StorageUsingDescriptor(
+                CompressedStorage(DictStorage(), threshold=100, cache_size=4))
+        instance = Class()
+        instance.attr = TEXT
+        _ = instance.attr
+
+        instance.attr = TEXT + '!'
+
+        self.assertEqual(instance.attr, TEXT + '!')
@@ -0,0 +1,306 @@
+from unittest import TestCase
+
+from descriptor_tools.storage import *
+from descriptor_tools import id_name_of
+from test_mocks import StorageUsingDescriptor
+
+
+class DictSutClass:
+    attr = StorageUsingDescriptor(DictStorage())
+
+    def __init__(self):
+        self.attr = 5
+
+
+class DictStorage_Test(TestCase):
+    def setUp(self):
+        self.instance = DictSutClass()
+        self.sut = DictSutClass.attr.storage
+
+    def test_using_set_name_shortcuts_name_lookup(self):
+        sut = DictStorage()
+
+        sut.set_name("attr")
+
+        self.assertEqual(sut.name(None), "attr")
+
+    def test_skipping_set_name_uses_long_lookup(self):
+        result = self.sut.name(self.instance)
+
+        self.assertEqual(result, "attr")
+
+    def test_skipping_set_name_caches_name_for_later_lookups(self):
+        result1 = self.sut.name(DictSutClass)
+        result2 = self.sut.name(None)
+
+        self.assertEqual(result1, result2)
+
+    def test_value_is_set_and_retrieved(self):
+        self.assertEqual(5, self.instance.attr)
+
+    def test_deletion(self):
+        del self.instance.attr
+
+        with self.assertRaises(AttributeError):
+            _ = self.instance.attr
+
+    def test_items_and_len(self):
+        sut = DictStorage()
+        first, second = DictSutClass(), DictSutClass()
+        sut[first] = 1
+        sut[second] = 2
+
+        self.assertEqual(sut.items(), [(first, 1), (second, 2)])
+        self.assertEqual(len(sut), 2)
+
+
+class InstSutClass:
+    attr = StorageUsingDescriptor(InstanceStorage())
+
+    def __init__(self):
+        self.attr = 5
+
+
+class InstanceStorage_Test(TestCase):
+    def setUp(self):
+        self.instance = InstSutClass()
+        self.sut = InstSutClass.attr.storage
+
+    def test_using_set_name_shortcuts_name_lookup(self):
+        sut = DictStorage()
+
+        sut.set_name("attr")
+
+        self.assertEqual(sut.name(None), "attr")
+
+    def test_skipping_set_name_uses_long_lookup(self):
+        result = self.sut.name(self.instance)
+
+        self.assertEqual(result, "attr")
+
+    def test_skipping_set_name_caches_name_for_later_lookups(self):
+        result1 = self.sut.name(DictSutClass)
+        result2 = self.sut.name(None)
+
+        self.assertEqual(result1, result2)
+
+    def test_value_is_set_and_retrieved(self):
+        self.assertEqual(5, self.instance.attr)
+
+    def test_deletion(self):
+        del self.instance.attr
+
+        with self.assertRaises(AttributeError):
+            _ = self.instance.attr
+
+
+class SlotSutClass:
+    __slots__ = ('_attr',)
+    attr = StorageUsingDescriptor(SlotStorage())
+
+
+class SlotStorage_Test(TestCase):
+    def setUp(self):
+        self.instance = SlotSutClass()
+        self.sut = SlotSutClass.attr.storage
+
+    def test_slots_for_uses_mangled_name(self):
+        self.assertEqual(self.sut.slots_for('attr'), ('_attr',))
+
+    def test_value_is_stored_in_slot(self):
+        self.instance.attr = 5
+
+        self.assertEqual(self.instance._attr, 5)
+        self.assertEqual(self.instance.attr, 5)
+
+    def test_missing_value(self):
+        self.assertNotIn(self.instance, self.sut)
+        with self.assertRaises(AttributeError):
+            _ = self.instance.attr
+
+    def test_deletion(self):
+        self.instance.attr = 5
+
+        del self.instance.attr
+
+        with self.assertRaises(AttributeError):
+            _ = self.instance.attr
+
+    def test_get_many(self):
+        other = SlotSutClass()
+        self.instance.attr = 1
+        other.attr = 2
+
+        self.assertEqual(self.sut.get_many([self.instance, other]), [1, 2])
+
+
+class NameManglers_Test(TestCase):
+    def test_identity(self):
+        self.assertEqual("someString", identity("someString", None))
+
+    def test_protected(self):
+        self.assertEqual("_someString", protected("someString", None))
+
+    def test_hex_desc_id(self):
+        hex_id = id_name_of(InstSutClass.attr)
+
+        result = hex_desc_id("someString", InstSutClass.attr)
+
+        self.assertEqual(hex_id, result)
+
+
+class SlottedDictSutClass:
+    __slots__ = ()
+    attr = StorageUsingDescriptor(DictStorage(allow_strong_keys=True))
+
+
+class DictStorage_Strong_Keys_Test(TestCase):
+    def setUp(self):
+        self.instance = SlottedDictSutClass()
+        self.sut = SlottedDictSutClass.attr.storage
+
+    def test_value_is_set_and_retrieved(self):
+        self.instance.attr = 5
+
+        self.assertEqual(5, self.instance.attr)
+
+    def test_release(self):
+        self.instance.attr = 5
+
+        self.sut.release(self.instance)
+
+        self.assertNotIn(self.instance, self.sut)
+
+
+class OwnerManagedDictSutClass:
+    attr = StorageUsingDescriptor(DictStorage(weak_keys=False))
+
+
+class DictStorage_Owner_Managed_Test(TestCase):
+    def test_value_kept_until_released(self):
+        instance = OwnerManagedDictSutClass()
+        instance.attr = 5
+        sut = OwnerManagedDictSutClass.attr.storage
+
+        sut.release(instance)
+
+        self.assertNotIn(instance, sut)
+        self.assertEqual(len(sut.store), 0)
+
+
+class Parent:
+    pass
+
+
+class SideSutClass:
+    attr = StorageUsingDescriptor(SideTableStorage())
+    other = StorageUsingDescriptor(SideTableStorage())
+
+    def __init__(self):
+        self.attr = 5
+
+
+class SideTableStorage_Test(TestCase):
+    def setUp(self):
+        self.instance = SideSutClass()
+        self.sut = SideSutClass.attr.storage
+
+    def test_value_is_set_and_retrieved(self):
+        self.assertEqual(5, self.instance.attr)
+
+    def test_deletion(self):
+        del self.instance.attr
+
+        with self.assertRaises(AttributeError):
+            _ = self.instance.attr
+
+    def test_storages_share_one_side_table(self):
+        self.instance.other = 6
+
+        self.assertEqual(list(vars(self.instance)), [SIDE_TABLE_NAME])
+        self.assertEqual(6, self.instance.other)
+        self.assertEqual(5, self.instance.attr)
+
+    def test_contains(self):
+        self.assertIn(self.instance, self.sut)
+        self.assertNotIn(self.instance, SideSutClass.other.storage)
+
+    def test_value_referring_to_instance_is_collected(self):
+        import gc
+        import weakref
+        instance = SideSutClass()
+        instance.attr = [instance]  # a cycle through the stored value
+        instance_ref = weakref.ref(instance)
+
+        del instance
+        gc.collect()
+
+        self.assertIsNone(instance_ref())
+
+
+class SnapshotSutClass:
+    attr = StorageUsingDescriptor(SnapshotStorage())
+
+    def __init__(self):
+        self.attr = 5
+
+
+class SnapshotStorage_Test(TestCase):
+    def setUp(self):
+        self.instance = SnapshotSutClass()
+        self.sut = SnapshotSutClass.attr.storage
+
+    def test_value_is_set_and_retrieved(self):
+        self.assertEqual(5, self.instance.attr)
+
+    def test_deletion(self):
+        del self.instance.attr
+
+        with self.assertRaises(AttributeError):
+            _ = self.instance.attr
+
+    def test_deleting_missing_AttributeError(self):
+        del self.instance.attr
+
+        with self.assertRaises(AttributeError):
+            del self.instance.attr
+
+    def test_writes_swap_in_new_snapshot(self):
+        old = self.sut.snapshot
+
+        self.instance.attr = 6
+
+        self.assertEqual(old[self.instance], 5)
+        self.assertEqual(self.sut.snapshot[self.instance], 6)
+
+    def test_set_many(self):
+        other = SnapshotSutClass()
+
+        self.sut.set_many([self.instance, other], [7, 8])
+
+        self.assertEqual((self.instance.attr, other.attr), (7, 8))
+
+
+class Get_Many_Test(TestCase):
+    def check_get_many(self, storage):
+        class Sut:
+            attr = StorageUsingDescriptor(storage)
+        instances = [Sut(), Sut()]
+        instances[0].attr = 1
+        instances[1].attr = 2
+
+        self.assertEqual(storage.get_many(instances), [1, 2])
+        with self.assertRaises(AttributeError):
+            storage.get_many([Sut()])
+
+    def test_dict_storage(self):
+        self.check_get_many(DictStorage())
+
+    def test_instance_storage(self):
+        self.check_get_many(InstanceStorage())
+
+    def test_side_table_storage(self):
+        self.check_get_many(SideTableStorage())
+
+    def test_snapshot_storage(self):
+        self.check_get_many(SnapshotStorage())
@@ -0,0 +1,186 @@
+# coding=utf-8
+from collections import namedtuple
+from decimal import Decimal
+import gc
+from unittest import TestCase
+
+from descriptor_tools.storage import (InterningStorage, InternPool,
+                                      DictStorage, InstanceStorage, protected)
+from test_mocks import StorageUsingDescriptor
+
+
+def fresh(text):
+    # builds an equal but separate string each time
+    return ''.join(list(text))
+
+
+class InternPool_Test(TestCase):
+    def setUp(self):
+        self.pool = InternPool()
+
+    def test_equal_values_share_one_object(self):
+        first = self.pool.intern(fresh('status'))
+        second = self.pool.intern(fresh('status'))
+
+        self.assertIs(first, second)
+        self.assertEqual((self.pool.hits, self.pool.misses), (1, 1))
+
+    def test_equal_values_of_different_types_are_kept_apart(self):
+        values = [self.pool.intern(v) for v in (1, 1.0, True)]
+
+        self.assertEqual([type(v) for v in values], [int, float, bool])
+
+    def test_sign_of_zero_is_kept(self):
+        self.pool.intern(0.0)
+
+        result = self.pool.intern(-0.0)
+
+        self.assertEqual(str(result), '-0.0')
+
+    def test_tuple_items_keep_their_types(self):
+        self.pool.intern((1, 'a'))
+
+        result = self.pool.intern((1.0, 'a'))
+
+        self.assertIs(type(result[0]), float)
+
+    def test_sign_of_complex_zeros_is_kept(self):
+        self.pool.intern(complex(0.0, 0.0))
+
+        result = self.pool.intern(complex(-0.0, -0.0))
+
+        self.assertEqual(str(result), '(-0-0j)')
+
+    def test_namedtuple_items_keep_their_types(self):
+        Point = namedtuple('Point', 'x')
+        self.pool.intern(Point(True))
+
+        result = self.pool.intern(Point(1))
+
+        self.assertIs(type(result.x), int)
+
+    def test_equal_namedtuples_share_one_object(self):
+        Point = namedtuple('Point', 'x')
+        first = self.pool.intern(Point(fresh('a')))
+
+        self.assertIs(self.pool.intern(Point(fresh('a'))), first)
+
+    def test_tuple_subclass_with_attributes_is_not_pooled(self):
+        class Tagged(tuple):
+            pass
+        self.pool.intern(Tagged((1,)))
+        value = Tagged((1,))
+
+        self.assertIs(self.pool.intern(value), value)
+
+    def test_other_types_are_not_pooled(self):
+        self.pool.intern(Decimal('1.0'))
+        value = Decimal('1.00')
+
+        result = self.pool.intern(value)
+
+        self.assertIs(result, value)
+        self.assertEqual(len(self.pool), 0)
+
+    def test_tuples_holding_other_types_are_not_pooled(self):
+        self.pool.intern((Decimal('1.0'),))
+        value = (Decimal('1.00'),)
+
+        self.assertIs(self.pool.intern(value), value)
+
+    def test_unhashable_values_are_not_pooled(self):
+        value = {'a': 1}
+
+        result = self.pool.intern(value)
+
+        self.assertIs(result, value)
+        self.assertEqual(len(self.pool), 0)
+
+    def test_sweep_removes_unused_values(self):
+        kept = self.pool.intern(fresh('kept'))
+        self.pool.intern(fresh('dropped'))
+
+        removed = self.pool.sweep()
+
+        self.assertEqual(removed, 1)
+        self.assertIs(self.pool.intern(fresh('kept')), kept)
+
+    def test_report(self):
+        values = [self.pool.intern(fresh('status')) for _ in range(3)]
+
+        report = self.pool.report()
+
+        self.assertEqual(report.values, 1)
+        self.assertEqual(report.references, 3)
+        self.assertEqual(report.bytes_saved, 2 * values[0].__sizeof__())
+
+
+class DictSutClass:
+    attr = StorageUsingDescriptor(InterningStorage(DictStorage()))
+
+
+class InstSutClass:
+    attr = StorageUsingDescriptor(InterningStorage(InstanceStorage(protected)))
+
+
+class InterningStorage_Test(TestCase):
+    def test_wrapping_dict_storage(self):
+        a, b = DictSutClass(), DictSutClass()
+        a.attr = fresh('status')
+        b.attr = fresh('status')
+
+        self.assertIs(a.attr, b.attr)
+
+    def test_wrapping_instance_storage(self):
+        a, b = InstSutClass(), InstSutClass()
+        a.attr = fresh('status')
+        b.attr = fresh('status')
+
+        self.assertIs(a._attr, b._attr)
+
+    def test_name_comes_from_wrapped_storage(self):
+        storage = InstSutClass.attr.storage
+
+        self.assertEqual(storage.name(None), '_attr')
+        self.assertEqual(storage.storage.base_name, 'attr')
+        self.assertIs(storage.desc, InstSutClass.attr)
+
+    def test_missing_value(self):
+        with self.assertRaises(AttributeError):
+            _ = DictSutClass().attr
+
+    def test_deletion(self):
+        instance = DictSutClass()
+        instance.attr = 5
+
+        del instance.attr
+
+        self.assertNotIn(instance, DictSutClass.attr.storage)
+
+    def test_get_many(self):
+        a, b = DictSutClass(), DictSutClass()
+        a.attr, b.attr = 1, 2
+
+        self.assertEqual(DictSutClass.attr.storage.get_many([a, b]), [1, 2])
+
+    def test_shared_pool(self):
+        pool = InternPool()
+
+        class Class:
+            x = StorageUsingDescriptor(InterningStorage(DictStorage(), pool=pool))
+            y = StorageUsingDescriptor(InterningStorage(DictStorage(), pool=pool))
+        instance = Class()
+        instance.x = fresh('value')
+        instance.y = fresh('value')
+
+        self.assertIs(instance.x, instance.y)
+
+    def test_values_of_dead_instances_are_swept(self):
+        pool = DictSutClass.attr.storage.pool
+        pool.sweep()
+        instance = DictSutClass()
+        instance.attr = fresh('short-lived')
+        del instance
+        gc.collect()
+
+        self.assertEqual(pool.sweep(), 1)
@@ -0,0 +1,144 @@
+# coding=utf-8
+import threading
+from unittest import TestCase
+
+from descriptor_tools.storage import (DictStorage, InstanceStorage,
+                                      MigratingStorage, protected)
+from test_mocks import StorageUsingDescriptor
+
+
+def make_population(size):
+    class Thing:
+        attr = StorageUsingDescriptor(DictStorage())
+
+    things = [Thing() for _ in range(size)]
+    for i, thing in enumerate(things):
+        thing.attr = i
+    return Thing, things
+
+
+def start_migration(Thing, batch_size=4):
+    old = Thing.attr.storage
+    Thing.attr.storage = MigratingStorage(
+        old, InstanceStorage(protected), batch_size=batch_size)
+    return old, Thing.attr.storage
+
+
+class MigratingStorage_Test(TestCase):
+    def test_new_storage_takes_over_desc_and_name(self):
+        Thing, things = make_population(1)
+        _, sut = start_migration(Thing)
+
+        self.assertIs(sut.new.desc, Thing.attr)
+        self.assertEqual(sut.new.base_name, 'attr')
+
+    def test_reads_fall_through_to_old_storage(self):
+        Thing, things = make_population(10)
+        old, sut = start_migration(Thing)
+
+        self.assertEqual([thing.attr for thing in things], list(range(10)))
+        self.assertEqual(len(old), 10)
+
+    def test_steps_move_a_batch_at_a_time(self):
+        Thing, things = make_population(10)
+        old, sut = start_migration(Thing)
+
+        self.assertEqual(sut.step(), 4)
+        self.assertEqual(len(old), 6)
+        self.assertEqual(sut.remaining, 6)
+        self.assertFalse(sut.done)
+        self.assertEqual([thing.attr for thing in things], list(range(10)))
+
+    def test_finish_moves_everything(self):
+        Thing, things = make_population(10)
+        old, sut = start_migration(Thing)
+
+        new = sut.finish()
+        Thing.attr.storage = new
+
+        self.assertTrue(sut.done)
+        self.assertEqual(sut.moved, 10)
+        self.assertEqual(len(old), 0)
+        self.assertEqual([thing.attr for thing in things], list(range(10)))
+        self.assertEqual(vars(things[3]), {'_attr': 3})
+
+    def test_values_set_in_old_storage_after_start_are_moved(self):
+        Thing, things = make_population(3)
+        old, sut = start_migration(Thing)
+        late = Thing()
+
+        old[late] = 'late'
+        sut.finish()
+
+        self.assertEqual(len(old), 0)
+        self.assertEqual(late.attr, 'late')
+        self.assertEqual(sut.moved, 4)
+
+    def test_set_goes_to_new_storage(self):
+        Thing, things = make_population(3)
+        old, sut = start_migration(Thing)
+
+        things[0].attr = 'new'
+        sut.finish()
+
+        self.assertEqual(things[0].attr, 'new')
+        self.assertNotIn(things[0], old)
+        self.assertEqual(sut.moved, 2)
+
+    def test_new_instances_go_to_new_storage(self):
+        Thing, things = make_population(3)
+        old, sut = start_migration(Thing)
+
+        thing = Thing()
+        thing.attr = 5
+
+        self.assertEqual(vars(thing), {'_attr': 5})
+        self.assertNotIn(thing, old)
+
+    def test_delete_from_either_storage(self):
+        Thing, things = make_population(8)
+        old, sut = start_migration(Thing)
+        sut.step()
+
+        for thing in things[:2] + things[-2:]:
+            del thing.attr
+            with self.assertRaises(AttributeError):
+                _ = thing.attr
+        sut.finish()
+
+        self.assertEqual(len(old), 0)
+        self.assertEqual([thing.attr for thing in things[2:-2]],
+                         list(range(2, 6)))
+
+    def test_delete_missing_AttributeError(self):
+        Thing, things = make_population(1)
+        start_migration(Thing)
+
+        with self.assertRaises(AttributeError):
+            del Thing().attr
+
+    def test_dead_instances_are_skipped(self):
+        Thing, things = make_population(10)
+        old, sut = start_migration(Thing)
+
+        del things[5:]
+        sut.finish()
+
+        self.assertEqual(sut.moved, 5)
+
+    def test_concurrent_writes_are_not_lost(self):
+        Thing, things = make_population(2000)
+        old, sut = start_migration(Thing, batch_size=16)
+
+        def write():
+            for i, thing in enumerate(things):
+                thing.attr = -i
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        sut.finish()
+        writer.join()
+
+        self.assertEqual(len(old), 0)
+        self.assertEqual([thing.attr for thing in things],
+                         [-i for i in range(2000)])
@@ -0,0 +1,139 @@
+# coding=utf-8
+from enum import Enum
+from unittest import TestCase
+
+from descriptor_tools import with_slots
+from descriptor_tools.storage import PackedField, PackedStorage
+from test_mocks import StorageUsingDescriptor
+
+
+class Priority(Enum):
+    LOW = 'low'
+    MEDIUM = 'medium'
+    HIGH = 'high'
+
+
+flags = PackedField()
+
+
+class Task:
+    done = StorageUsingDescriptor(PackedStorage(flags, default=False))
+    urgent = StorageUsingDescriptor(PackedStorage(flags))
+    priority = StorageUsingDescriptor(
+        PackedStorage(flags, tuple(Priority), default=Priority.MEDIUM))
+    owner = StorageUsingDescriptor(PackedStorage(flags, ('ann', 'bob', 'cy')))
+
+
+class PackedField_Test(TestCase):
+    def test_bits_are_allocated_in_order(self):
+        storages = [Task.done.storage, Task.urgent.storage,
+                    Task.priority.storage, Task.owner.storage]
+
+        self.assertEqual([(s.offset, s.width) for s in storages],
+                         [(0, 1), (1, 2), (3, 2), (5, 2)])
+        self.assertEqual(flags.size, 7)
+
+
+class PackedStorage_Test(TestCase):
+    def setUp(self):
+        self.task = Task()
+
+    def test_flag_with_default(self):
+        self.assertFalse(self.task.done)
+
+        self.task.done = True
+
+        self.assertTrue(self.task.done)
+
+    def test_flag_without_default_starts_missing(self):
+        with self.assertRaises(AttributeError):
+            _ = self.task.urgent
+        self.assertNotIn(self.task, Task.urgent.storage)
+
+    def test_flag_without_default(self):
+        self.task.urgent = False
+
+        self.assertIs(self.task.urgent, False)
+        self.assertIn(self.task, Task.urgent.storage)
+
+    def test_enum_with_default(self):
+        self.assertIs(self.task.priority, Priority.MEDIUM)
+
+        self.task.priority = Priority.HIGH
+
+        self.assertIs(self.task.priority, Priority.HIGH)
+
+    def test_setting_default_value(self):
+        self.task.priority = Priority.HIGH
+
+        self.task.priority = Priority.MEDIUM
+
+        self.assertIs(self.task.priority, Priority.MEDIUM)
+
+    def test_values_share_one_int(self):
+        self.task.done = True
+        self.task.urgent = True
+        self.task.priority = Priority.LOW
+        self.task.owner = 'cy'
+
+        self.assertEqual(vars(self.task), {'_packed_bits': flags.bits_of(self.task)})
+        self.assertEqual((self.task.done, self.task.urgent, self.task.priority,
+                          self.task.owner),
+                         (True, True, Priority.LOW, 'cy'))
+
+    def test_setting_one_value_leaves_the_others(self):
+        self.task.owner = 'bob'
+        self.task.done = True
+
+        self.task.owner = 'ann'
+
+        self.assertTrue(self.task.done)
+        self.assertEqual(self.task.owner, 'ann')
+
+    def test_other_values_are_rejected(self):
+        for value in ('dan', ['ann']):
+            with self.assertRaises(ValueError):
+                self.task.owner = value
+
+    def test_deletion_without_default(self):
+        self.task.owner = 'bob'
+
+        del self.task.owner
+
+        with self.assertRaises(AttributeError):
+            _ = self.task.owner
+        with self.assertRaises(AttributeError):
+            del self.task.owner
+
+    def test_deletion_with_default_resets(self):
+        self.task.priority = Priority.HIGH
+
+        del self.task.priority
+
+        self.assertIs(self.task.priority, Priority.MEDIUM)
+
+    def test_get_many(self):
+        other = Task()
+        self.task.owner = 'ann'
+        other.owner = 'cy'
+
+        self.assertEqual(Task.owner.storage.get_many([self.task, other]),
+                         ['ann', 'cy'])
+        with self.assertRaises(AttributeError):
+            Task.owner.storage.get_many([Task()])
+
+
+class PackedStorage_Slots_Test(TestCase):
+    def test_generates_single_slot(self):
+        bits = PackedField('_bits')
+
+        @with_slots
+        class Slotted:
+            a = StorageUsingDescriptor(PackedStorage(bits, default=False))
+            b = StorageUsingDescriptor(PackedStorage(bits, default=False))
+        instance = Slotted()
+        instance.b = True
+
+        self.assertEqual(Slotted.__slots__, ('_bits',))
+        self.assertEqual((instance.a, instance.b), (False, True))
+        self.assertEqual(instance._bits, 2)
@@ -0,0 +1,189 @@
+# coding=utf-8
+import asyncio
+import contextvars
+import gc
+import threading
+import weakref
+from unittest import TestCase
+
+from descriptor_tools.storage import ThreadLocalStorage, ContextVarStorage
+from test_mocks import StorageUsingDescriptor
+
+
+class ThreadSutClass:
+    attr = StorageUsingDescriptor(ThreadLocalStorage())
+
+
+def in_thread(func):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+class ThreadLocalStorage_Test(TestCase):
+    def setUp(self):
+        self.instance = ThreadSutClass()
+
+    def test_value_is_set_and_retrieved(self):
+        self.instance.attr = 5
+
+        self.assertEqual(self.instance.attr, 5)
+
+    def test_value_is_not_seen_by_other_threads(self):
+        self.instance.attr = 5
+
+        result = in_thread(lambda: self.instance in ThreadSutClass.attr.storage)
+
+        self.assertFalse(result)
+
+    def test_other_threads_values_are_not_seen(self):
+        def set_in_thread():
+            self.instance.attr = 6
+            return self.instance.attr
+        self.instance.attr = 5
+
+        result = in_thread(set_in_thread)
+
+        self.assertEqual(result, 6)
+        self.assertEqual(self.instance.attr, 5)
+
+    def test_deletion(self):
+        self.instance.attr = 5
+
+        del self.instance.attr
+
+        with self.assertRaises(AttributeError):
+            _ = self.instance.attr
+
+    def test_get_many(self):
+        other = ThreadSutClass()
+        self.instance.attr = 1
+        other.attr = 2
+
+        result = ThreadSutClass.attr.storage.get_many([self.instance, other])
+
+        self.assertEqual(result, [1, 2])
+
+
+class ContextSutClass:
+    attr = StorageUsingDescriptor(ContextVarStorage())
+
+
+class NotWeakReferenceable:
+    __slots__ = ()
+    attr = StorageUsingDescriptor(ContextVarStorage(allow_strong_keys=True))
+
+
+class ContextVarStorage_Test(TestCase):
+    def setUp(self):
+        self.instance = ContextSutClass()
+        self.sut = ContextSutClass.attr.storage
+
+    def run_in_context(self, func):
+        return contextvars.copy_context().run(func)
+
+    def test_value_is_set_and_retrieved(self):
+        def func():
+            self.instance.attr = 5
+            return self.instance.attr
+
+        self.assertEqual(self.run_in_context(func), 5)
+
+    def test_values_of_dead_instances_are_dropped_on_write(self):
+        class Value:
+            pass
+
+        def func():
+            dead = ContextSutClass()
+            dead.attr = Value()
+            ref = weakref.ref(dead.attr)
+            del dead
+            gc.collect()
+            self.instance.attr = 5
+            return ref
+
+        ref = self.run_in_context(func)
+
+        self.assertIsNone(ref())
+
+    def test_value_does_not_leak_out_of_context(self):
+        def func():
+            self.instance.attr = 5
+
+        self.run_in_context(func)
+
+        self.assertNotIn(self.instance, self.sut)
+
+    def test_tasks_see_their_own_values(self):
+        async def task(value):
+            self.instance.attr = value
+            await asyncio.sleep(0)
+            return self.instance.attr
+
+        async def main():
+            return await asyncio.gather(task(1), task(2))
+
+        self.assertEqual(asyncio.run(main()), [1, 2])
+
+    def test_tasks_inherit_values_from_their_creator(self):
+        async def task():
+            return self.instance.attr
+
+        async def main():
+            self.instance.attr = 5
+            return await asyncio.create_task(task())
+
+        self.assertEqual(asyncio.run(main()), 5)
+
+    def test_deletion(self):
+        def func():
+            self.instance.attr = 5
+            del self.instance.attr
+            return self.instance in self.sut
+
+        self.assertFalse(self.run_in_context(func))
+
+    def test_deleting_missing_value_fails(self):
+        with self.assertRaises(AttributeError):
+            del self.instance.attr
+
+    def test_id_reused_by_another_instance_is_missing(self):
+        def func():
+            temp = ContextSutClass()
+            temp.attr = 5
+            temp_id = id(temp)
+            del temp
+            # the stale item is still in the context's mapping, but its key is
+            # dead, so it can't be mistaken for a new instance's
+            return [instance for instance in
+                    (ContextSutClass() for _ in range(100))
+                    if id(instance) == temp_id and instance in self.sut]
+
+        self.assertEqual(self.run_in_context(func), [])
+
+    def test_get_many(self):
+        def func():
+            other = ContextSutClass()
+            self.instance.attr = 1
+            other.attr = 2
+            return self.sut.get_many([self.instance, other])
+
+        self.assertEqual(self.run_in_context(func), [1, 2])
+
+    def test_strong_keys_must_be_allowed(self):
+        class Class:
+            __slots__ = ()
+            attr = StorageUsingDescriptor(ContextVarStorage())
+
+        with self.assertRaises(TypeError):
+            Class().attr = 5
+
+    def test_allowed_strong_keys(self):
+        def func():
+            instance = NotWeakReferenceable()
+            instance.attr = 5
+            return instance.attr
+
+        self.assertEqual(self.run_in_context(func), 5)
@@ -0,0 +1,149 @@
+# coding=utf-8
+import multiprocessing
+from operator import attrgetter
+from unittest import TestCase
+
+from descriptor_tools.storage import SharedColumnStorage, StorageWrapper
+from test_mocks import StorageUsingDescriptor
+
+
+class Particle:
+    mass = StorageUsingDescriptor(SharedColumnStorage('d', row=attrgetter('index')))
+
+    def __init__(self, index):
+        self.index = index
+
+
+def attach_worker(name):
+    Particle.mass.storage.attach(name)
+
+
+def read_and_double(index):
+    particle = Particle(index)
+    mass = particle.mass
+    particle.mass = mass * 2
+    return mass
+
+
+class SharedColumnStorage_Test(TestCase):
+    def setUp(self):
+        self.sut = Particle.mass.storage
+        self.sut.create(4)
+        self.addCleanup(self.sut.release)
+        self.particles = [Particle(i) for i in range(4)]
+
+    def test_value_is_set_and_retrieved(self):
+        self.particles[1].mass = 2.5
+
+        self.assertEqual(self.particles[1].mass, 2.5)
+
+    def test_values_are_found_by_row_not_identity(self):
+        self.particles[1].mass = 2.5
+
+        self.assertEqual(Particle(1).mass, 2.5)
+
+    def test_unset_value_raises_attribute_error(self):
+        with self.assertRaises(AttributeError):
+            _ = self.particles[0].mass
+
+    def test_deletion(self):
+        self.particles[0].mass = 1.0
+
+        del self.particles[0].mass
+
+        self.assertNotIn(self.particles[0], self.sut)
+
+    def test_row_outside_capacity(self):
+        with self.assertRaises(IndexError):
+            Particle(4).mass = 1.0
+        self.assertNotIn(Particle(4), self.sut)
+
+    def test_get_many(self):
+        for particle in self.particles:
+            particle.mass = particle.index / 2
+
+        result = self.sut.get_many(self.particles)
+
+        self.assertEqual(result, [0.0, 0.5, 1.0, 1.5])
+
+    def test_column_and_mask(self):
+        self.particles[2].mass = 3.0
+
+        column, mask = self.sut.column(), self.sut.mask()
+
+        self.assertEqual(column[2], 3.0)
+        self.assertEqual(list(mask), [0, 0, 1, 0])
+        column.release()
+        mask.release()
+
+    def test_creator_is_owner(self):
+        self.assertTrue(self.sut.owner)
+        self.assertIsNotNone(self.sut.block_name)
+
+    def test_name_is_attribute_name(self):
+        self.assertEqual(self.sut.name(self.particles[0]), 'mass')
+
+    def test_wrapped_name_is_attribute_name(self):
+        wrapper = StorageWrapper(self.sut)
+
+        self.assertEqual(wrapper.name(self.particles[0]), 'mass')
+
+    def test_cannot_create_twice(self):
+        with self.assertRaises(RuntimeError):
+            self.sut.create(4)
+
+    def test_workers_share_the_values(self):
+        for particle in self.particles:
+            particle.mass = float(particle.index)
+        context = multiprocessing.get_context('spawn')
+
+        with context.Pool(2, initializer=attach_worker,
+                          initargs=(self.sut.block_name,)) as pool:
+            seen = pool.map(read_and_double, range(4))
+
+        self.assertEqual(seen, [0.0, 1.0, 2.0, 3.0])
+        self.assertEqual(self.sut.get_many(self.particles),
+                         [0.0, 2.0, 4.0, 6.0])
+
+
+class SharedColumnStorage_Lifetime_Test(TestCase):
+    def test_using_without_block_fails(self):
+        sut = SharedColumnStorage(row=attrgetter('index'))
+
+        with self.assertRaises(RuntimeError):
+            sut[Particle(0)] = 1.0
+
+    def test_release_allows_creating_again(self):
+        sut = SharedColumnStorage(row=attrgetter('index'), capacity=2)
+        sut.release()
+
+        sut.create(3)
+        self.addCleanup(sut.release)
+
+        self.assertEqual(sut.capacity, 3)
+
+    def test_closed_storage_cannot_be_used(self):
+        sut = SharedColumnStorage(row=attrgetter('index'), capacity=2)
+        sut.close()
+        self.addCleanup(sut.release)
+
+        with self.assertRaises(RuntimeError):
+            _ = sut[Particle(0)]
+
+    def test_attach_untracked(self):
+        owner = SharedColumnStorage(row=attrgetter('index'), capacity=2)
+        self.addCleanup(owner.release)
+        owner[Particle(1)] = 2.5
+        sut = SharedColumnStorage(row=attrgetter('index'))
+
+        sut.attach(owner.block_name, untracked=True)
+        self.addCleanup(sut.release)
+
+        self.assertEqual(sut[Particle(1)], 2.5)
+        self.assertFalse(sut.owner)
+
+    def test_context_manager_releases(self):
+        with SharedColumnStorage(row=attrgetter('index'), capacity=2) as sut:
+            pass
+
+        self.assertIsNone(sut.block_name)
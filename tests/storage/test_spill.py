@@ -0,0 +1,144 @@
+# coding=utf-8
+import gc
+import os
+import tempfile
+import threading
+from unittest import TestCase
+
+from descriptor_tools.storage import SpillStorage, SpillInfo
+from test_mocks import StorageUsingDescriptor
+
+
+class SpillStorage_Test(TestCase):
+    def setUp(self):
+        class Class:
+            attr = StorageUsingDescriptor(SpillStorage(max_entries=2))
+        self.Class = Class
+        self.sut = Class.attr.storage
+        self.addCleanup(self.sut.close)
+        self.instances = [Class() for _ in range(3)]
+
+    def test_needs_a_budget(self):
+        with self.assertRaises(ValueError):
+            SpillStorage()
+
+    def test_value_is_set_and_retrieved(self):
+        a = self.instances[0]
+        a.attr = [1, 2]
+
+        self.assertEqual(a.attr, [1, 2])
+
+    def test_least_recently_used_value_is_spilled(self):
+        a, b, c = self.instances
+        a.attr, b.attr, c.attr = 'a', 'b', 'c'
+
+        self.assertEqual(self.sut.spill_info(),
+                         SpillInfo(spills=1, faults=0, in_memory=2, spilled=1,
+                                   bytes=0))
+
+    def test_spilled_value_faults_back_in(self):
+        a, b, c = self.instances
+        a.attr, b.attr, c.attr = 'a', 'b', 'c'
+
+        self.assertEqual(a.attr, 'a')
+        info = self.sut.spill_info()
+        self.assertEqual((info.spills, info.faults), (2, 1))
+        self.assertEqual((info.in_memory, info.spilled), (2, 1))
+
+    def test_every_value_survives_spilling(self):
+        instances = [self.Class() for _ in range(20)]
+        for i, instance in enumerate(instances):
+            instance.attr = i
+
+        self.assertEqual([instance.attr for instance in instances],
+                         list(range(20)))
+
+    def test_resetting_spilled_value(self):
+        a, b, c = self.instances
+        a.attr, b.attr, c.attr = 'a', 'b', 'c'
+
+        a.attr = 'new'
+
+        self.assertEqual(a.attr, 'new')
+        self.assertEqual(self.sut.spill_info().spilled, 1)
+
+    def test_deleting_spilled_value(self):
+        a, b, c = self.instances
+        a.attr, b.attr, c.attr = 'a', 'b', 'c'
+
+        del a.attr
+
+        self.assertNotIn(a, self.sut)
+        with self.assertRaises(AttributeError):
+            _ = a.attr
+        self.assertEqual(self.sut.spill_info().spilled, 0)
+
+    def test_missing_value(self):
+        with self.assertRaises(AttributeError):
+            _ = self.instances[0].attr
+        with self.assertRaises(AttributeError):
+            del self.instances[0].attr
+
+    def test_values_of_dead_instances_are_removed_from_disk(self):
+        a, b, c = self.instances
+        a.attr, b.attr, c.attr = 'a', 'b', 'c'
+        del a, self.instances[:]
+        gc.collect()
+
+        info = self.sut.spill_info()
+
+        self.assertEqual((info.in_memory, info.spilled), (2, 0))
+        count = self.sut._db.execute('SELECT COUNT(*) FROM spilled').fetchone()
+        self.assertEqual(count, (0,))
+
+    def test_unpicklable_values_stay_in_memory(self):
+        a, b, c = self.instances
+        lock = threading.Lock()
+        a.attr = lock
+        b.attr, c.attr = 'b', 'c'
+
+        self.assertIs(a.attr, lock)
+        info = self.sut.spill_info()
+        self.assertEqual((info.spilled, info.faults), (1, 0))
+
+    def test_get_many(self):
+        for i, instance in enumerate(self.instances):
+            instance.attr = i
+
+        self.assertEqual(self.sut.get_many(self.instances), [0, 1, 2])
+
+
+class SpillStorage_File_Test(TestCase):
+    def test_byte_budget(self):
+        class Class:
+            attr = StorageUsingDescriptor(SpillStorage(max_bytes=10, sizeof=len))
+        storage = Class.attr.storage
+        self.addCleanup(storage.close)
+        instances = [Class() for _ in range(3)]
+        for instance in instances:
+            instance.attr = 'x' * 4
+
+        info = storage.spill_info()
+
+        self.assertEqual((info.in_memory, info.spilled, info.bytes), (2, 1, 8))
+
+    def test_temporary_file_is_deleted_on_close(self):
+        storage = SpillStorage(max_entries=1)
+        path = storage.path
+        self.assertTrue(os.path.exists(path))
+
+        storage.close()
+
+        self.assertFalse(os.path.exists(path))
+
+    def test_given_file_is_kept_and_emptied(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'spill.sqlite')
+        with SpillStorage(max_entries=1, path=path) as storage:
+            storage._db.execute("INSERT INTO spilled VALUES (1, x'00')")
+
+        with SpillStorage(max_entries=1, path=path) as storage:
+            count = storage._db.execute('SELECT COUNT(*) FROM spilled')
+            self.assertEqual(count.fetchone(), (0,))
+        self.assertTrue(os.path.exists(path))
@@ -241,6 +241,14 @@ class Binding_Test(TestCase):
 
         self.assertEqual(5, result)
 
+    def test_unbound_many(self):
+        other = self.Class()
+        other.attr = 6
+
+        result = self.Class.attr.many([self.instance, other])
+
+        self.assertEqual([5, 6], result)
+
 
 class SecretSet_Test(TestCase):
     def setUp(self):
@@ -300,6 +308,17 @@ class SetOnce_Test(TestCase):
         with self.assertRaises(AttributeError):
             self.instance.attr = 5
 
+    def test_setting_twice_fails_on_unweakrefable_instance(self):
+        class Slotted:
+            __slots__ = ()
+            attr = SetOnce(mocks.Descriptor(), allow_strong_keys=True)
+        instance = Slotted()
+
+        instance.attr = 5
+
+        with self.assertRaises(AttributeError):
+            instance.attr = 5
+
 
 class Binder:
     def __init__(self, value):
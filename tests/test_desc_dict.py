@@ -1,6 +1,6 @@
 # coding=utf-8
 from unittest import TestCase
-from descriptor_tools import DescDict
+from descriptor_tools import DescDict, FrozenDescDict
 
 
 class Mock:
@@ -299,3 +299,333 @@ class DescDict_Finalizer_Test(TestCase):
         del key
 
         self.assertEqual(len(dict), 0)
+
+    def test_finalize_after_value_replaced(self):
+        dict = DescDict()
+        key = Key(1)
+
+        dict[key] = 1
+        dict[key] = 2
+        del key
+
+        self.assertEqual(len(dict), 0)
+
+    def test_deleted_item_is_not_removed_again(self):
+        dict = DescDict()
+        key = Key(1)
+        dict[key] = 1
+
+        del dict[key]
+        del key
+
+        self.assertEqual(len(dict), 0)
+
+    def test_keys_do_not_keep_dict_alive(self):
+        import weakref
+        dict = DescDict()
+        key = Key(1)
+        dict[key] = 1
+        dict_ref = weakref.ref(dict)
+
+        del dict
+
+        self.assertIsNone(dict_ref())
+        del key  # the shared callback must cope with the dict being gone
+
+
+class Slotted:
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class DescDict_Strong_Keys_Test(TestCase):
+    def test_unweakrefable_key_raises_TypeError_by_default(self):
+        dict = DescDict()
+
+        with self.assertRaises(TypeError):
+            dict[Slotted(1)] = 1
+
+    def test_unweakrefable_key_allowed(self):
+        dict = DescDict(allow_strong_keys=True)
+        key = Slotted(1)
+
+        dict[key] = 1
+
+        self.assertEqual(dict[key], 1)
+        self.assertEqual(list(dict), [key])
+
+    def test_release(self):
+        dict = DescDict(allow_strong_keys=True)
+        key = Slotted(1)
+        dict[key] = 1
+
+        self.assertTrue(dict.release(key))
+        self.assertFalse(dict.release(key))
+        self.assertNotIn(key, dict)
+
+    def test_sweep_removes_unreferenced_keys(self):
+        dict = DescDict(allow_strong_keys=True)
+        kept = Slotted(1)
+        dropped = Slotted(2)
+        dict[kept] = 1
+        dict[dropped] = 2
+
+        del dropped
+        removed = dict.sweep()
+
+        self.assertEqual(removed, 1)
+        self.assertEqual(list(dict.items()), [(kept, 1)])
+
+    def test_sweep_removes_key_held_by_several_dicts(self):
+        first = DescDict(allow_strong_keys=True)
+        second = DescDict(allow_strong_keys=True)
+        key = Slotted(1)
+        first[key] = 1
+        second[key] = 2
+
+        del key
+
+        self.assertEqual(first.sweep(), 1)
+        self.assertEqual(second.sweep(), 1)
+        self.assertEqual((len(first), len(second)), (0, 0))
+
+    def test_sweep_keeps_key_held_by_several_dicts_and_referenced(self):
+        first = DescDict(allow_strong_keys=True)
+        second = DescDict(allow_strong_keys=True)
+        key = Slotted(1)
+        first[key] = 1
+        second[key] = 2
+
+        self.assertEqual(first.sweep() + second.sweep(), 0)
+        self.assertEqual(second[key], 2)
+
+    def test_sweep_after_other_dict_releases_or_is_gone(self):
+        first = DescDict(allow_strong_keys=True)
+        second = DescDict(allow_strong_keys=True)
+        third = DescDict(allow_strong_keys=True)
+        kept = Slotted(1)
+        dropped = Slotted(2)
+        for dict in (first, second, third):
+            dict[kept] = dict[dropped] = 1
+
+        second.release(dropped)
+        del third
+        del dropped
+
+        self.assertEqual(first.sweep(), 1)
+        self.assertEqual(list(first), [kept])
+
+    def test_sweep_happens_automatically(self):
+        dict = DescDict(allow_strong_keys=True)
+
+        for i in range(5000):
+            dict[Slotted(i)] = i
+
+        self.assertLess(len(dict), 5000)
+
+    def test_weakrefable_keys_still_weak(self):
+        dict = DescDict(allow_strong_keys=True)
+        key = Key(1)
+        dict[key] = 1
+
+        del key
+
+        self.assertEqual(len(dict), 0)
+
+
+class DescDict_Batch_Test(TestCase):
+    def setUp(self):
+        self.keys = [Key(i) for i in range(5)]
+        self.dict = DescDict()
+
+    def test_set_many_and_get_many(self):
+        self.dict.set_many(self.keys, range(5))
+
+        self.assertEqual(self.dict.get_many(self.keys), [0, 1, 2, 3, 4])
+
+    def test_set_many_overwrites(self):
+        self.dict.set_many(self.keys, range(5))
+
+        self.dict.set_many(self.keys[:2], ['a', 'b'])
+
+        self.assertEqual(self.dict.get_many(self.keys), ['a', 'b', 2, 3, 4])
+        self.assertEqual(len(self.dict), 5)
+
+    def test_get_many_missing_AttributeError(self):
+        self.dict.set_many(self.keys[:2], range(2))
+
+        with self.assertRaises(AttributeError):
+            self.dict.get_many(self.keys)
+
+    def test_get_many_with_default(self):
+        self.dict.set_many(self.keys[:2], range(2))
+
+        result = self.dict.get_many(self.keys, default=None)
+
+        self.assertEqual(result, [0, 1, None, None, None])
+
+    def test_delete_many(self):
+        self.dict.set_many(self.keys, range(5))
+
+        self.dict.delete_many(self.keys[1:4])
+
+        self.assertEqual(list(self.dict), [self.keys[0], self.keys[4]])
+
+    def test_delete_many_missing_removes_nothing(self):
+        self.dict.set_many(self.keys[:2], range(2))
+
+        with self.assertRaises(AttributeError):
+            self.dict.delete_many(self.keys)
+        self.assertEqual(len(self.dict), 2)
+
+    def test_set_many_entries_are_finalized(self):
+        key = Key(5)
+        self.dict.set_many([key], [5])
+
+        del key
+
+        self.assertEqual(len(self.dict), 0)
+
+
+class DescDict_Deferred_Cleanup_Test(TestCase):
+    def setUp(self):
+        self.dict = DescDict(deferred_cleanup=True)
+
+    def test_dead_items_are_queued(self):
+        key = Key(1)
+        self.dict[key] = 1
+
+        del key
+
+        self.assertEqual(len(self.dict.storage), 1)
+        self.assertEqual(len(self.dict), 0)
+        self.assertEqual(len(self.dict.storage), 0)
+
+    def test_dead_items_removed_on_next_change(self):
+        keys = [Key(i) for i in range(10)]
+        self.dict.set_many(keys, range(10))
+        live = Key(10)
+
+        del keys
+        self.dict[live] = 10
+
+        self.assertEqual(list(self.dict.storage.values())[0](), live)
+        self.assertEqual(len(self.dict.storage), 1)
+
+    def test_lookups_remove_dead_items_over_threshold(self):
+        sut = DescDict(deferred_cleanup=True, cleanup_threshold=5)
+        live = Key(-1)
+        sut[live] = -1
+        keys = [Key(i) for i in range(10)]
+        sut.set_many(keys, range(10))
+
+        del keys[:4]
+        _ = sut[live]
+        self.assertEqual(len(sut.storage), 11)
+
+        del keys[:2]
+        self.assertIn(live, sut)
+        self.assertEqual(len(sut.storage), 5)
+
+    def test_threshold_kept_by_freeze_and_thaw(self):
+        sut = DescDict(deferred_cleanup=True, cleanup_threshold=5)
+
+        self.assertEqual(sut.freeze().thaw().cleanup_threshold, 5)
+
+    def test_reused_id_does_not_see_old_value(self):
+        key = Key(1)
+        self.dict[key] = 1
+        del key
+
+        # likely, but not guaranteed, to get the dead key's id
+        new_key = Key(2)
+
+        self.assertNotIn(new_key, self.dict)
+        with self.assertRaises(AttributeError):
+            self.dict[new_key]
+
+    def test_sweep_returns_removed_count(self):
+        keys = [Key(i) for i in range(3)]
+        self.dict.set_many(keys, range(3))
+
+        del keys
+
+        self.assertEqual(self.dict.sweep(), 3)
+
+
+class DescDict_Owner_Managed_Test(TestCase):
+    def setUp(self):
+        self.dict = DescDict(weak_keys=False)
+
+    def test_keys_are_kept_until_released(self):
+        key = Key(1)
+        self.dict[key] = 1
+        released = Key(2)
+        self.dict[released] = 2
+
+        self.dict.release(released)
+        del key, released
+
+        self.assertEqual(list(self.dict.values()), [1])
+
+    def test_sweep_does_not_remove_kept_keys(self):
+        self.dict[Key(1)] = 1
+
+        self.dict.sweep()
+
+        self.assertEqual(len(self.dict), 1)
+
+    def test_any_key_type_allowed(self):
+        key = Slotted(1)
+
+        self.dict.set_many([key], [1])
+
+        self.assertEqual(self.dict[key], 1)
+
+
+class FrozenDescDict_Test(TestCase):
+    def setUp(self):
+        self.key1 = Key(1)
+        self.key2 = Key(2)
+        self.dict = DescDict({self.key1: 1, self.key2: 2})
+        self.frozen = self.dict.freeze()
+
+    def test_has_same_items(self):
+        self.assertEqual(self.frozen, self.dict)
+        self.assertEqual(self.frozen.get_many([self.key1, self.key2]), [1, 2])
+
+    def test_not_changed_by_original(self):
+        self.dict[self.key1] = 10
+        del self.dict[self.key2]
+
+        self.assertEqual(self.frozen[self.key1], 1)
+        self.assertIn(self.key2, self.frozen)
+
+    def test_is_immutable(self):
+        with self.assertRaises(TypeError):
+            self.frozen[self.key1] = 5
+
+    def test_missing_AttributeError(self):
+        with self.assertRaises(AttributeError):
+            self.frozen[Key(3)]
+
+    def test_dead_keys_are_skipped(self):
+        del self.key2
+
+        self.assertEqual(list(self.frozen.values()), [1])
+
+    def test_thaw(self):
+        thawed = self.frozen.thaw()
+        thawed[self.key1] = 10
+
+        self.assertIsInstance(thawed, DescDict)
+        self.assertEqual(self.frozen[self.key1], 1)
+        self.assertEqual(thawed[self.key2], 2)
+
+    def test_repr(self):
+        key = StrMock()
+        frozen = FrozenDescDict({key: 1})
+
+        self.assertEqual(repr(frozen), "FrozenDescDict({StrMock(): 1})")
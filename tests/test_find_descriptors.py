@@ -2,8 +2,12 @@
 from unittest import TestCase
 
 import test_mocks as mocks
-from descriptor_tools import get_descriptor_from, get_descriptor, name_of
-from descriptor_tools.decorators import Binding
+from descriptor_tools import (get_descriptor_from, get_descriptor, name_of,
+                              descriptors_of, is_data_descriptor,
+                              is_non_data_descriptor, is_binding,
+                              is_read_only, is_set_once, is_forced_set,
+                              is_secret_set)
+from descriptor_tools.decorators import Binding, SecretSet, SetOnce, ForcedSet
 
 attrname = mocks.attrname
 
@@ -71,3 +75,216 @@ class Name_Of_Test(TestCase):
         result = name_of(SubClass.attr, SubClass)
 
         self.assertEqual(result, SubClass.attrname)
+
+    def test_find_name_after_descriptor_is_moved(self):
+        class Moving:
+            attr = mocks.Descriptor()
+        desc = Moving.attr
+        name_of(desc, Moving)
+
+        del Moving.attr
+        Moving.other = desc
+        result = name_of(desc, Moving)
+
+        self.assertEqual(result, 'other')
+
+    def test_find_name_of_descriptor_added_after_first_lookup(self):
+        class Growing:
+            attr = mocks.Descriptor()
+        name_of(Growing.attr, Growing)
+        desc = mocks.Descriptor()
+
+        Growing.added = desc
+        result = name_of(desc, Growing)
+
+        self.assertEqual(result, 'added')
+
+    def test_descriptor_not_on_class_raises_RuntimeError(self):
+        with self.assertRaises(RuntimeError):
+            name_of(mocks.Descriptor(), Class)
+
+
+class Meta(type):
+    metaattr = mocks.Descriptor()
+
+
+class ClassWithMeta(metaclass=Meta):
+    pass
+
+
+class Get_Descriptor_Lookup_Test(TestCase):
+    def test_missing_attribute_raises_AttributeError(self):
+        with self.assertRaises(AttributeError):
+            get_descriptor(Class, 'missing')
+
+    def test_finds_descriptor_on_metaclass(self):
+        result = get_descriptor(ClassWithMeta, 'metaattr')
+
+        self.assertIs(result, Meta.__dict__['metaattr'])
+
+    def test_sees_changes_to_the_class(self):
+        class Changing:
+            attr = mocks.Descriptor()
+        get_descriptor(Changing, 'attr')
+        replacement = mocks.Descriptor()
+
+        Changing.attr = replacement
+        result = get_descriptor(Changing, 'attr')
+
+        self.assertIs(result, replacement)
+
+
+class Audited:
+    data = mocks.Stubs.FullDataDescriptor()
+    nondata = mocks.Stubs.NonDataDescriptor()
+    bound = Binding(mocks.Descriptor())
+    secret = SecretSet(mocks.Descriptor())
+    once = SetOnce(mocks.Descriptor())
+    plain = 5
+
+    def method(self):
+        pass
+
+
+class AuditedChild(Audited):
+    forced = ForcedSet(mocks.Descriptor())
+    nondata = mocks.Stubs.FullDataDescriptor()
+
+
+class Descriptors_Of_Test(TestCase):
+    def test_includes_descriptors_only(self):
+        result = descriptors_of(Audited)
+
+        self.assertIs(result['data'], Audited.__dict__['data'])
+        self.assertIn('method', result)
+        self.assertNotIn('plain', result)
+
+    def test_follows_mro(self):
+        result = descriptors_of(AuditedChild)
+
+        self.assertIs(result['forced'], AuditedChild.__dict__['forced'])
+        self.assertIs(result['data'], Audited.__dict__['data'])
+        self.assertIs(result['nondata'], AuditedChild.__dict__['nondata'])
+
+    def test_data_descriptors(self):
+        result = descriptors_of(Audited, is_data_descriptor)
+
+        self.assertIn('data', result)
+        self.assertNotIn('nondata', result)
+        self.assertNotIn('method', result)
+
+    def test_non_data_descriptors(self):
+        result = descriptors_of(Audited, is_non_data_descriptor)
+
+        self.assertIn('nondata', result)
+        self.assertIn('method', result)
+        self.assertNotIn('data', result)
+
+    def test_binding_descriptors(self):
+        result = descriptors_of(Audited, is_binding)
+
+        self.assertEqual(set(result), {'bound'})
+
+    def test_read_only_descriptors(self):
+        result = descriptors_of(AuditedChild, is_read_only)
+
+        self.assertEqual(set(result), {'secret', 'once', 'forced'})
+
+    def test_read_only_kinds(self):
+        self.assertEqual(set(descriptors_of(AuditedChild, is_set_once)), {'once'})
+        self.assertEqual(set(descriptors_of(AuditedChild, is_secret_set)), {'secret'})
+        self.assertEqual(set(descriptors_of(AuditedChild, is_forced_set)), {'forced'})
+
+    def test_result_is_cached(self):
+        self.assertIs(descriptors_of(Audited, is_binding),
+                      descriptors_of(Audited, is_binding))
+
+    def test_result_is_read_only(self):
+        with self.assertRaises(TypeError):
+            descriptors_of(Audited)['new'] = mocks.Descriptor()
+
+    def test_sees_attributes_added_to_base_class(self):
+        class Base:
+            attr = mocks.Descriptor()
+
+        class Sub(Base):
+            pass
+        descriptors_of(Sub)
+        added = mocks.Descriptor()
+
+        Base.other = added
+        result = descriptors_of(Sub)
+
+        self.assertIs(result['other'], added)
+
+    def test_sees_attributes_removed_from_base_class(self):
+        class Base:
+            attr = mocks.Descriptor()
+
+        class Sub(Base):
+            pass
+        descriptors_of(Sub)
+
+        del Base.attr
+        result = descriptors_of(Sub)
+
+        self.assertNotIn('attr', result)
+
+    def test_sees_attributes_replaced_on_base_class(self):
+        class Base:
+            attr = mocks.Descriptor()
+
+        class Sub(Base):
+            pass
+        descriptors_of(Sub)
+        replacement = mocks.Descriptor()
+
+        Base.attr = replacement
+        result = descriptors_of(Sub)
+
+        self.assertIs(result['attr'], replacement)
+
+    def test_sees_descriptor_replaced_with_plain_value(self):
+        class Base:
+            attr = mocks.Descriptor()
+
+        class Sub(Base):
+            pass
+        descriptors_of(Sub)
+
+        Base.attr = 5
+        result = descriptors_of(Sub)
+
+        self.assertNotIn('attr', result)
+
+    def test_sees_attribute_removed_and_another_added(self):
+        class Base:
+            a = mocks.Descriptor()
+
+        class Sub(Base):
+            pass
+        descriptors_of(Sub)
+
+        del Base.a
+        Base.b = mocks.Descriptor()
+        result = descriptors_of(Sub)
+
+        self.assertNotIn('a', result)
+        self.assertIn('b', result)
+
+    def test_sees_changed_bases(self):
+        class Base:
+            attr = mocks.Descriptor()
+
+        class Other:
+            other = mocks.Descriptor()
+
+        class Sub(Base):
+            pass
+        descriptors_of(Sub)
+
+        Sub.__bases__ = (Other,)
+        result = descriptors_of(Sub)
+
+        self.assertNotIn('attr', result)
+        self.assertIn('other', result)
@@ -37,6 +37,29 @@ class Getter_Binding_Test(TestCase):
 
         self.assertEqual(result, 5)
 
+    def test_many(self):
+        other = self.Class()
+        self.desc.storage[self.instance] = 5
+        self.desc.storage[other] = 6
+
+        result = self.Class.attr.many([self.instance, other])
+
+        self.assertEqual(result, [5, 6])
+
+
+class Getter_Binding_With_Storage_Test(TestCase):
+    class Desc(Getters.Binding, Storage.DescDict):
+        pass
+
+    def test_many_uses_storage_get_many(self):
+        desc = self.Desc()
+        instance = mocks.ClassWithDescriptor(desc)
+        desc.storage.set_many([instance], [5])
+
+        result = type(instance).attr.many([instance])
+
+        self.assertEqual(result, [5])
+
 
 class Getter_SelfReturning_Test(TestCase):
     class Desc(Getters.SelfReturning):
@@ -65,4 +65,32 @@ def ClassWithDescriptor(descriptor):
     return Class()
 
 
-attrname = 'attr'
\ No newline at end of file
+attrname = 'attr'
+
+
+class StorageUsingDescriptor:
+    """
+    A minimal descriptor that keeps its values in the given
+    :DescriptorStorage, for testing storages.
+    """
+    def __init__(self, storage):
+        self.storage = storage
+        self.storage.desc = self
+
+    def __set_name__(self, owner, name):
+        self.storage.set_name(name)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        else:
+            return self.storage[instance]
+
+    def __set__(self, instance, value):
+        self.storage[instance] = value
+
+    def __delete__(self, instance):
+        del self.storage[instance]
+
+    def slots_for(self, name):
+        return self.storage.slots_for(name)
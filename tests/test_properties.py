@@ -1,9 +1,21 @@
 # coding=utf-8
-from unittest import TestCase
+import asyncio
+import threading
+import time
+from unittest import TestCase, IsolatedAsyncioTestCase, skipUnless
 
+from descriptor_tools import with_slots
 from descriptor_tools.properties import (LazyProperty,
+                                             AsyncLazyProperty,
                                              BindingProperty,
                                              withConstants)
+from descriptor_tools.decorators import Binding
+from descriptor_tools.storage import LRUStorage, DictStorage, ColumnStorage
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class LazyProperty_NormalFunction_Test(TestCase):
@@ -33,6 +45,410 @@ class LazyProperty_NormalFunction_Test(TestCase):
 
         self.assertEqual(self.instance.__dict__['prop'], 5)
 
+    def test_many(self):
+        result = self.Class.prop.many([self.instance, self.Class()])
+
+        self.assertEqual(result, [5, 5])
+
+
+class LazyProperty_With_Storage_Test(TestCase):
+    class Class:
+        def __init__(self):
+            self.calls = 0
+
+        def _prop(self):
+            self.calls += 1
+            return 5
+
+        prop = LazyProperty(_prop, storage=LRUStorage(max_entries=1))
+
+    def test_value_is_kept_in_storage(self):
+        instance = self.Class()
+
+        _ = instance.prop
+
+        self.assertNotIn('prop', vars(instance))
+        self.assertIn(instance, self.Class.prop.storage)
+
+    def test_storage_is_named_after_function(self):
+        self.assertEqual(self.Class.prop.storage.base_name, '_prop')
+
+    def test_missing_value_error_names_attribute(self):
+        with self.assertRaisesRegex(AttributeError, "'_prop'"):
+            self.Class.prop.storage[self.Class()]
+
+    def test_value_is_only_calculated_once(self):
+        instance = self.Class()
+
+        _ = instance.prop
+        _ = instance.prop
+
+        self.assertEqual(instance.calls, 1)
+
+    def test_evicted_value_is_recalculated(self):
+        first, second = self.Class(), self.Class()
+        _ = first.prop
+        _ = second.prop
+
+        result = first.prop
+
+        self.assertEqual(result, 5)
+        self.assertEqual(first.calls, 2)
+
+
+def look_up_concurrently(instance, name, threads=8):
+    results = []
+    start = threading.Barrier(threads)
+
+    def look_up():
+        start.wait()
+        try:
+            results.append(getattr(instance, name))
+        except Exception as e:
+            results.append(e)
+
+    workers = [threading.Thread(target=look_up) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+class LazyProperty_SingleFlight_Test(TestCase):
+    class Class:
+        def __init__(self, fail=False):
+            self.calls = 0
+            self.fail = fail
+
+        def _prop(self):
+            self.calls += 1
+            time.sleep(0.05)
+            if self.fail:
+                raise ValueError(self.calls)
+            return object()
+
+        prop = LazyProperty(_prop, named=False, single_flight=True)
+        stored = LazyProperty(_prop, storage=LRUStorage(max_entries=10),
+                              single_flight=True)
+        unsafe = LazyProperty(_prop, named=False)
+
+    def test_calculated_once_under_contention(self):
+        instance = self.Class()
+
+        results = look_up_concurrently(instance, 'prop')
+
+        self.assertEqual(instance.calls, 1)
+        self.assertEqual(len(set(map(id, results))), 1)
+        self.assertIs(instance.__dict__['prop'], results[0])
+
+    def test_calculated_once_under_contention_with_storage(self):
+        instance = self.Class()
+
+        results = look_up_concurrently(instance, 'stored')
+
+        self.assertEqual(instance.calls, 1)
+        self.assertEqual(len(set(map(id, results))), 1)
+
+    def test_without_single_flight_calculated_per_thread(self):
+        instance = self.Class()
+
+        look_up_concurrently(instance, 'unsafe')
+
+        self.assertGreater(instance.calls, 1)
+
+    def test_exception_reaches_every_waiter(self):
+        instance = self.Class(fail=True)
+
+        results = look_up_concurrently(instance, 'prop')
+
+        self.assertEqual(instance.calls, 1)
+        self.assertTrue(all(isinstance(result, ValueError)
+                            for result in results))
+        self.assertNotIn('prop', vars(instance))
+
+    def test_failure_is_not_cached(self):
+        instance = self.Class(fail=True)
+        with self.assertRaises(ValueError):
+            _ = instance.prop
+
+        instance.fail = False
+
+        self.assertIsNotNone(instance.prop)
+        self.assertEqual(instance.calls, 2)
+
+    def test_different_instances_calculate_in_parallel(self):
+        # every calculation waits for all of them to have started, which
+        # breaks the barrier if they're made to run one at a time
+        all_started = threading.Barrier(4, timeout=5)
+
+        class Class:
+            def _prop(self):
+                all_started.wait()
+                return object()
+
+            prop = LazyProperty(_prop, named=False, single_flight=True)
+        instances = [Class() for _ in range(4)]
+        errors = []
+
+        def look_up(instance):
+            try:
+                instance.prop
+            except threading.BrokenBarrierError as e:
+                errors.append(e)
+        threads = [threading.Thread(target=look_up, args=(instance,))
+                   for instance in instances]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertTrue(all('prop' in vars(instance)
+                            for instance in instances))
+
+    def test_no_flights_left_behind(self):
+        instance = self.Class()
+
+        look_up_concurrently(instance, 'prop')
+
+        self.assertEqual(self.Class.prop._flights, {})
+
+    def test_recursive_lookup_RuntimeError(self):
+        class Class:
+            def _prop(self):
+                return self.prop
+
+            prop = LazyProperty(_prop, named=False, single_flight=True)
+
+        with self.assertRaises(RuntimeError):
+            _ = Class().prop
+
+
+class AsyncLazyProperty_Test(IsolatedAsyncioTestCase):
+    class Class:
+        def __init__(self, fail=False):
+            self.calls = 0
+            self.fail = fail
+            self.release = asyncio.Event()
+            self.release.set()
+
+        @AsyncLazyProperty
+        async def prop(self):
+            self.calls += 1
+            await self.release.wait()
+            if self.fail:
+                raise ValueError(self.calls)
+            return object()
+
+        async def _stored(self):
+            return 5
+
+        stored = AsyncLazyProperty(_stored, storage=LRUStorage(max_entries=1))
+
+    async def test_lookup_is_awaitable(self):
+        instance = self.Class()
+
+        result = await instance.prop
+
+        self.assertIs(instance.__dict__['_prop'], result)
+        self.assertEqual(instance.calls, 1)
+
+    async def test_value_is_cached(self):
+        instance = self.Class()
+
+        first = await instance.prop
+        second = await instance.prop
+
+        self.assertIs(first, second)
+        self.assertEqual(instance.calls, 1)
+
+    async def test_concurrent_lookups_share_one_calculation(self):
+        instance = self.Class()
+        instance.release.clear()
+        lookups = [asyncio.ensure_future(instance.prop) for _ in range(5)]
+        await asyncio.sleep(0)
+
+        instance.release.set()
+        results = await asyncio.gather(*lookups)
+
+        self.assertEqual(len(set(map(id, results))), 1)
+        self.assertEqual(instance.calls, 1)
+        self.assertEqual(self.Class.prop._tasks, {})
+
+    async def test_exception_reaches_every_waiter_and_is_not_cached(self):
+        instance = self.Class(fail=True)
+        instance.release.clear()
+        lookups = [asyncio.ensure_future(instance.prop) for _ in range(3)]
+        await asyncio.sleep(0)
+        instance.release.set()
+
+        results = await asyncio.gather(*lookups, return_exceptions=True)
+        instance.fail = False
+
+        self.assertEqual([type(r) for r in results], [ValueError] * 3)
+        self.assertNotIn('_prop', vars(instance))
+        self.assertIsNotNone(await instance.prop)
+        self.assertEqual(instance.calls, 2)
+
+    async def test_cancelled_waiter_does_not_cancel_calculation(self):
+        instance = self.Class()
+        instance.release.clear()
+        cancelled = asyncio.ensure_future(instance.prop)
+        other = asyncio.ensure_future(instance.prop)
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        instance.release.set()
+
+        self.assertIsNotNone(await other)
+        self.assertTrue(cancelled.cancelled())
+        self.assertEqual(instance.calls, 1)
+
+    async def test_value_cached_when_every_waiter_is_cancelled(self):
+        instance = self.Class()
+        instance.release.clear()
+        waiter = asyncio.ensure_future(instance.prop)
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        await asyncio.sleep(0)
+        instance.release.set()
+        await asyncio.sleep(0)
+
+        self.assertIn('_prop', vars(instance))
+        await instance.prop
+        self.assertEqual(instance.calls, 1)
+
+    async def test_cancelled_calculation_is_restarted(self):
+        instance = self.Class()
+        instance.release.clear()
+        waiter = asyncio.ensure_future(instance.prop)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)  # let the calculation start
+
+        task, = self.Class.prop._tasks.values()
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        instance.release.set()
+
+        self.assertIsNotNone(await instance.prop)
+        self.assertEqual(instance.calls, 2)
+
+    async def test_with_storage(self):
+        instance = self.Class()
+
+        self.assertEqual(await instance.stored, 5)
+        self.assertIn(instance, self.Class.stored.storage)
+
+    async def test_many(self):
+        instances = [self.Class(), self.Class()]
+
+        results = await self.Class.stored.many(instances)
+
+        self.assertEqual(results, [5, 5])
+
+    async def test_with_slots(self):
+        @with_slots
+        class Slotted:
+            @AsyncLazyProperty
+            async def prop(self):
+                return 5
+
+        instance = Slotted()
+
+        self.assertEqual(await instance.prop, 5)
+        self.assertEqual(instance._prop, 5)
+
+
+class GatheringStorage(DictStorage):
+    gathers_numpy = True
+
+    def __init__(self):
+        super().__init__()
+        self.bulk_calls = []
+
+    def get_many(self, instances, **options):
+        self.bulk_calls.append(options)
+        return ['gathered'] + super().get_many(instances)
+
+
+class LazyProperty_Many_Test(TestCase):
+    class Class:
+        def __init__(self, value):
+            self.value = value
+            self.calls = 0
+
+        def _prop(self):
+            self.calls += 1
+            return self.value
+
+        prop = LazyProperty(_prop, storage=GatheringStorage())
+        bound = Binding(LazyProperty(_prop, storage=GatheringStorage()))
+
+    def test_cached_values_come_from_one_bulk_lookup(self):
+        instances = [self.Class(i) for i in range(3)]
+        for instance in instances:
+            _ = instance.prop
+        storage = self.Class.prop.storage
+        storage.bulk_calls.clear()
+
+        result = self.Class.prop.many(instances)
+
+        self.assertEqual(result, ['gathered', 0, 1, 2])
+        self.assertEqual(storage.bulk_calls, [{}])
+        self.assertEqual([i.calls for i in instances], [1, 1, 1])
+
+    def test_only_missing_values_are_calculated(self):
+        instances = [self.Class(i) for i in range(3)]
+        _ = instances[1].prop
+
+        result = self.Class.prop.many(iter(instances))
+
+        self.assertEqual(result, [0, 1, 2])
+        self.assertEqual([i.calls for i in instances], [1, 1, 1])
+
+    def test_as_numpy_is_forwarded_to_storage(self):
+        instances = [self.Class(i) for i in range(2)]
+        for instance in instances:
+            _ = instance.prop
+
+        self.Class.prop.many(instances, as_numpy=True)
+
+        self.assertEqual(self.Class.prop.storage.bulk_calls,
+                         [{'as_numpy': True}])
+
+    def test_Binding_uses_wrapped_many(self):
+        instances = [self.Class(i) for i in range(2)]
+        for instance in instances:
+            _ = instance.bound
+        storage = self.Class.bound.desc.storage
+
+        result = self.Class.bound.many(instances, as_numpy=True)
+
+        self.assertEqual(result, ['gathered', 0, 1])
+        self.assertEqual(storage.bulk_calls, [{'as_numpy': True}])
+
+    @skipUnless(numpy, "needs NumPy")
+    def test_as_numpy_from_column(self):
+        class Class:
+            def __init__(self, value):
+                self.value = value
+
+            def _prop(self):
+                return self.value
+
+            prop = LazyProperty(_prop, storage=ColumnStorage('d'))
+
+        instances = [Class(float(i)) for i in range(3)]
+
+        result = Class.prop.many(instances, as_numpy=True)
+
+        self.assertIsInstance(result, numpy.ndarray)
+        self.assertEqual(result.tolist(), [0.0, 1.0, 2.0])
+
 
 class LazyProperty_MiscFunction_Test(TestCase):
     class Class:
@@ -104,6 +520,15 @@ class BindingProperty_Test(TestCase):
 
         self.assertFalse('_attr' in instance.__dict__)
 
+    def test_many(self):
+        instances = [self.Class(), self.Class()]
+        instances[0].attr = 1
+        instances[1].attr = 2
+
+        result = self.Class.attr.many(instances)
+
+        self.assertEqual(result, [1, 2])
+
 
 class ClassConstants_Test(TestCase):
     class Class(metaclass=withConstants(ATTR=5)):
@@ -0,0 +1,284 @@
+# coding=utf-8
+from unittest import TestCase
+import weakref
+
+from descriptor_tools import namespace_of, SlotNamespace, with_slots
+from descriptor_tools.decorators import Binding
+from descriptor_tools.instance_properties import InstanceProperty
+from descriptor_tools.mixins import Storage
+from descriptor_tools.properties import LazyProperty
+from descriptor_tools.set_attrs import set_on
+from descriptor_tools.storage import (InstanceStorage, SideTableStorage,
+                                      SIDE_TABLE_NAME, DictStorage, protected)
+from test_mocks import StorageUsingDescriptor
+
+
+class Slotted:
+    __slots__ = ('a',)
+
+
+class NamespaceOf_Test(TestCase):
+    def test_returns_dict_of_regular_instance(self):
+        class Class:
+            pass
+        instance = Class()
+
+        self.assertIs(namespace_of(instance), instance.__dict__)
+
+    def test_returns_slot_namespace_without_dict(self):
+        self.assertIsInstance(namespace_of(Slotted()), SlotNamespace)
+
+
+class SlotNamespace_Test(TestCase):
+    def setUp(self):
+        self.instance = Slotted()
+        self.namespace = SlotNamespace(self.instance)
+
+    def test_set_stores_in_slot(self):
+        self.namespace['a'] = 5
+
+        self.assertEqual(self.instance.a, 5)
+
+    def test_get_reads_slot(self):
+        self.instance.a = 5
+
+        self.assertEqual(self.namespace['a'], 5)
+
+    def test_unset_slot_is_missing(self):
+        with self.assertRaises(KeyError):
+            _ = self.namespace['a']
+        self.assertNotIn('a', self.namespace)
+        self.assertIsNone(self.namespace.get('a'))
+
+    def test_non_slot_names_are_missing(self):
+        self.assertNotIn('__init__', self.namespace)
+        with self.assertRaises(KeyError):
+            _ = self.namespace['__init__']
+
+    def test_cannot_set_non_slot_name(self):
+        with self.assertRaises(AttributeError):
+            self.namespace['b'] = 5
+
+    def test_delete_empties_slot(self):
+        self.instance.a = 5
+
+        del self.namespace['a']
+
+        self.assertFalse(hasattr(self.instance, 'a'))
+
+    def test_delete_unset_slot_fails(self):
+        with self.assertRaises(KeyError):
+            del self.namespace['a']
+
+
+class WithSlots_Test(TestCase):
+    def test_generates_slots_for_descriptors(self):
+        @with_slots
+        class Class:
+            x = InstanceProperty()
+            y = LazyProperty(lambda self: 1, named=False)
+            z = StorageUsingDescriptor(SideTableStorage())
+
+        self.assertEqual(Class.__slots__, ('_x', '_y', SIDE_TABLE_NAME))
+        self.assertFalse(hasattr(Class(), '__dict__'))
+
+    def test_keeps_existing_slots(self):
+        @with_slots
+        class Class:
+            __slots__ = ('a',)
+            x = InstanceProperty()
+
+        instance = Class()
+        instance.a = 5
+
+        self.assertEqual(Class.__slots__, ('a', '_x'))
+        self.assertEqual(instance.a, 5)
+
+    def test_shared_slots_are_only_added_once(self):
+        @with_slots
+        class Class:
+            x = StorageUsingDescriptor(SideTableStorage())
+            y = StorageUsingDescriptor(SideTableStorage())
+
+        self.assertEqual(Class.__slots__, (SIDE_TABLE_NAME,))
+
+    def test_keeps_name_and_qualname(self):
+        @with_slots
+        class Class:
+            pass
+
+        self.assertEqual(Class.__name__, 'Class')
+        self.assertIn('WithSlots_Test', Class.__qualname__)
+
+    def test_zero_argument_super_still_works(self):
+        class Base:
+            __slots__ = ()
+
+            def method(self):
+                return 'base'
+
+        @with_slots
+        class Class(Base):
+            def method(self):
+                return super().method()
+
+        self.assertEqual(Class().method(), 'base')
+
+    def test_not_weakrefable_by_default(self):
+        @with_slots
+        class Class:
+            pass
+
+        with self.assertRaises(TypeError):
+            weakref.ref(Class())
+
+    def test_weakrefable_adds_weakref_slot(self):
+        @with_slots(weakrefable=True)
+        class Class:
+            attr = StorageUsingDescriptor(DictStorage())
+
+        instance = Class()
+        instance.attr = 5
+
+        self.assertEqual(instance.attr, 5)
+        self.assertFalse(hasattr(instance, '__dict__'))
+
+    def test_slot_conflicting_with_descriptor_name_fails(self):
+        with self.assertRaisesRegex(ValueError, r"Class\.attr.*mangler"):
+            @with_slots
+            class Class:
+                attr = StorageUsingDescriptor(InstanceStorage())
+
+    def test_KeyByName_without_prefix_fails_clearly(self):
+        class Descriptor(Storage.KeyByName):
+            def __get__(self, instance, owner):
+                return self._get(instance)
+
+        with self.assertRaisesRegex(ValueError, r"Class\.attr.*mangler"):
+            @with_slots
+            class Class:
+                attr = Descriptor()
+
+    def test_slot_conflicting_with_other_attribute_fails(self):
+        with self.assertRaisesRegex(ValueError, "'_attr'.*already"):
+            @with_slots
+            class Class:
+                _attr = 5
+                attr = InstanceProperty()
+
+
+@with_slots
+class SlottedClass:
+    instance_prop = InstanceProperty()
+    stored = StorageUsingDescriptor(InstanceStorage(protected))
+    side = StorageUsingDescriptor(SideTableStorage())
+    by_name = Storage.KeyByName(prefix='_')
+
+    @LazyProperty
+    def lazy(self):
+        self.lazy_calls += 1
+        return 42
+
+    __slots__ = ('lazy_calls',)
+
+    def __init__(self):
+        self.lazy_calls = 0
+
+
+class Simple:
+    def __init__(self, value):
+        self.value = value
+
+    def set_meta(self, *args):
+        pass
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class Descriptors_On_Slotted_Class_Test(TestCase):
+    def setUp(self):
+        self.instance = SlottedClass()
+
+    def test_has_no_dict(self):
+        self.assertFalse(hasattr(self.instance, '__dict__'))
+
+    def test_instance_property(self):
+        self.instance.instance_prop = Simple(5)
+        self.instance.instance_prop = 6
+
+        self.assertEqual(self.instance.instance_prop, 6)
+        self.assertEqual(self.instance._instance_prop.value, 6)
+
+    def test_instance_storage(self):
+        self.instance.stored = 5
+
+        self.assertEqual(self.instance.stored, 5)
+        self.assertEqual(self.instance._stored, 5)
+
+    def test_instance_storage_missing_value(self):
+        with self.assertRaises(AttributeError):
+            _ = self.instance.stored
+
+    def test_instance_storage_delete(self):
+        self.instance.stored = 5
+
+        del self.instance.stored
+
+        self.assertNotIn(self.instance, SlottedClass.stored.storage)
+
+    def test_side_table_storage(self):
+        self.instance.side = 5
+
+        self.assertEqual(self.instance.side, 5)
+        self.assertEqual(getattr(self.instance, SIDE_TABLE_NAME),
+                         {SlottedClass.side.storage: 5})
+
+    def test_lazy_property_is_cached_in_slot(self):
+        first = self.instance.lazy
+        second = self.instance.lazy
+
+        self.assertEqual((first, second), (42, 42))
+        self.assertEqual(self.instance.lazy_calls, 1)
+        self.assertEqual(self.instance._lazy, 42)
+
+    def test_key_by_name_mixin(self):
+        SlottedClass.by_name._set(self.instance, 5)
+
+        self.assertEqual(self.instance._by_name, 5)
+        self.assertEqual(SlottedClass.by_name._get(self.instance), 5)
+
+
+class SetOn_Slotted_Test(TestCase):
+    def test_sets_slot(self):
+        instance = Slotted()
+
+        set_on(instance, 'a', 5)
+
+        self.assertEqual(instance.a, 5)
+
+    def test_fails_for_non_slot(self):
+        with self.assertRaises(AttributeError):
+            set_on(Slotted(), 'b', 5)
+
+
+class NonDataDecorator_On_Slotted_Test(TestCase):
+    class Desc:
+        def __get__(self, instance, owner):
+            return 5
+
+    def setUp(self):
+        class Class:
+            __slots__ = ()
+            attr = Binding(self.Desc())
+        self.instance = Class()
+
+    def test_get_delegates_to_wrapped(self):
+        self.assertEqual(self.instance.attr, 5)
+
+    def test_set_is_read_only(self):
+        with self.assertRaises(AttributeError):
+            self.instance.attr = 6